@@ -0,0 +1,86 @@
+import re
+
+from django.db import IntegrityError, transaction
+from django.db.models import F, Q
+
+# Room kept for the suffix: longer bases are shortened so every candidate fits.
+SUFFIX_DIGITS = 6
+MAX_ATTEMPTS = 5
+
+
+def _memberships(value, bases, separator):
+    """(base, suffix) for every base in `bases` whose family holds `value` (suffix 0: the base itself)."""
+    if value in bases:
+        yield value, 0
+    digits = len(value)
+    while digits and value[digits - 1] in '0123456789':
+        digits -= 1
+    for split in range(digits, len(value)):
+        if value[split] == '0':
+            continue
+        head = value[:split]
+        if separator:
+            if not head.endswith(separator):
+                continue
+            head = head[: -len(separator)]
+        if head in bases:
+            yield head, int(value[split:])
+
+
+def allocate_many(queryset, bases, *, field, max_length, separator='', key=None):
+    """
+    First free value per base of `bases` with one query; repeated bases get successive values.
+    `key` is the expression uniqueness is judged on (e.g. Lower(field)); `bases` must be in that form.
+    """
+    bases = [base[: max_length - len(separator) - SUFFIX_DIGITS] for base in bases]
+    used = {base: set() for base in bases}
+    if not used:
+        return []
+    matches = Q()
+    for base in used:
+        prefix = f'{base}{separator}'
+        matches |= Q(allocation_key=base)
+        matches |= Q(allocation_key__startswith=prefix, allocation_key__regex=f'^{re.escape(prefix)}[1-9][0-9]*$')
+    taken = (
+        queryset.annotate(allocation_key=key if key is not None else F(field))
+        .filter(matches)
+        .values_list('allocation_key', flat=True)
+    )
+    # Matched again in Python: SQLite's LIKE ignores case, and one value can
+    # belong to several families (info12 is info+12 and info1+2).
+    for value in taken:
+        for base, suffix in _memberships(value, used, separator):
+            used[base].add(suffix)
+    allocated = []
+    for base in bases:
+        suffix = 0
+        while suffix in used[base]:
+            suffix += 1
+        value = f'{base}{separator}{suffix}' if suffix else base
+        for member, member_suffix in _memberships(value, used, separator):
+            used[member].add(member_suffix)
+        allocated.append(value)
+    return allocated
+
+
+def allocate(queryset, base, *, field, max_length, separator='', key=None):
+    """First free value of `base`, `base<separator><n>` (see allocate_many)."""
+    return allocate_many(queryset, [base], field=field, max_length=max_length, separator=separator, key=key)[0]
+
+
+def create_unique(allocate_value, create):
+    """
+    `create(value)` with a value from `allocate_value()`, inside a savepoint;
+    allocates again if a concurrent insert took the value first.
+    """
+    previous = None
+    for attempt in range(MAX_ATTEMPTS):
+        value = allocate_value()
+        try:
+            with transaction.atomic():
+                return create(value)
+        except IntegrityError:
+            # Same value again means the violation is not about this value.
+            if value == previous or attempt == MAX_ATTEMPTS - 1:
+                raise
+            previous = value
@@ -5,3 +5,6 @@ class AuthxConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.authx'
     verbose_name = 'AuthX'
+
+    def ready(self):
+        from . import signals  # noqa: F401
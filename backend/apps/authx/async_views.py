@@ -0,0 +1,76 @@
+from rest_framework import status
+
+from common.api_response import json_error, json_success
+from common.async_views import AsyncAPIView
+
+from . import bootstrap, otp_store
+from .identity import users_by_email
+from .serializers import SendOTPSerializer, VerifyOTPSerializer
+from .services_otp import acreate_email_otp, aensure_profile, asend_email_otp
+from .throttling import IDENTITY_THROTTLES
+from .tokens import StatelessJWTAuthentication
+
+
+async def _send_code(email):
+    user = await users_by_email(email).afirst()
+    if user:
+        profile = await aensure_profile(user)
+        if not profile.email_verified:
+            # Autocommit: if the email fails after the code is stored, the user asks for another.
+            otp = await acreate_email_otp(user)
+            await asend_email_otp(user, otp.code)
+
+
+class SendOTPView(AsyncAPIView):
+    throttle_classes = IDENTITY_THROTTLES
+    throttle_scope = 'send_otp'
+
+    async def post(self, request):
+        await _send_code(self.validated(request, SendOTPSerializer)['email'])
+        return json_success({'detail': 'If the account exists, a code was sent.'}, status=status.HTTP_200_OK)
+
+
+class VerifyOTPView(AsyncAPIView):
+    async def post(self, request):
+        data = self.validated(request, VerifyOTPSerializer)
+
+        user = await users_by_email(data['email']).afirst()
+        if not user:
+            return json_error('Invalid code', status=status.HTTP_400_BAD_REQUEST, code="INVALID_CODE")
+
+        result = await otp_store.averify(user.pk, "email_verification", data['code'])
+        if result is otp_store.Result.LOCKED:
+            return json_error(
+                'Too many attempts. Request a new code.', status=status.HTTP_400_BAD_REQUEST, code="OTP_LOCKED"
+            )
+        if result is not otp_store.Result.VERIFIED:
+            return json_error('Invalid or expired code', status=status.HTTP_400_BAD_REQUEST, code="INVALID_CODE")
+
+        profile = await aensure_profile(user)
+        profile.email_verified = True
+        await profile.asave(update_fields=['email_verified'])
+
+        return json_success({'detail': 'Email verified.'}, status=status.HTTP_200_OK)
+
+
+class ResendVerificationView(AsyncAPIView):
+    throttle_classes = IDENTITY_THROTTLES
+    throttle_scope = 'resend_verification'
+
+    async def post(self, request):
+        await _send_code(self.validated(request, SendOTPSerializer)['email'])
+        return json_success(
+            {'detail': 'If the account exists, a verification email has been sent.'},
+            status=status.HTTP_200_OK,
+        )
+
+
+class MeView(AsyncAPIView):
+    authentication_classes = [StatelessJWTAuthentication]
+    authentication_required = True
+
+    async def get(self, request):
+        session = await bootstrap.aget(request.user.id)
+        if session is None:
+            return json_error('User not found', status=status.HTTP_404_NOT_FOUND, code="NOT_FOUND")
+        return json_success(bootstrap.me_body(session))
@@ -1,20 +1,44 @@
 from django.contrib.auth import get_user_model
 from django.contrib.auth.backends import ModelBackend
-from django.db.models import Q
+
+from . import hashing
+from .identity import users_by_email
 
 
 class EmailBackend(ModelBackend):
-    """Authenticate users using email and password (case-insensitive)."""
+    """
+    Authenticate users using email and password (case-insensitive).
+    The password check goes through `hashing`, which may run it in the hashing pool.
+    """
 
     def authenticate(self, request, email=None, password=None, **kwargs):
         if email is None or password is None:
             return None
         UserModel = get_user_model()
         try:
-            user = UserModel.objects.get(Q(email__iexact=email))
+            user = users_by_email(email).get()
+        except UserModel.DoesNotExist:
+            return None
+        if hashing.check_password(password, user.password):
+            if hashing.must_update(user.password):
+                user.password = hashing.make_password(password)
+                user.save(update_fields=['password'])
+            return user
+        return None
+
+    async def aauthenticate(self, request, email=None, password=None, **kwargs):
+        """Async counterpart of `authenticate` for ASGI views; awaits the hash without holding a thread."""
+        if email is None or password is None:
+            return None
+        UserModel = get_user_model()
+        try:
+            user = await users_by_email(email).aget()
         except UserModel.DoesNotExist:
             return None
-        if user.check_password(password):
+        if await hashing.acheck_password(password, user.password):
+            if hashing.must_update(user.password):
+                user.password = await hashing.amake_password(password)
+                await user.asave(update_fields=['password'])
             return user
         return None
 
@@ -0,0 +1,141 @@
+import hashlib
+import math
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.crypto import get_random_string
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+
+GENERATION_KEY = 'authx:blacklist:generation'
+ERROR_RATE = 0.001
+MIN_CAPACITY = 10_000
+# Ids skipped by a sync that are re-read until they appear or age out: rows
+# further back, or still uncommitted after GAP_SECONDS, are not expected.
+GAP_WINDOW = 1_000
+GAP_SECONDS = 300
+PROCESS_LOCAL_CACHES = {
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+}
+
+
+def cache_is_shared():
+    """Whether the default cache is seen by every worker, not just this process."""
+    return settings.CACHES['default']['BACKEND'] not in PROCESS_LOCAL_CACHES
+
+
+class BloomFilter:
+    """Fixed-size bloom filter over strings (double hashing on one blake2b digest)."""
+
+    def __init__(self, capacity, error_rate=ERROR_RATE):
+        self.capacity = max(1, capacity)
+        self.size = max(8, math.ceil(-self.capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / self.capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, key):
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], 'little')
+        step = int.from_bytes(digest[8:], 'little') | 1
+        return [(first + i * step) % self.size for i in range(self.hashes)]
+
+    def add(self, key):
+        for position in self._positions(key):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, key):
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+
+class RevocationFilter:
+    """Per-process bloom filter of blacklisted refresh token JTIs, synced through a cache generation."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._bloom = None
+        self._generation = None
+        self._watermark = 0
+        self._gaps = {}
+
+    def might_contain(self, jti):
+        """False only when `jti` is certainly not blacklisted."""
+        self.sync()
+        return jti in self._bloom
+
+    def sync(self):
+        generation = cache.get(GENERATION_KEY)
+        if self._bloom is not None and generation is not None and generation == self._generation:
+            return
+        with self._lock:
+            if self._bloom is not None and generation is not None and generation == self._generation:
+                return
+            if generation is None:
+                # Publish a generation before reading, so changes made during
+                # the rebuild show up as a new one.
+                generation = get_random_string(16)
+                cache.add(GENERATION_KEY, generation, timeout=None)
+                generation = cache.get(GENERATION_KEY, generation)
+                self._rebuild()
+            elif self._bloom is None or self._bloom.count >= self._bloom.capacity:
+                self._rebuild()
+            else:
+                self._load_since_watermark()
+            self._generation = generation
+
+    def _rebuild(self):
+        top = BlacklistedToken.objects.order_by('-id').values_list('id', flat=True).first() or 0
+        live = BlacklistedToken.objects.filter(id__lte=top, token__expires_at__gt=timezone.now())
+        bloom = BloomFilter(max(MIN_CAPACITY, 2 * live.count()))
+        for jti in live.order_by().values_list('token__jti', flat=True).iterator(chunk_size=5000):
+            bloom.add(jti)
+        start = max(0, top - GAP_WINDOW)
+        recent = set(BlacklistedToken.objects.filter(id__gt=start, id__lte=top).values_list('id', flat=True))
+        self._bloom = bloom
+        self._watermark = top
+        self._gaps = {}
+        self._track_gaps(start, top, recent)
+
+    def _load_since_watermark(self):
+        rows = list(
+            BlacklistedToken.objects.filter(Q(id__gt=self._watermark) | Q(id__in=list(self._gaps)))
+            .order_by()
+            .values_list('id', 'token__jti')
+        )
+        seen = set()
+        for row_id, jti in rows:
+            self._bloom.add(jti)
+            self._gaps.pop(row_id, None)
+            seen.add(row_id)
+        top = max(seen, default=self._watermark)
+        if top > self._watermark:
+            self._track_gaps(max(self._watermark, top - GAP_WINDOW), top, seen)
+            self._watermark = top
+        cutoff = time.monotonic() - GAP_SECONDS
+        self._gaps = {row_id: since for row_id, since in self._gaps.items() if since > cutoff}
+
+    def _track_gaps(self, start, top, seen):
+        now = time.monotonic()
+        for row_id in range(start + 1, top + 1):
+            if row_id not in seen:
+                self._gaps.setdefault(row_id, now)
+
+    def reset(self):
+        with self._lock:
+            self._bloom = None
+            self._generation = None
+            self._watermark = 0
+            self._gaps = {}
+
+
+revocation_filter = RevocationFilter()
+
+
+def mark_changed():
+    """Tell every process's filter that the blacklist gained rows."""
+    cache.set(GENERATION_KEY, get_random_string(16), timeout=None)
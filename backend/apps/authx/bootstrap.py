@@ -0,0 +1,124 @@
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import OuterRef, Subquery
+
+from apps.cases import counts
+from apps.cases.models import CaseStatus, FirmCaseCount
+
+User = get_user_model()
+
+KEY_PREFIX = 'authx:bootstrap:'
+CACHE_SECONDS = 60
+
+FIRM_FIELDS = ('id', 'name', 'slug', 'email', 'phone', 'address', 'timezone')
+HAS_ROLE = any(field.name == 'role' for field in User._meta.fields)
+
+
+def _key(user_id):
+    return f'{KEY_PREFIX}{user_id}'
+
+
+def _stored(facet, value):
+    rows = FirmCaseCount.objects.filter(firm_id=OuterRef('owned_firm__id'), facet=facet, value=value)
+    return Subquery(rows.values('count')[:1])
+
+
+def _query(user_id):
+    fields = ['id', 'email', 'first_name', 'last_name', 'profile__email_verified']
+    fields += [f'owned_firm__{name}' for name in FIRM_FIELDS]
+    if HAS_ROLE:
+        fields.append('role')
+    summary = {'cases_total': _stored(*counts.TOTAL)}
+    summary.update({f'cases_{status}': _stored('status', status) for status in CaseStatus.values})
+    return User.objects.filter(pk=user_id).annotate(**summary).values(*fields, *summary)
+
+
+def _needs_recount(row):
+    return row['owned_firm__id'] is not None and row['cases_total'] is None
+
+
+def _recount(row):
+    # Count rows not built yet for this firm (they are built on first read).
+    built = counts.recompute(row['owned_firm__id'])
+    row['cases_total'] = built[counts.TOTAL]
+    row.update({f'cases_{status}': built.get(('status', status), 0) for status in CaseStatus.values})
+
+
+def _summary(row):
+    return {
+        'cases': {
+            'total': row['cases_total'],
+            'by_status': {status: row[f'cases_{status}'] or 0 for status in CaseStatus.values},
+        }
+    }
+
+
+def _payload(row):
+    has_firm = row['owned_firm__id'] is not None
+    return {
+        'user': {
+            'id': row['id'],
+            'email': row['email'],
+            'first_name': row['first_name'],
+            'last_name': row['last_name'],
+        },
+        'role': row.get('role') or 'FIRM_OWNER',
+        'profile': {'email_verified': bool(row['profile__email_verified'])},
+        'firm': {name: row[f'owned_firm__{name}'] for name in FIRM_FIELDS} if has_firm else None,
+        'summary': _summary(row) if has_firm else None,
+    }
+
+
+def load(user_id):
+    """Build the payload of `user_id` from the database (None if the user is gone)."""
+    row = _query(user_id).first()
+    if row is None:
+        return None
+    if _needs_recount(row):
+        _recount(row)
+    return _payload(row)
+
+
+async def aload(user_id):
+    row = await _query(user_id).afirst()
+    if row is None:
+        return None
+    if _needs_recount(row):
+        await sync_to_async(_recount)(row)
+    return _payload(row)
+
+
+def get(user_id):
+    """Cached payload of `user_id`; cached once the current transaction commits."""
+    payload = cache.get(_key(user_id))
+    if payload is None:
+        payload = load(user_id)
+        if payload is not None:
+            transaction.on_commit(lambda: cache.set(_key(user_id), payload, timeout=CACHE_SECONDS))
+    return payload
+
+
+async def aget(user_id):
+    """`get` for async views, which run in autocommit: there is no transaction to wait for."""
+    payload = await cache.aget(_key(user_id))
+    if payload is None:
+        payload = await aload(user_id)
+        if payload is not None:
+            await cache.aset(_key(user_id), payload, timeout=CACHE_SECONDS)
+    return payload
+
+
+def me_body(payload):
+    """The /api/authx/me/ response built from a bootstrap payload."""
+    firm = payload['firm']
+    return {
+        'user': {**payload['user'], 'role': payload['role']},
+        'firm': {'id': firm['id'], 'name': firm['name'], 'slug': firm['slug']} if firm else None,
+        'email_verified': payload['profile']['email_verified'],
+    }
+
+
+def forget(user_id):
+    cache.delete(_key(user_id))
@@ -0,0 +1,152 @@
+import asyncio
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth import hashers
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+_pool = None
+_pool_pid = None
+_slots = None
+_pool_lock = threading.Lock()
+
+
+class PasswordHashingBusy(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = 'Too many sign-in requests right now. Please retry shortly.'
+    default_code = 'password_hashing_busy'
+    wait = 1
+
+
+def _init_worker(settings_module):
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', settings_module)
+    import django
+
+    django.setup()
+
+
+def _check(password, encoded):
+    return hashers.check_password(password, encoded)
+
+
+def _make(password):
+    return hashers.make_password(password)
+
+
+def _spawn_pool(workers):
+    return ProcessPoolExecutor(
+        max_workers=workers,
+        # Spawned, not forked: the parent's threads and DB connections stay behind.
+        mp_context=multiprocessing.get_context('spawn'),
+        initializer=_init_worker,
+        initargs=(os.environ.get('DJANGO_SETTINGS_MODULE', 'config.settings.production'),),
+    )
+
+
+def offload_enabled():
+    return getattr(settings, 'PASSWORD_HASH_WORKERS', 0) > 0
+
+
+def start_pool():
+    """Start the worker processes now instead of on the first hash (no-op when offload is off)."""
+    global _pool, _pool_pid, _slots
+    if not offload_enabled():
+        return None
+    with _pool_lock:
+        # A pool inherited through fork (e.g. gunicorn --preload) has no live workers here.
+        if _pool is None or _pool_pid != os.getpid():
+            _pool_pid = os.getpid()
+            workers = settings.PASSWORD_HASH_WORKERS
+            _slots = threading.BoundedSemaphore(max(workers, settings.PASSWORD_HASH_QUEUE_LIMIT))
+            _pool = _spawn_pool(workers)
+            # Processes start lazily; submit one no-op hash per worker to warm them up.
+            for _ in range(workers):
+                _pool.submit(_check, '', '')
+    return _pool
+
+
+def shutdown_pool():
+    global _pool, _slots
+    with _pool_lock:
+        pool, _pool, _slots = _pool, None, None
+    if pool is not None:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def _submit(fn, *args):
+    pool = start_pool()
+    slots = _slots
+    if not slots.acquire(blocking=False):
+        raise PasswordHashingBusy()
+    try:
+        future = pool.submit(fn, *args)
+    except BaseException:
+        slots.release()
+        raise
+    future.add_done_callback(lambda _: slots.release())
+    return future
+
+
+def check_password(password, encoded):
+    if not offload_enabled():
+        return _check(password, encoded)
+    return _submit(_check, password, encoded).result()
+
+
+def make_password(password):
+    if not offload_enabled():
+        return _make(password)
+    return _submit(_make, password).result()
+
+
+async def acheck_password(password, encoded):
+    if not offload_enabled():
+        return await sync_to_async(_check, thread_sensitive=False)(password, encoded)
+    return await asyncio.wrap_future(_submit(_check, password, encoded))
+
+
+async def amake_password(password):
+    if not offload_enabled():
+        return await sync_to_async(_make, thread_sensitive=False)(password)
+    return await asyncio.wrap_future(_submit(_make, password))
+
+
+@contextmanager
+def batch_hasher(workers):
+    """
+    Yield `make_passwords(passwords) -> hashes`, spread over `workers`
+    processes (inline when workers < 2). Empty passwords give unusable hashes.
+    """
+
+    def make_inline(passwords):
+        return [_make(password or None) for password in passwords]
+
+    if workers < 2:
+        yield make_inline
+        return
+    pool = _spawn_pool(workers)
+
+    def make_passwords(passwords):
+        passwords = [password or None for password in passwords]
+        return list(pool.map(_make, passwords, chunksize=max(1, len(passwords) // (workers * 4))))
+
+    try:
+        yield make_passwords
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def must_update(encoded):
+    """True when `encoded` should be re-hashed with the preferred hasher (mirrors Django's check_password)."""
+    preferred = hashers.get_hasher('default')
+    try:
+        hasher = hashers.identify_hasher(encoded)
+    except ValueError:
+        return False
+    return hasher.algorithm != preferred.algorithm or preferred.must_update(encoded)
@@ -0,0 +1,29 @@
+from django.contrib.auth import get_user_model
+from django.db.models import Func
+from django.db.models.functions import Lower
+
+User = get_user_model()
+
+
+class NonBlank(Func):
+    # Literal '' rather than a parameter: SQLite only matches an expression
+    # index when the query repeats the indexed expression verbatim.
+    template = "NULLIF(%(expressions)s, '')"
+    arity = 1
+
+
+def email_key():
+    return Lower(NonBlank('email'))
+
+
+def normalize_email(email: str) -> str:
+    return (email or '').strip().lower()
+
+
+def users_by_email(email: str):
+    """Users whose email matches `email` case-insensitively (at most one; see migration 0005)."""
+    return User.objects.alias(email_key=email_key()).filter(email_key=normalize_email(email))
+
+
+def users_by_username(username: str):
+    return User.objects.alias(username_key=Lower('username')).filter(username_key=(username or '').lower())
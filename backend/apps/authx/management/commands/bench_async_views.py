@@ -0,0 +1,140 @@
+import asyncio
+import json
+import logging
+import threading
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.asgi import get_asgi_application
+from django.core.mail.backends.base import BaseEmailBackend
+from django.core.management.base import BaseCommand
+from django.test.utils import override_settings
+from django.urls import include, path
+
+from apps.authx import async_views
+from apps.authx.models import UserProfile
+from apps.authx.services import build_tokens
+from core.benchmarking import benchmark_database, summarize
+
+# The bench routes the sync views under sync/ and the async ones under async/.
+urlpatterns = [
+    path("sync/", include("apps.authx.urls")),
+    path("async/me/", async_views.MeView.as_view()),
+    path("async/send-otp/", async_views.SendOTPView.as_view()),
+]
+
+
+class SlowEmailBackend(BaseEmailBackend):
+    """Stands in for an SMTP server that takes `latency` seconds per send."""
+
+    latency = 0.0
+
+    def send_messages(self, email_messages):
+        time.sleep(self.latency)
+        return len(email_messages)
+
+
+class Command(BaseCommand):
+    help = "Throughput, latency and threads of one ASGI worker serving the sync vs async authx views (runs on a throwaway test database)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=200, help="Requests per endpoint, variant and concurrency")
+        parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 16, 64])
+        parser.add_argument("--smtp-ms", type=float, default=50.0, help="Simulated SMTP latency for send-otp")
+        parser.add_argument("--outbox", action="store_true", help="Queue OTP emails in the outbox instead of sending")
+
+    def handle(self, *args, **options):
+        SlowEmailBackend.latency = options["smtp_ms"] / 1e3
+        with benchmark_database(), override_settings(
+            ROOT_URLCONF=__name__,
+            ALLOWED_HOSTS=["testserver"],
+            EMAIL_BACKEND=f"{__name__}.SlowEmailBackend",
+            EMAIL_OUTBOX_ENABLED=options["outbox"],
+            AUTHX_THROTTLE_RATES={},
+        ):
+            User = get_user_model()
+            users = User.objects.bulk_create(
+                User(username=f"bench_async_{n}", email=f"bench_async_{n}@example.com") for n in range(50)
+            )
+            UserProfile.objects.bulk_create(UserProfile(user=user) for user in users)
+            access, _ = build_tokens(users[0])
+            application = get_asgi_application()
+            # Every error response would otherwise be logged.
+            for name in ("django.request", "common.async_views"):
+                logging.getLogger(name).setLevel(logging.CRITICAL)
+
+            self.stdout.write(
+                f"{'endpoint':<10} {'views':<6} {'conc':>5} {'req/s':>8} {'p50 ms':>8} {'p99 ms':>9} "
+                f"{'threads':>8} {'errors':>7}"
+            )
+            for endpoint in ("me", "send-otp"):
+                for concurrency in options["concurrency"]:
+                    for variant in ("sync", "async"):
+                        requests = [self._request(variant, endpoint, n, users, access) for n in range(options["requests"])]
+                        elapsed, samples, codes, threads = asyncio.run(self._run(application, requests, concurrency))
+                        stats = summarize(samples)
+                        errors = sum(1 for code in codes if code != 200)
+                        self.stdout.write(
+                            f"{endpoint:<10} {variant:<6} {concurrency:>5} {len(samples) / elapsed:>8.0f} "
+                            f"{stats['p50'] * 1e3:>8.1f} {stats['p99'] * 1e3:>9.1f} {threads:>8} {errors:>7}"
+                        )
+
+    def _request(self, variant, endpoint, n, users, access):
+        if endpoint == "me":
+            return "GET", f"/{variant}/me/", b"", [(b"authorization", f"Bearer {access}".encode())]
+        body = json.dumps({"email": users[n % len(users)].email}).encode()
+        return "POST", f"/{variant}/send-otp/", body, [(b"content-type", b"application/json")]
+
+    async def _run(self, application, requests, concurrency):
+        """Serve `requests` through the ASGI app, `concurrency` at a time; also report the peak thread count."""
+        gate = asyncio.Semaphore(concurrency)
+        peak = threading.active_count()
+        done = asyncio.Event()
+
+        async def watch_threads():
+            nonlocal peak
+            while not done.is_set():
+                peak = max(peak, threading.active_count())
+                await asyncio.sleep(0.002)
+
+        async def one(request):
+            async with gate:
+                began = time.perf_counter()
+                code = await self._call(application, *request)
+                return time.perf_counter() - began, code
+
+        watcher = asyncio.create_task(watch_threads())
+        began = time.perf_counter()
+        results = await asyncio.gather(*(one(request) for request in requests))
+        elapsed = time.perf_counter() - began
+        done.set()
+        await watcher
+        return elapsed, [sample for sample, _ in results], [code for _, code in results], peak
+
+    async def _call(self, application, method, path, body, headers):
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": method,
+            "scheme": "http",
+            "path": path,
+            "raw_path": path.encode(),
+            "query_string": b"",
+            "root_path": "",
+            "headers": [(b"host", b"testserver"), (b"content-length", str(len(body)).encode()), *headers],
+            "client": ("127.0.0.1", 0),
+            "server": ("testserver", 80),
+        }
+        messages = [{"type": "http.request", "body": body, "more_body": False}]
+        status = []
+
+        async def receive():
+            return messages.pop() if messages else {"type": "http.disconnect"}
+
+        async def send(message):
+            if message["type"] == "http.response.start":
+                status.append(message["status"])
+
+        await application(scope, receive, send)
+        return status[0]
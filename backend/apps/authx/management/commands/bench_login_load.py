@@ -0,0 +1,98 @@
+import logging
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connections
+from django.test.utils import override_settings
+from rest_framework.test import APIClient
+
+from apps.authx import hashing
+from apps.authx.models import Firm, UserProfile
+from apps.authx.services import build_tokens
+from apps.cases.models import Case
+from core.benchmarking import benchmark_database, summarize
+
+PASSWORD = "Bench#Login123"
+
+
+class Command(BaseCommand):
+    help = "p50/p99 of login and case list requests under mixed load, with inline vs pooled password hashing (runs on a throwaway test database)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=200)
+        parser.add_argument("--login-share", type=float, default=0.3)
+        parser.add_argument("--workers", type=int, default=8, help="Concurrent request workers (threads)")
+        parser.add_argument("--pool", type=int, nargs="+", default=[0, 1], help="PASSWORD_HASH_WORKERS values; 0 = inline")
+        parser.add_argument("--queue-limit", type=int, default=4)
+        parser.add_argument("--rate", type=float, default=10.0, help="Requests submitted per second")
+
+    def handle(self, *args, **options):
+        with benchmark_database():
+            User = get_user_model()
+            user = User.objects.create_user(username="bench_login", email="bench_login@example.com", password=PASSWORD)
+            firm = Firm.objects.create(name="Login Bench", slug="login-bench", owner=user)
+            Case.objects.bulk_create(Case(firm=firm, created_by=user, title=f"Case {n}") for n in range(200))
+            # Created up front: the first login would otherwise create it and revoke `access`.
+            UserProfile.objects.create(user=user, email_verified=True)
+            access, _ = build_tokens(user)
+            random.seed(7)
+            plan = ["login" if random.random() < options["login_share"] else "list" for _ in range(options["requests"])]
+
+            # Every 401/503 would otherwise be logged as a warning.
+            logging.getLogger("django.request").setLevel(logging.CRITICAL)
+            self.stdout.write(f"{'hashing':<10} {'request':<8} {'n':>5} {'p50 ms':>8} {'p99 ms':>9} {'503':>5} {'5xx':>5}")
+            for workers in options["pool"]:
+                # One client logging in repeatedly would otherwise hit the login throttle.
+                with override_settings(
+                    PASSWORD_HASH_WORKERS=workers, PASSWORD_HASH_QUEUE_LIMIT=options["queue_limit"], AUTHX_THROTTLE_RATES={}
+                ):
+                    hashing.start_pool()
+                    try:
+                        results = self._run(plan, access, options["workers"], options["rate"])
+                    finally:
+                        hashing.shutdown_pool()
+                label = f"pool x{workers}" if workers else "inline"
+                for kind in ("login", "list"):
+                    samples = [elapsed for name, elapsed, _ in results if name == kind]
+                    codes = [code for name, _, code in results if name == kind]
+                    busy = codes.count(503)
+                    failed = sum(1 for code in codes if code >= 500) - busy
+                    stats = summarize(samples)
+                    self.stdout.write(
+                        f"{label:<10} {kind:<8} {stats['n']:>5} {stats['p50'] * 1e3:>8.1f} {stats['p99'] * 1e3:>9.1f} "
+                        f"{busy:>5} {failed:>5}"
+                    )
+
+    def _run(self, plan, access, workers, rate):
+        local = threading.local()
+
+        def client():
+            if not hasattr(local, "client"):
+                local.client = APIClient()
+            return local.client
+
+        def call(kind, submitted):
+            try:
+                if kind == "login":
+                    response = client().post(
+                        "/api/authx/login/", {"email": "bench_login@example.com", "password": PASSWORD}, format="json"
+                    )
+                else:
+                    response = client().get("/api/v1/cases/", HTTP_AUTHORIZATION=f"Bearer {access}")
+                return kind, time.perf_counter() - submitted, response.status_code
+            finally:
+                connections.close_all()
+
+        # Open-loop arrivals at `rate`; latency runs from submission, so time
+        # spent waiting for a free worker counts.
+        futures = []
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            began = time.perf_counter()
+            for n, kind in enumerate(plan):
+                time.sleep(max(0.0, began + n / rate - time.perf_counter()))
+                futures.append(executor.submit(call, kind, time.perf_counter()))
+            return [future.result() for future in futures]
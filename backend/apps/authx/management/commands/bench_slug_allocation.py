@@ -0,0 +1,73 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.utils.text import slugify
+
+from apps.authx.identity import users_by_username
+from apps.authx.models import Firm, generate_unique_slug
+from apps.authx.serializers import _unique_username_from_email
+from core.benchmarking import benchmark_database, summarize, timed
+
+
+def count_queries(fn):
+    count = 0
+
+    def counter(execute, sql, params, many, context):
+        nonlocal count
+        count += 1
+        return execute(sql, params, many, context)
+
+    with connection.execute_wrapper(counter):
+        fn()
+    return count
+
+
+def probe_slug(name):
+    """The previous allocator: one exists() per candidate."""
+    base = slugify(name) or "firm"
+    slug, index = base, 1
+    while Firm.objects.filter(slug=slug).exists():
+        slug, index = f"{base}-{index}", index + 1
+    return slug
+
+
+def probe_username(email):
+    base = email.split("@")[0][:150] or "user"
+    username, counter = base, 1
+    while users_by_username(username).exists():
+        username, counter = f"{base}{counter}"[:150], counter + 1
+    return username
+
+
+class Command(BaseCommand):
+    help = "Queries and latency of firm slug / username allocation as collisions grow: per-candidate probing vs one prefix query (runs on a throwaway test database)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--collisions", type=int, nargs="+", default=[0, 10, 100, 1000])
+        parser.add_argument("--repeat", type=int, default=20)
+
+    def handle(self, *args, **options):
+        User = get_user_model()
+        with benchmark_database():
+            self.stdout.write(f"{'value':<9} {'taken':>6} {'allocator':<7} {'queries':>8} {'p50 ms':>8} {'p99 ms':>8}")
+            created = 0
+            for collisions in sorted(options["collisions"]):
+                # "law", "law-1", ... and "info", "info1", ... up to `collisions` taken values.
+                for n in range(created, collisions):
+                    suffix = str(n) if n else ""
+                    user = User.objects.create_user(username=f"info{suffix}", email=f"info{n}@bench.example")
+                    Firm.objects.create(name=f"Law {n}", slug=f"law-{n}" if n else "law", owner=user)
+                created = max(created, collisions)
+                cases = [
+                    ("slug", "probe", lambda: probe_slug("Law")),
+                    ("slug", "prefix", lambda: generate_unique_slug(Firm, "Law")),
+                    ("username", "probe", lambda: probe_username("info@new.example")),
+                    ("username", "prefix", lambda: _unique_username_from_email("info@new.example")),
+                ]
+                for value, allocator, allocate in cases:
+                    queries = count_queries(allocate)
+                    stats = summarize(timed(allocate, options["repeat"]))
+                    self.stdout.write(
+                        f"{value:<9} {collisions:>6} {allocator:<7} {queries:>8} "
+                        f"{stats['p50'] * 1e3:>8.2f} {stats['p99'] * 1e3:>8.2f}"
+                    )
@@ -0,0 +1,58 @@
+import tempfile
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.test.utils import override_settings
+from django.utils import timezone
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+from rest_framework_simplejwt.tokens import RefreshToken as BaseRefreshToken
+
+from apps.authx.blacklist import revocation_filter
+from apps.authx.tokens import RefreshToken
+from core.benchmarking import benchmark_database, summarize, timed
+
+STRATEGIES = {
+    "blacklist table": BaseRefreshToken,
+    "filter + table": RefreshToken,
+}
+
+
+class Command(BaseCommand):
+    help = "Refresh token blacklist check latency as the blacklist grows, per strategy (runs on a throwaway test database)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+        parser.add_argument("--repeat", type=int, default=500)
+
+    def handle(self, *args, **options):
+        # The filter is only consulted with a cache every worker shares; a
+        # file-based one stands in for redis/memcached here.
+        with tempfile.TemporaryDirectory() as cache_dir, override_settings(
+            CACHES={"default": {"BACKEND": "django.core.cache.backends.filebased.FileBasedCache", "LOCATION": cache_dir}}
+        ):
+            self._run(options)
+
+    def _run(self, options):
+        with benchmark_database():
+            user = get_user_model().objects.create_user(username="bench_blacklist", email="bench_blacklist@example.com")
+            token = str(BaseRefreshToken.for_user(user))
+            self.stdout.write(f"{'strategy':<16} {'rows':>8} {'p50 us':>8} {'p99 us':>8}")
+            seeded = 0
+            for size in sorted(options["sizes"]):
+                self._seed(user, seeded, size)
+                seeded = size
+                revocation_filter.reset()
+                for name, token_class in STRATEGIES.items():
+                    token_class(token)  # warm up; loads the filter
+                    stats = summarize(timed(lambda: token_class(token), options["repeat"]))
+                    self.stdout.write(f"{name:<16} {size:>8} {stats['p50'] * 1e6:>8.0f} {stats['p99'] * 1e6:>8.0f}")
+
+    def _seed(self, user, start, stop):
+        expires = timezone.now() + timedelta(days=1)
+        for offset in range(start, stop, 5000):
+            outstanding = OutstandingToken.objects.bulk_create(
+                OutstandingToken(user=user, jti=f"bench-{n}", token="", expires_at=expires)
+                for n in range(offset, min(offset + 5000, stop))
+            )
+            BlacklistedToken.objects.bulk_create(BlacklistedToken(token=row) for row in outstanding)
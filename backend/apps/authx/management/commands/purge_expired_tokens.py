@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+from rest_framework_simplejwt.utils import aware_utcnow
+
+
+class Command(BaseCommand):
+    help = "Delete expired outstanding refresh tokens and their blacklist entries, one short transaction per batch"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=5000)
+
+    def handle(self, *args, **options):
+        batch_size = max(1, options["batch_size"])
+        now = aware_utcnow()
+        outstanding = blacklisted = batches = 0
+        while True:
+            with transaction.atomic():
+                ids = list(
+                    OutstandingToken.objects.filter(expires_at__lte=now).order_by().values_list("id", flat=True)[:batch_size]
+                )
+                if not ids:
+                    break
+                blacklisted += BlacklistedToken.objects.filter(token_id__in=ids).delete()[0]
+                outstanding += OutstandingToken.objects.filter(id__in=ids).delete()[0]
+            batches += 1
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Reclaimed {outstanding} outstanding and {blacklisted} blacklisted tokens in {batches} batches."
+            )
+        )
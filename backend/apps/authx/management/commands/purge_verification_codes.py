@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+from django.utils import timezone
+
+from apps.authx.models import EmailOTP, EmailVerificationToken
+
+
+class Command(BaseCommand):
+    help = "Delete expired and used email OTPs and verification tokens in batches"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=5000)
+
+    def handle(self, *args, **options):
+        batch_size = max(1, options["batch_size"])
+        now = timezone.now()
+        for model in (EmailOTP, EmailVerificationToken):
+            stale = model.objects.filter(Q(expires_at__lte=now) | Q(used_at__isnull=False)).order_by()
+            deleted = 0
+            while True:
+                ids = list(stale.values_list("id", flat=True)[:batch_size])
+                if not ids:
+                    break
+                deleted += model.objects.filter(id__in=ids).delete()[0]
+            self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} {model.__name__} rows."))
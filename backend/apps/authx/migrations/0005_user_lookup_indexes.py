@@ -0,0 +1,49 @@
+from django.conf import settings
+from django.db import migrations
+
+EMAIL_INDEX = 'authx_user_email_key_uniq'
+USERNAME_INDEX = 'authx_user_username_key_idx'
+
+
+def _table(apps, schema_editor):
+    return schema_editor.quote_name(apps.get_model(settings.AUTH_USER_MODEL)._meta.db_table)
+
+
+def create_lookup_indexes(apps, schema_editor):
+    table = _table(apps, schema_editor)
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT LOWER(NULLIF(email, '')) FROM {table} WHERE email <> '' "
+            f"GROUP BY LOWER(NULLIF(email, '')) HAVING COUNT(*) > 1"
+        )
+        duplicates = [row[0] for row in cursor.fetchmany(20)]
+    if duplicates:
+        raise RuntimeError(
+            'Users share an email address (case-insensitively): '
+            + ', '.join(duplicates)
+            + '. Merge or rename them, then run migrate again.'
+        )
+    # Built without blocking writes on PostgreSQL (needs the non-atomic migration).
+    concurrently = ' CONCURRENTLY' if schema_editor.connection.vendor == 'postgresql' else ''
+    schema_editor.execute(
+        f"CREATE UNIQUE INDEX{concurrently} IF NOT EXISTS {EMAIL_INDEX} ON {table} (LOWER(NULLIF(email, '')))"
+    )
+    schema_editor.execute(f"CREATE INDEX{concurrently} IF NOT EXISTS {USERNAME_INDEX} ON {table} (LOWER(username))")
+
+
+def drop_lookup_indexes(apps, schema_editor):
+    for name in (EMAIL_INDEX, USERNAME_INDEX):
+        schema_editor.execute(f"DROP INDEX IF EXISTS {name}")
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('authx', '0004_emailotp'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_lookup_indexes, drop_lookup_indexes),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.30 on 2026-10-18 20:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authx', '0005_user_lookup_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='emailotp',
+            index=models.Index(condition=models.Q(('used_at__isnull', True)), fields=['user', 'purpose', '-created_at'], name='authx_otp_active_idx'),
+        ),
+    ]
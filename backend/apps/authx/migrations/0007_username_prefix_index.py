@@ -0,0 +1,42 @@
+from django.conf import settings
+from django.db import migrations
+
+USERNAME_INDEX = 'authx_user_username_key_idx'
+REBUILT_INDEX = 'authx_user_username_key_new'
+
+
+def _table(apps, schema_editor):
+    return schema_editor.quote_name(apps.get_model(settings.AUTH_USER_MODEL)._meta.db_table)
+
+
+def _rebuild(apps, schema_editor, opclass):
+    # PostgreSQL only uses a btree index for LIKE 'prefix%' with a pattern
+    # operator class (username allocation, see allocation.py); SQLite keeps
+    # the index from 0005. Built aside and swapped in, without blocking writes.
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    table = _table(apps, schema_editor)
+    schema_editor.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {REBUILT_INDEX}")
+    schema_editor.execute(f"CREATE INDEX CONCURRENTLY {REBUILT_INDEX} ON {table} (LOWER(username){opclass})")
+    schema_editor.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {USERNAME_INDEX}")
+    schema_editor.execute(f"ALTER INDEX {REBUILT_INDEX} RENAME TO {USERNAME_INDEX}")
+
+
+def use_pattern_ops(apps, schema_editor):
+    _rebuild(apps, schema_editor, ' text_pattern_ops')
+
+
+def use_default_ops(apps, schema_editor):
+    _rebuild(apps, schema_editor, '')
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ('authx', '0006_emailotp_active_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(use_pattern_ops, use_default_ops),
+    ]
@@ -4,16 +4,18 @@ from django.utils.text import slugify
 from django.utils import timezone
 import uuid
 
+from .allocation import allocate
+
 
 def generate_unique_slug(model, base_text: str, slug_field: str = 'slug') -> str:
-    """Generate a unique slug for the given model based on base_text."""
-    base_slug = slugify(base_text) or 'firm'
-    slug = base_slug
-    index = 1
-    while model.objects.filter(**{slug_field: slug}).exists():
-        slug = f"{base_slug}-{index}"
-        index += 1
-    return slug
+    """Generate a unique slug for the given model based on base_text (one query; see allocation.py)."""
+    return allocate(
+        model.objects.all(),
+        slugify(base_text) or 'firm',
+        field=slug_field,
+        max_length=model._meta.get_field(slug_field).max_length,
+        separator='-',
+    )
 
 
 class Firm(models.Model):
@@ -80,6 +82,14 @@ class EmailOTP(models.Model):
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            # Newest unused code of a user (otp_store fallback on a cache miss).
+            models.Index(
+                fields=["user", "purpose", "-created_at"],
+                condition=models.Q(used_at__isnull=True),
+                name="authx_otp_active_idx",
+            ),
+        ]
 
     @property
     def is_expired(self):
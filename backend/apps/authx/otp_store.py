@@ -0,0 +1,135 @@
+import enum
+import time
+
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+from django.utils.crypto import constant_time_compare
+
+from .models import EmailOTP
+
+KEY_PREFIX = 'authx:otp:'
+MAX_ATTEMPTS = 5
+
+
+class Result(enum.Enum):
+    VERIFIED = 'verified'
+    INVALID = 'invalid'
+    LOCKED = 'locked'
+
+
+def _key(user_id, purpose):
+    return f'{KEY_PREFIX}{purpose}:{user_id}'
+
+
+def _attempts_key(otp_id):
+    return f'{KEY_PREFIX}attempts:{otp_id}'
+
+
+def _entry(otp):
+    return {'id': otp.id, 'code': otp.code, 'expires_at': otp.expires_at.timestamp()}
+
+
+def _ttl(entry):
+    return int(entry['expires_at'] - time.time()) + 1
+
+
+def _cache(user_id, purpose, entry):
+    ttl = _ttl(entry)
+    if ttl > 0:
+        cache.set(_key(user_id, purpose), entry, timeout=ttl)
+
+
+async def _acache(user_id, purpose, entry):
+    ttl = _ttl(entry)
+    if ttl > 0:
+        await cache.aset(_key(user_id, purpose), entry, timeout=ttl)
+
+
+def remember(otp):
+    """Make `otp` the active code of its user and purpose once the current transaction commits."""
+    entry = _entry(otp)
+    transaction.on_commit(lambda: _cache(otp.user_id, otp.purpose, entry))
+
+
+async def aremember(otp):
+    """`remember` for async callers: the async ORM autocommits, so the row is already committed."""
+    await _acache(otp.user_id, otp.purpose, _entry(otp))
+
+
+def _active_rows(user_id, purpose):
+    return EmailOTP.objects.filter(
+        user_id=user_id, purpose=purpose, used_at__isnull=True, expires_at__gt=timezone.now()
+    ).order_by('-created_at')
+
+
+def _active(user_id, purpose):
+    entry = cache.get(_key(user_id, purpose))
+    if entry is not None:
+        return entry
+    otp = _active_rows(user_id, purpose).first()
+    if otp is None:
+        return None
+    entry = _entry(otp)
+    _cache(user_id, purpose, entry)
+    return entry
+
+
+async def _aactive(user_id, purpose):
+    entry = await cache.aget(_key(user_id, purpose))
+    if entry is not None:
+        return entry
+    otp = await _active_rows(user_id, purpose).afirst()
+    if otp is None:
+        return None
+    entry = _entry(otp)
+    await _acache(user_id, purpose, entry)
+    return entry
+
+
+def _consume(user_id, purpose, entry):
+    cache.delete(_key(user_id, purpose))
+    return EmailOTP.objects.filter(id=entry['id'], used_at__isnull=True).update(used_at=timezone.now()) == 1
+
+
+async def _aconsume(user_id, purpose, entry):
+    await cache.adelete(_key(user_id, purpose))
+    return await EmailOTP.objects.filter(id=entry['id'], used_at__isnull=True).aupdate(used_at=timezone.now()) == 1
+
+
+def verify(user_id, purpose, code):
+    entry = _active(user_id, purpose)
+    if entry is None or entry['expires_at'] <= time.time():
+        return Result.INVALID
+    if constant_time_compare(entry['code'], code):
+        return Result.VERIFIED if _consume(user_id, purpose, entry) else Result.INVALID
+    attempts_key = _attempts_key(entry['id'])
+    cache.add(attempts_key, 0, timeout=max(1, _ttl(entry)))
+    try:
+        attempts = cache.incr(attempts_key)
+    except ValueError:  # expired between add and incr
+        attempts = MAX_ATTEMPTS
+    if attempts >= MAX_ATTEMPTS:
+        _consume(user_id, purpose, entry)
+        return Result.LOCKED
+    return Result.INVALID
+
+
+async def averify(user_id, purpose, code):
+    entry = await _aactive(user_id, purpose)
+    if entry is None or entry['expires_at'] <= time.time():
+        return Result.INVALID
+    if constant_time_compare(entry['code'], code):
+        return Result.VERIFIED if await _aconsume(user_id, purpose, entry) else Result.INVALID
+    attempts_key = _attempts_key(entry['id'])
+    await cache.aadd(attempts_key, 0, timeout=max(1, _ttl(entry)))
+    try:
+        # BaseCache.aincr is a get then a set; the sync incr is atomic on every backend.
+        attempts = await sync_to_async(cache.incr)(attempts_key)
+    except ValueError:  # expired between add and incr
+        attempts = MAX_ATTEMPTS
+    if attempts >= MAX_ATTEMPTS:
+        await _aconsume(user_id, purpose, entry)
+        return Result.LOCKED
+    return Result.INVALID
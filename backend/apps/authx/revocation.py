@@ -0,0 +1,26 @@
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+KEY_PREFIX = 'authx:revoked:'
+
+
+def _key(user_id):
+    return f'{KEY_PREFIX}{user_id}'
+
+
+def revoke_user_tokens(user_id):
+    """Invalidate every access token stamped for `user_id` up to now."""
+    lifetime = settings.SIMPLE_JWT['ACCESS_TOKEN_LIFETIME'].total_seconds()
+    cache.set(_key(user_id), time.time(), timeout=int(lifetime) + 1)
+
+
+def is_revoked(user_id, stamped_at):
+    revoked_at = cache.get(_key(user_id))
+    return revoked_at is not None and (stamped_at is None or stamped_at <= revoked_at)
+
+
+async def ais_revoked(user_id, stamped_at):
+    revoked_at = await cache.aget(_key(user_id))
+    return revoked_at is not None and (stamped_at is None or stamped_at <= revoked_at)
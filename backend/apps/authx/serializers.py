@@ -1,23 +1,28 @@
 from django.contrib.auth import authenticate, get_user_model
 from django.contrib.auth.password_validation import validate_password
 from django.db import transaction
+from django.db.models.functions import Lower
 from rest_framework import serializers
-from rest_framework_simplejwt.tokens import RefreshToken
+from . import hashing
+from .allocation import allocate, create_unique
+from .identity import users_by_email
 from .models import Firm, generate_unique_slug, UserProfile
 from .validators import validate_strong_password
 from .services_otp import create_email_otp, send_email_otp, ensure_profile
+from .tokens import RefreshToken
 
 User = get_user_model()
 
 
 def _unique_username_from_email(email: str) -> str:
-    base_username = email.split('@')[0][:150] or 'user'
-    username = base_username
-    counter = 1
-    while User.objects.filter(username__iexact=username).exists():
-        username = f"{base_username}{counter}"[:150]
-        counter += 1
-    return username
+    """`info@...` -> info, info1, info2, ... free case-insensitively (one query; see allocation.py)."""
+    return allocate(
+        User.objects.all(),
+        (email.split('@')[0] or 'user').lower(),
+        field='username',
+        max_length=User._meta.get_field('username').max_length,
+        key=Lower('username'),
+    )
 
 
 class RegisterFirmSerializer(serializers.Serializer):
@@ -34,7 +39,7 @@ class RegisterFirmSerializer(serializers.Serializer):
         return value
 
     def validate_email(self, value):
-        if User.objects.filter(email__iexact=value).exists():
+        if users_by_email(value).exists():
             raise serializers.ValidationError('A user with this email already exists.')
         return value.lower()
 
@@ -53,18 +58,26 @@ class RegisterFirmSerializer(serializers.Serializer):
         email = validated_data['email']
         password = validated_data['password']
 
-        username = _unique_username_from_email(email)
-        user = User(username=username, email=email, first_name=first_name, last_name=last_name)
-        user.set_password(password)
-        user.full_clean(exclude=['password'])
-        user.save()
+        password_hash = hashing.make_password(password)
+
+        def create_user(username):
+            user = User(username=username, email=email, first_name=first_name, last_name=last_name)
+            user.password = password_hash
+            # Uniqueness is left to the insert, where create_unique handles a collision.
+            user.full_clean(exclude=['password'], validate_unique=False)
+            user.save()
+            return user
+
+        user = create_unique(lambda: _unique_username_from_email(email), create_user)
         # assign firm owner role
         if hasattr(user, "role"):
             user.role = "FIRM_OWNER"
             user.save(update_fields=["role"])
 
-        firm_slug = generate_unique_slug(Firm, firm_name)
-        firm = Firm.objects.create(name=firm_name, slug=firm_slug, owner=user)
+        firm = create_unique(
+            lambda: generate_unique_slug(Firm, firm_name),
+            lambda slug: Firm.objects.create(name=firm_name, slug=slug, owner=user),
+        )
 
         ensure_profile(user)
         otp = create_email_otp(user)
@@ -87,10 +100,7 @@ class LoginSerializer(serializers.Serializer):
             return attrs
 
         # Provide field-specific errors
-        from django.contrib.auth import get_user_model
-
-        User = get_user_model()
-        if not User.objects.filter(email__iexact=email).exists():
+        if not users_by_email(email).exists():
             raise serializers.ValidationError({'email': 'Email not found.'})
 
         raise serializers.ValidationError({'password': 'Incorrect password.'})
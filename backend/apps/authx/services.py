@@ -1,36 +1,29 @@
 from typing import Optional, Tuple
 
 from django.contrib.auth import get_user_model
-from rest_framework_simplejwt.tokens import RefreshToken
 
-from .models import Firm, UserProfile
+from . import bootstrap
+from .models import Firm
+from .tokens import RefreshToken, stamp_claims
 
 User = get_user_model()
 
 
-def _get_profile(user: User) -> UserProfile:
-    profile, _ = UserProfile.objects.get_or_create(user=user, defaults={'email_verified': False})
-    return profile
-
-
 def build_tokens(user: User) -> Tuple[str, str]:
     """Return (access, refresh) pair for user."""
-    refresh = RefreshToken.for_user(user)
+    refresh = stamp_claims(RefreshToken.for_user(user), user)
     return str(refresh.access_token), str(refresh)
 
 
 def build_auth_body(user: User, access_token: str, firm: Optional[Firm] = None) -> dict:
-    firm = firm or Firm.objects.filter(owner=user).first()
-    profile = _get_profile(user)
-    role_value = getattr(user, "role", None) or "FIRM_OWNER"
+    session = bootstrap.get(user.pk)
+    if firm is None and session['firm']:
+        firm = Firm(**{name: session['firm'][name] for name in ('id', 'name', 'slug')})
     return {
         'user': {
-            'id': user.id,
-            'email': user.email,
-            'first_name': user.first_name,
-            'last_name': user.last_name,
-            'role': role_value,
-            'email_verified': profile.email_verified,
+            **session['user'],
+            'role': session['role'],
+            'email_verified': session['profile']['email_verified'],
         },
         'firm': {
             'id': firm.id,
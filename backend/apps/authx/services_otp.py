@@ -2,9 +2,10 @@ import secrets
 from datetime import timedelta
 
 from django.utils import timezone
-from django.core.mail import send_mail
-from django.conf import settings
 
+from core.outbox import asend_email, send_email
+
+from . import otp_store
 from .models import EmailOTP, UserProfile
 
 
@@ -12,23 +13,48 @@ def generate_otp() -> str:
     return f"{secrets.randbelow(1_000_000):06d}"
 
 
-def create_email_otp(user, purpose: str = "email_verification") -> EmailOTP:
-    code = generate_otp()
-    otp = EmailOTP.objects.create(
+def _new_otp(user, purpose: str) -> EmailOTP:
+    return EmailOTP(
         user=user,
-        code=code,
+        code=generate_otp(),
         purpose=purpose,
         expires_at=timezone.now() + timedelta(minutes=10),
     )
+
+
+def create_email_otp(user, purpose: str = "email_verification") -> EmailOTP:
+    otp = _new_otp(user, purpose)
+    otp.save(force_insert=True)
+    otp_store.remember(otp)
     return otp
 
 
-def send_email_otp(user, code: str):
+async def acreate_email_otp(user, purpose: str = "email_verification") -> EmailOTP:
+    otp = _new_otp(user, purpose)
+    await otp.asave(force_insert=True)
+    await otp_store.aremember(otp)
+    return otp
+
+
+def _otp_email(code: str):
     subject = "Your verification code"
     body = f"Your OTP is {code}. It expires in 10 minutes."
-    send_mail(subject, body, settings.DEFAULT_FROM_EMAIL, [user.email])
+    return subject, body
+
+
+def send_email_otp(user, code: str):
+    send_email(*_otp_email(code), [user.email])
+
+
+async def asend_email_otp(user, code: str):
+    await asend_email(*_otp_email(code), [user.email])
 
 
 def ensure_profile(user):
     profile, _ = UserProfile.objects.get_or_create(user=user, defaults={"email_verified": False})
     return profile
+
+
+async def aensure_profile(user):
+    profile, _ = await UserProfile.objects.aget_or_create(user=user, defaults={"email_verified": False})
+    return profile
@@ -0,0 +1,85 @@
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+
+from . import bootstrap
+from .blacklist import mark_changed
+from .models import Firm, UserProfile
+from .revocation import revoke_user_tokens
+
+User = get_user_model()
+
+# User fields that feed access token claims (role only exists on custom user models).
+CLAIM_FIELDS = tuple(name for name in ('is_active', 'role') if any(f.name == name for f in User._meta.fields))
+
+
+def forget_session_on_commit(*user_ids):
+    for user_id in {user_id for user_id in user_ids if user_id is not None}:
+        transaction.on_commit(lambda user_id=user_id: bootstrap.forget(user_id))
+
+
+def revoke_on_commit(*user_ids):
+    # Every claim change also changes the bootstrap payload.
+    forget_session_on_commit(*user_ids)
+    for user_id in {user_id for user_id in user_ids if user_id is not None}:
+        transaction.on_commit(lambda user_id=user_id: revoke_user_tokens(user_id))
+
+
+def _changed(instance, fields):
+    if instance.pk is None:
+        return False
+    old = type(instance)._base_manager.filter(pk=instance.pk).values(*fields).first()
+    return old is not None and any(old[field] != getattr(instance, field) for field in fields)
+
+
+@receiver(pre_save, sender=User, dispatch_uid='authx_revoke_user_change')
+def revoke_on_user_change(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw:
+        return
+    fields = [field for field in CLAIM_FIELDS if update_fields is None or field in update_fields]
+    if fields and _changed(instance, fields):
+        revoke_on_commit(instance.pk)
+
+
+@receiver(pre_save, sender=Firm, dispatch_uid='authx_revoke_firm_owner_change')
+def revoke_on_firm_owner_change(sender, instance, raw=False, **kwargs):
+    if raw or instance.pk is None:
+        return
+    old_owner = Firm.objects.filter(pk=instance.pk).values_list('owner_id', flat=True).first()
+    if old_owner != instance.owner_id:
+        revoke_on_commit(old_owner, instance.owner_id)
+
+
+@receiver(post_save, sender=Firm, dispatch_uid='authx_revoke_firm_created')
+def revoke_on_firm_created(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        revoke_on_commit(instance.owner_id)
+
+
+@receiver(post_save, sender=UserProfile, dispatch_uid='authx_revoke_profile_save')
+@receiver(post_delete, sender=UserProfile, dispatch_uid='authx_revoke_profile_delete')
+@receiver(post_delete, sender=Firm, dispatch_uid='authx_revoke_firm_delete')
+def revoke_owner_or_profile_user(sender, instance, raw=False, **kwargs):
+    if not raw:
+        revoke_on_commit(getattr(instance, 'owner_id', None) or getattr(instance, 'user_id', None))
+
+
+@receiver(post_delete, sender=User, dispatch_uid='authx_revoke_user_delete')
+def revoke_on_user_delete(sender, instance, **kwargs):
+    revoke_on_commit(instance.pk)
+
+
+@receiver(post_save, sender=User, dispatch_uid='authx_forget_session_user_save')
+@receiver(post_save, sender=Firm, dispatch_uid='authx_forget_session_firm_save')
+def forget_session_on_save(sender, instance, raw=False, **kwargs):
+    # Names and firm details are in the bootstrap payload but not in token claims.
+    if not raw:
+        forget_session_on_commit(instance.owner_id if sender is Firm else instance.pk)
+
+
+@receiver(post_save, sender=BlacklistedToken, dispatch_uid='authx_blacklist_changed')
+def publish_blacklist_change(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        transaction.on_commit(mark_changed)
@@ -0,0 +1,85 @@
+from django.contrib.auth import get_user_model
+from django.db import IntegrityError, connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from apps.authx.allocation import create_unique
+from apps.authx.models import Firm, generate_unique_slug
+from apps.authx.serializers import RegisterFirmSerializer, _unique_username_from_email
+
+
+User = get_user_model()
+
+
+class AllocationTests(TestCase):
+    def setUp(self):
+        self.owner = User.objects.create_user(username='alloc_owner', email='alloc_owner@example.com', password='x')
+
+    def _firms(self, *slugs):
+        for slug in slugs:
+            n = Firm.objects.count()
+            owner = User.objects.create_user(username=f'alloc_{n}', email=f'alloc_{n}@example.com', password='x')
+            Firm.objects.create(name=f'Firm {slug}', slug=slug, owner=owner)
+
+    def test_slug_takes_first_gap_in_one_query(self):
+        with self.assertNumQueries(1):
+            self.assertEqual(generate_unique_slug(Firm, 'Law'), 'law')
+        self._firms('law', 'law-1', 'law-3', 'lawyers', 'law-x', 'law-01')
+        with self.assertNumQueries(1):
+            self.assertEqual(generate_unique_slug(Firm, 'Law'), 'law-2')
+        self._firms('law-2')
+        self.assertEqual(generate_unique_slug(Firm, 'law'), 'law-4')
+
+    def test_username_is_case_insensitive(self):
+        User.objects.create_user(username='Info', password='x')
+        User.objects.create_user(username='INFO1', password='x')
+        User.objects.create_user(username='information', password='x')
+        with self.assertNumQueries(1):
+            self.assertEqual(_unique_username_from_email('Info@example.com'), 'info2')
+
+    def test_long_base_is_shortened_to_fit_suffix(self):
+        base = 'a' * 300
+        slug = generate_unique_slug(Firm, base)
+        self._firms(slug)
+        self.assertEqual(generate_unique_slug(Firm, base), f'{slug}-1')
+        self.assertLessEqual(len(f'{slug}-1'), 255)
+
+    def test_collision_on_insert_reallocates(self):
+        self._firms('race')
+        values = iter(['race', 'race-1'])
+
+        def create(slug):
+            return Firm.objects.create(name='Race 2', slug=slug, owner=self.owner)
+
+        firm = create_unique(lambda: next(values), create)
+        self.assertEqual(firm.slug, 'race-1')
+
+    def test_unrelated_violation_is_raised(self):
+        self._firms('race')
+        with self.assertRaises(IntegrityError):
+            create_unique(lambda: 'race', lambda slug: Firm.objects.create(name='Firm race', slug='x', owner=self.owner))
+
+    def test_registration_queries_do_not_grow_with_collisions(self):
+        def register(n):
+            # Every firm slugifies to "acme" and every user wants "info".
+            serializer = RegisterFirmSerializer(
+                data={
+                    'firm_name': 'Acme' + '.' * n,
+                    'first_name': 'A',
+                    'last_name': 'B',
+                    'email': f'info@acme{n}.com',
+                    'password': 'Str0ng!Passw0rd',
+                    'password2': 'Str0ng!Passw0rd',
+                }
+            )
+            self.assertTrue(serializer.is_valid(), serializer.errors)
+            with CaptureQueriesContext(connection) as queries:
+                user, firm = serializer.save()
+            return user, firm, len(queries)
+
+        counts = []
+        for n in range(6):
+            user, firm, queries = register(n)
+            self.assertEqual((user.username, firm.slug), ('info' + (str(n) if n else ''), 'acme' + (f'-{n}' if n else '')))
+            counts.append(queries)
+        self.assertEqual(len(set(counts[1:])), 1, counts)
@@ -0,0 +1,81 @@
+from django.core import mail
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import include, path
+
+from apps.authx import async_views
+from apps.authx.models import EmailOTP, UserProfile
+from apps.authx.services import build_tokens
+from apps.cases.tests.factories import create_firm, create_user
+from core.models import EmailOutbox
+
+urlpatterns = [
+    path('sync/', include('apps.authx.urls')),
+    path('async/me/', async_views.MeView.as_view()),
+    path('async/send-otp/', async_views.SendOTPView.as_view()),
+    path('async/verify-otp/', async_views.VerifyOTPView.as_view()),
+    path('async/resend-verification/', async_views.ResendVerificationView.as_view()),
+]
+
+
+@override_settings(
+    ROOT_URLCONF=__name__, EMAIL_OUTBOX_ENABLED=False, EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend'
+)
+class AsyncViewTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user, self.firm = create_firm('async', owner=create_user('async_user'), role=None)
+        UserProfile.objects.create(user=self.user)
+        with self.captureOnCommitCallbacks(execute=True):
+            access, _ = build_tokens(self.user)
+        self.auth = {'AUTHORIZATION': f'Bearer {access}'}
+
+    async def _post(self, path, data):
+        return await self.async_client.post(path, data, content_type='application/json')
+
+    async def test_send_and_verify_code(self):
+        response = await self._post('/async/send-otp/', {'email': 'ASYNC_USER@example.com'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {'data': {'detail': 'If the account exists, a code was sent.'}})
+        otp = await EmailOTP.objects.aget(user=self.user)
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertIn(otp.code, mail.outbox[0].body)
+
+        response = await self._post('/async/verify-otp/', {'email': 'async_user@example.com', 'code': 'wrong'})
+        self.assertEqual(response.json()['error']['code'], 'INVALID_CODE')
+        response = await self._post('/async/verify-otp/', {'email': 'async_user@example.com', 'code': otp.code})
+        self.assertEqual(response.json(), {'data': {'detail': 'Email verified.'}})
+        profile = await UserProfile.objects.aget(user=self.user)
+        self.assertTrue(profile.email_verified)
+
+    async def test_repeated_wrong_codes_lock(self):
+        await self._post('/async/resend-verification/', {'email': 'async_user@example.com'})
+        for _ in range(4):
+            await self._post('/async/verify-otp/', {'email': 'async_user@example.com', 'code': '000000'})
+        response = await self._post('/async/verify-otp/', {'email': 'async_user@example.com', 'code': 'nope'})
+        self.assertEqual(response.json()['error']['code'], 'OTP_LOCKED')
+
+    @override_settings(EMAIL_OUTBOX_ENABLED=True)
+    async def test_outbox_enqueues(self):
+        await self._post('/async/send-otp/', {'email': 'async_user@example.com'})
+        self.assertEqual(mail.outbox, [])
+        row = await EmailOutbox.objects.aget()
+        self.assertEqual(row.to, ['async_user@example.com'])
+
+    async def test_errors_match_sync_views(self):
+        for path, data in (('send-otp/', {}), ('verify-otp/', {'email': 'nobody@example.com', 'code': '123456'})):
+            sync = await self._post(f'/sync/{path}', data)
+            response = await self._post(f'/async/{path}', data)
+            self.assertEqual((response.status_code, response.json()), (sync.status_code, sync.json()))
+
+        sync = await self.async_client.get('/sync/me/')
+        response = await self.async_client.get('/async/me/')
+        self.assertEqual((response.status_code, response.json()), (401, sync.json()))
+        self.assertEqual(response['WWW-Authenticate'], sync['WWW-Authenticate'])
+
+    async def test_me_matches_sync_view(self):
+        sync = await self.async_client.get('/sync/me/', headers=self.auth)
+        response = await self.async_client.get('/async/me/', headers=self.auth)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), sync.json())
+        self.assertEqual(response.json()['data']['firm']['slug'], 'async-firm')
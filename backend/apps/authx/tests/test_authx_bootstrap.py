@@ -0,0 +1,82 @@
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from apps.authx.models import UserProfile
+from apps.authx.services import build_auth_body, build_tokens
+from apps.cases import counts
+from apps.cases.models import Case, CaseStatus
+from apps.cases.tests.factories import create_firm, create_user
+
+
+class BootstrapTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        owner = create_user('boot_owner', first_name='Ada')
+        self.owner, self.firm = create_firm('boot', owner=owner, role=None, phone='123')
+        self.profile = UserProfile.objects.create(user=self.owner)
+        Case.objects.create(firm=self.firm, created_by=self.owner, title='Open one')
+        Case.objects.create(firm=self.firm, created_by=self.owner, title='Closed one', status=CaseStatus.CLOSED)
+        counts.recompute(self.firm.id)
+        self._authenticate()
+
+    def _authenticate(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            access, _ = build_tokens(self.owner)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {access}')
+
+    def _bootstrap(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.get('/api/authx/bootstrap/')
+        self.assertEqual(response.status_code, 200)
+        return response.data['data']
+
+    def test_payload_loads_in_one_query_then_from_cache(self):
+        with self.assertNumQueries(1):
+            data = self._bootstrap()
+        self.assertEqual(data['user']['first_name'], 'Ada')
+        self.assertEqual(data['role'], 'FIRM_OWNER')
+        self.assertEqual(data['profile'], {'email_verified': False})
+        self.assertEqual((data['firm']['id'], data['firm']['phone']), (self.firm.id, '123'))
+        self.assertEqual(data['summary']['cases']['total'], 2)
+        self.assertEqual(data['summary']['cases']['by_status'], {'OPEN': 1, 'HOLD': 0, 'CLOSED': 1})
+        with self.assertNumQueries(0):
+            self.assertEqual(self._bootstrap(), data)
+
+    def test_firm_profile_update_invalidates(self):
+        self._bootstrap()
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.patch(
+                '/api/firms/profile/', {'phone': '999', 'owner_first_name': 'Grace'}, format='json'
+            )
+        self.assertEqual(response.status_code, 200)
+        data = self._bootstrap()
+        self.assertEqual((data['firm']['phone'], data['user']['first_name']), ('999', 'Grace'))
+
+    def test_profile_verification_invalidates(self):
+        self._bootstrap()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.profile.email_verified = True
+            self.profile.save(update_fields=['email_verified'])
+        # Verification is a token claim, so the old access token is revoked.
+        self._authenticate()
+        self.assertEqual(self._bootstrap()['profile'], {'email_verified': True})
+
+    def test_auth_body_and_me_reuse_loader(self):
+        body = build_auth_body(self.owner, 'token')
+        self.assertEqual(
+            body['user'],
+            {
+                'id': self.owner.id,
+                'email': 'boot_owner@example.com',
+                'first_name': 'Ada',
+                'last_name': '',
+                'role': 'FIRM_OWNER',
+                'email_verified': False,
+            },
+        )
+        self.assertEqual(body['firm'], {'id': self.firm.id, 'name': 'Boot Firm', 'slug': 'boot-firm'})
+        response = self.client.get('/api/authx/me/')
+        self.assertEqual(response.data['data']['firm'], body['firm'])
+        self.assertFalse(response.data['data']['email_verified'])
@@ -0,0 +1,71 @@
+from io import StringIO
+from unittest import mock
+
+from django.core import mail
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from apps.cases.tests.factories import create_user
+from core import outbox
+from core.models import EmailOutbox, EmailOutboxStatus
+
+
+@override_settings(EMAIL_OUTBOX_ENABLED=True, EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend')
+class EmailOutboxTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = create_user('outbox_user')
+
+    def _send_outbox(self, *args):
+        out = StringIO()
+        call_command('send_outbox', '--once', *args, stdout=out)
+        return out.getvalue()
+
+    def test_send_otp_enqueues_instead_of_sending(self):
+        response = self.client.post('/api/authx/send-otp/', {'email': 'OUTBOX_USER@example.com'}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(mail.outbox, [])
+        row = EmailOutbox.objects.get()
+        self.assertEqual((row.to, row.status), (['outbox_user@example.com'], EmailOutboxStatus.PENDING))
+
+        self.assertIn('Sent 1 emails; 0 to retry, 0 failed.', self._send_outbox())
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].subject, 'Your verification code')
+        row.refresh_from_db()
+        self.assertEqual((row.status, row.attempts), (EmailOutboxStatus.SENT, 1))
+        self.assertIsNotNone(row.sent_at)
+
+    def test_batch_reuses_one_connection(self):
+        for n in range(5):
+            outbox.send_email(f'Subject {n}', 'Body', [f'user{n}@example.com'], html_body='<p>Body</p>')
+        with mock.patch('django.core.mail.backends.locmem.EmailBackend.open') as opened:
+            self._send_outbox('--batch-size', '2')
+        self.assertEqual(opened.call_count, 3)
+        self.assertEqual(len(mail.outbox), 5)
+        self.assertEqual(mail.outbox[0].alternatives, [('<p>Body</p>', 'text/html')])
+
+    def test_failures_back_off_then_fail(self):
+        row = outbox.send_email('Subject', 'Body', ['user@example.com'])
+        failing = mock.patch(
+            'django.core.mail.backends.locmem.EmailBackend.send_messages', side_effect=ConnectionError('refused')
+        )
+        with failing:
+            self.assertIn('0 emails; 1 to retry', self._send_outbox())
+        row.refresh_from_db()
+        self.assertEqual((row.status, row.attempts), (EmailOutboxStatus.PENDING, 1))
+        self.assertGreater(row.next_attempt_at, timezone.now())
+        self.assertIn('refused', row.last_error)
+
+        EmailOutbox.objects.filter(id=row.id).update(next_attempt_at=timezone.now())
+        with failing:
+            self.assertIn('0 to retry, 1 failed', self._send_outbox('--max-attempts', '2'))
+        row.refresh_from_db()
+        self.assertEqual(row.status, EmailOutboxStatus.FAILED)
+
+    @override_settings(EMAIL_OUTBOX_ENABLED=False)
+    def test_disabled_outbox_sends_immediately(self):
+        outbox.send_email('Now', 'Body', ['user@example.com'])
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertFalse(EmailOutbox.objects.exists())
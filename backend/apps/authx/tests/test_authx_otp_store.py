@@ -0,0 +1,67 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from apps.authx import otp_store
+from apps.authx.models import EmailOTP, EmailVerificationToken, UserProfile
+from apps.authx.services_otp import create_email_otp
+from apps.cases.tests.factories import create_user
+
+
+class OTPStoreTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = create_user('otp_user')
+        UserProfile.objects.create(user=self.user)
+
+    def _issue(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            return create_email_otp(self.user)
+
+    def _verify(self, code):
+        return self.client.post('/api/authx/verify-otp/', {'email': 'otp_user@example.com', 'code': code}, format='json')
+
+    def test_verify_reads_active_code_from_cache(self):
+        otp = self._issue()
+        with CaptureQueriesContext(connection) as queries:
+            self.assertIs(otp_store.verify(self.user.pk, otp.purpose, otp.code), otp_store.Result.VERIFIED)
+        self.assertFalse(any('SELECT' in query['sql'] and 'authx_emailotp' in query['sql'] for query in queries))
+        self.assertIs(otp_store.verify(self.user.pk, otp.purpose, otp.code), otp_store.Result.INVALID)
+
+    def test_cache_miss_falls_back_to_newest_unused_row(self):
+        self._issue()
+        latest = self._issue()
+        cache.clear()
+        response = self._verify(latest.code)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(UserProfile.objects.get(user=self.user).email_verified)
+        latest.refresh_from_db()
+        self.assertIsNotNone(latest.used_at)
+
+    def test_wrong_guesses_lock_the_code(self):
+        otp = self._issue()
+        wrong = '000000' if otp.code != '000000' else '111111'
+        for _ in range(otp_store.MAX_ATTEMPTS - 1):
+            self.assertEqual(self._verify(wrong).data['error']['code'], 'INVALID_CODE')
+        self.assertEqual(self._verify(wrong).data['error']['code'], 'OTP_LOCKED')
+        self.assertEqual(self._verify(otp.code).status_code, 400)
+
+    def test_purge_deletes_expired_and_used_rows(self):
+        active = self._issue()
+        EmailOTP.objects.create(user=self.user, code='123456', expires_at=timezone.now() - timedelta(minutes=1))
+        EmailOTP.objects.create(user=self.user, code='654321', expires_at=active.expires_at, used_at=timezone.now())
+        EmailVerificationToken.objects.create(user=self.user, expires_at=timezone.now() - timedelta(days=1))
+        out = StringIO()
+        call_command('purge_verification_codes', batch_size=1, stdout=out)
+        self.assertIn('Deleted 2 EmailOTP rows.', out.getvalue())
+        self.assertEqual(list(EmailOTP.objects.values_list('id', flat=True)), [active.id])
+        self.assertIn('Deleted 1 EmailVerificationToken rows.', out.getvalue())
+        self.assertFalse(EmailVerificationToken.objects.exists())
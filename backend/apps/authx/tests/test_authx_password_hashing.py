@@ -0,0 +1,51 @@
+import asyncio
+
+from django.contrib.auth.hashers import check_password as django_check_password
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from apps.authx import hashing
+from apps.cases.tests.factories import create_firm, create_user
+
+
+@override_settings(PASSWORD_HASH_WORKERS=1, PASSWORD_HASH_QUEUE_LIMIT=2)
+class PasswordHashingPoolTests(TestCase):
+    @classmethod
+    def tearDownClass(cls):
+        hashing.shutdown_pool()
+        super().tearDownClass()
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user, _ = create_firm('pool', owner=create_user('pool_user', password='Secret#123'), role=None)
+
+    def _login(self):
+        return self.client.post(
+            '/api/authx/login/', {'email': 'POOL_USER@example.com', 'password': 'Secret#123'}, format='json'
+        )
+
+    def test_hashes_round_trip_through_pool(self):
+        encoded = hashing.make_password('Secret#123')
+        self.assertTrue(django_check_password('Secret#123', encoded))
+        self.assertTrue(hashing.check_password('Secret#123', encoded))
+        self.assertFalse(hashing.check_password('wrong', encoded))
+        self.assertTrue(asyncio.run(hashing.acheck_password('Secret#123', encoded)))
+
+    def test_login_checks_password_in_pool(self):
+        response = self._login()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['data']['user']['id'], self.user.id)
+
+    def test_saturated_queue_returns_503(self):
+        hashing.start_pool()
+        slots = hashing._slots
+        for _ in range(2):
+            slots.acquire()
+        try:
+            response = self._login()
+        finally:
+            for _ in range(2):
+                slots.release()
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.data['error']['code'], 'SERVICE_UNAVAILABLE')
+        self.assertEqual(response['Retry-After'], '1')
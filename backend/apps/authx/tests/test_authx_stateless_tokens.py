@@ -0,0 +1,76 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+
+from apps.authx.services import build_tokens
+from apps.cases import counts
+from apps.cases.models import Case
+from apps.cases.tests.factories import create_firm, create_user
+
+
+class StatelessTokenTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.owner, self.firm = create_firm('claims', role=None)
+        Case.objects.create(firm=self.firm, created_by=self.owner, title='Claimed case')
+        # Built up front; building them locks the firm row.
+        counts.recompute(self.firm.id)
+
+    def _tokens(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            return build_tokens(self.owner)
+
+    def _get_cases(self, access):
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {access}')
+        return self.client.get('/api/v1/cases/')
+
+    def test_access_token_carries_claims_and_skips_user_lookup(self):
+        access, _ = self._tokens()
+        token = AccessToken(access)
+        self.assertEqual((token['role'], token['firm_id'], token['email_verified']), ('FIRM_OWNER', self.firm.id, False))
+        with CaptureQueriesContext(connection) as queries:
+            response = self._get_cases(access)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['data']), 1)
+        lookups = [q['sql'] for q in queries if 'FROM "auth_user"' in q['sql'] or 'FROM "authx_firm"' in q['sql']]
+        self.assertEqual(lookups, [])
+
+    def test_deactivation_revokes_and_refresh_rejects(self):
+        access, refresh = self._tokens()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.owner.is_active = False
+            self.owner.save(update_fields=['is_active'])
+        self.assertEqual(self._get_cases(access).status_code, 401)
+        self.client.credentials()
+        response = self.client.post('/api/authx/token/refresh/', {'refresh': refresh}, format='json')
+        self.assertEqual(response.status_code, 401)
+
+    def test_refresh_restamps_claims_after_revocation(self):
+        access, refresh = self._tokens()
+        other = create_user('new_owner')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.firm.owner = other
+            self.firm.save()
+        self.assertEqual(self._get_cases(access).status_code, 401)
+
+        self.client.credentials()
+        response = self.client.post('/api/authx/token/refresh/', {'refresh': refresh}, format='json')
+        self.assertEqual(response.status_code, 200)
+        renewed = response.data['data']['access']
+        self.assertIsNone(AccessToken(renewed)['firm_id'])
+        self.assertEqual(self._get_cases(renewed).status_code, 403)
+
+    def test_unrelated_user_saves_keep_tokens_valid(self):
+        access, _ = self._tokens()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.owner.first_name = 'Renamed'
+            self.owner.save()
+        self.assertEqual(self._get_cases(access).status_code, 200)
+
+    def test_tokens_without_claims_fall_back_to_database_user(self):
+        access = str(RefreshToken.for_user(self.owner).access_token)
+        self.assertEqual(self._get_cases(access).status_code, 200)
@@ -0,0 +1,96 @@
+import json
+from unittest import mock
+
+from django.conf import settings
+from django.core.cache import cache
+from django.test import AsyncRequestFactory, TestCase, override_settings
+from rest_framework.test import APIClient
+
+from apps.authx import async_views
+from apps.authx.throttling import FallbackCache, IdentityRateThrottle
+from apps.cases.tests.factories import create_user
+
+RATES = {'login_email': '2/min', 'login_ip': '4/min', 'send_otp_email': '1/min', 'send_otp_ip': '10/min'}
+
+
+@override_settings(AUTHX_THROTTLE_RATES=RATES)
+class IdentityThrottleTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        patcher = mock.patch.object(IdentityRateThrottle, 'cache', FallbackCache())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.client = APIClient()
+        create_user('throttled')
+
+    def _login(self, email, ip='10.0.0.1', **extra):
+        return self.client.post(
+            '/api/authx/login/', {'email': email, 'password': 'wrong'}, format='json', REMOTE_ADDR=ip, **extra
+        )
+
+    def test_email_budget_fails_before_any_work(self):
+        self.assertEqual(self._login('throttled@example.com').status_code, 400)
+        self.assertEqual(self._login(' THROTTLED@example.com').status_code, 400)
+        with mock.patch('apps.authx.hashing.check_password') as check, self.assertNumQueries(0):
+            response = self._login('Throttled@Example.com', ip='10.0.0.2')
+        check.assert_not_called()
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response.data['error']['code'], 'THROTTLED')
+        self.assertEqual(response.data['error']['message'], 'Too many requests')
+        self.assertGreater(int(response['Retry-After']), 0)
+
+    def test_ip_budget_spans_emails(self):
+        for n in range(4):
+            self.assertEqual(self._login(f'user{n}@example.com').status_code, 400)
+        self.assertEqual(self._login('user9@example.com').status_code, 429)
+        self.assertEqual(self._login('user9@example.com', ip='10.0.0.3').status_code, 400)
+
+    def test_rotating_forwarded_for_does_not_reset_ip_budget(self):
+        for n in range(4):
+            response = self._login(f'user{n}@example.com', HTTP_X_FORWARDED_FOR=f'203.0.113.{n}')
+            self.assertEqual(response.status_code, 400)
+        self.assertEqual(self._login('user9@example.com', HTTP_X_FORWARDED_FOR='203.0.113.9').status_code, 429)
+
+    def test_forwarded_for_is_trusted_up_to_num_proxies(self):
+        with override_settings(REST_FRAMEWORK={**settings.REST_FRAMEWORK, 'NUM_PROXIES': 1}):
+            for n in range(4):
+                response = self._login(f'user{n}@example.com', HTTP_X_FORWARDED_FOR=f'198.51.100.{n}, 203.0.113.1')
+                self.assertEqual(response.status_code, 400)
+            spoofed = self._login('user9@example.com', HTTP_X_FORWARDED_FOR='198.51.100.9, 203.0.113.1')
+            other_client = self._login('user9@example.com', HTTP_X_FORWARDED_FOR='203.0.113.2')
+        self.assertEqual((spoofed.status_code, other_client.status_code), (429, 400))
+
+    def test_window_slides(self):
+        with mock.patch.object(IdentityRateThrottle, 'timer', return_value=1000.0):
+            self._login('throttled@example.com')
+            self._login('throttled@example.com')
+            self.assertEqual(self._login('throttled@example.com').status_code, 429)
+        with mock.patch.object(IdentityRateThrottle, 'timer', return_value=1061.0):
+            self.assertEqual(self._login('throttled@example.com').status_code, 400)
+
+    def test_falls_back_to_process_memory_without_cache(self):
+        broken = mock.patch.multiple(
+            'django.core.cache.cache', get=mock.Mock(side_effect=ConnectionError), set=mock.Mock(side_effect=ConnectionError)
+        )
+        with broken, self.assertLogs('apps.authx.throttling', 'WARNING'):
+            self._login('throttled@example.com')
+            self._login('throttled@example.com')
+            self.assertEqual(self._login('throttled@example.com').status_code, 429)
+
+    def test_send_otp_budget(self):
+        self.assertEqual(self.client.post('/api/authx/send-otp/', {'email': 'a@example.com'}).status_code, 200)
+        self.assertEqual(self.client.post('/api/authx/send-otp/', {'email': 'A@example.com'}).status_code, 429)
+        self.assertEqual(self.client.post('/api/authx/send-otp/', {'email': 'b@example.com'}).status_code, 200)
+
+    async def test_async_view_answers_alike(self):
+        view = async_views.SendOTPView.as_view()
+        for _ in range(2):
+            sync = await self.async_client.post(
+                '/api/authx/send-otp/', {'email': 'c@example.com'}, content_type='application/json'
+            )
+        request = AsyncRequestFactory().post('/', {'email': 'C@example.com'}, content_type='application/json')
+        response = await view(request)
+        self.assertEqual((response.status_code, sync.status_code), (429, 429))
+        error, sync_error = json.loads(response.content)['error'], sync.json()['error']
+        self.assertEqual((error['code'], error['message']), (sync_error['code'], sync_error['message']))
+        self.assertIn('Retry-After', response)
@@ -0,0 +1,90 @@
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+
+from apps.authx.blacklist import BloomFilter, cache_is_shared, revocation_filter
+from apps.authx.tokens import RefreshToken
+from apps.cases.tests.factories import create_user
+
+
+class TokenBlacklistTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        revocation_filter.reset()
+        # The test cache is locmem; within one process it behaves like a shared one.
+        patcher = mock.patch('apps.authx.tokens.cache_is_shared', return_value=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.client = APIClient()
+        self.user = create_user('blacklist_user')
+
+    def _outstanding(self, jti, expires_in=timedelta(days=1), **kwargs):
+        return OutstandingToken.objects.create(
+            user=self.user, jti=jti, token='', expires_at=timezone.now() + expires_in, **kwargs
+        )
+
+    def test_bloom_filter_has_no_false_negatives(self):
+        bloom = BloomFilter(1000)
+        keys = [f'jti-{n}' for n in range(1000)]
+        for key in keys:
+            bloom.add(key)
+        self.assertTrue(all(key in bloom for key in keys))
+        false_positives = sum(f'other-{n}' in bloom for n in range(10000))
+        self.assertLess(false_positives, 50)
+
+    def test_unknown_token_skips_blacklist_query(self):
+        token = str(RefreshToken.for_user(self.user))
+        RefreshToken(token)  # loads the filter
+        with CaptureQueriesContext(connection) as queries:
+            RefreshToken(token)
+        self.assertEqual(len(queries), 0)
+
+    def test_process_local_cache_checks_table_every_time(self):
+        token = str(RefreshToken.for_user(self.user))
+        self.assertFalse(cache_is_shared())
+        with mock.patch('apps.authx.tokens.cache_is_shared', cache_is_shared):
+            RefreshToken(token)
+            with CaptureQueriesContext(connection) as queries:
+                RefreshToken(token)
+        self.assertEqual(len(queries), 1)
+
+    def test_rotated_refresh_token_is_rejected(self):
+        refresh = str(RefreshToken.for_user(self.user))
+        RefreshToken(refresh)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post('/api/authx/token/refresh/', {'refresh': refresh}, format='json')
+        self.assertEqual(response.status_code, 200)
+        response = self.client.post('/api/authx/token/refresh/', {'refresh': refresh}, format='json')
+        self.assertEqual(response.status_code, 401)
+
+    def test_rows_committed_out_of_id_order_are_picked_up(self):
+        revocation_filter.sync()
+        late, early = self._outstanding('late'), self._outstanding('early')
+        with self.captureOnCommitCallbacks(execute=True):
+            BlacklistedToken.objects.create(id=1002, token=early)
+        self.assertTrue(revocation_filter.might_contain('early'))
+        with self.captureOnCommitCallbacks(execute=True):
+            BlacklistedToken.objects.create(id=1001, token=late)
+        self.assertTrue(revocation_filter.might_contain('late'))
+
+    def test_purge_removes_expired_tokens_in_batches(self):
+        for n in range(5):
+            expired = self._outstanding(f'expired-{n}', expires_in=timedelta(days=-1))
+            if n % 2 == 0:
+                BlacklistedToken.objects.create(token=expired)
+        live = self._outstanding('live')
+        BlacklistedToken.objects.create(token=live)
+        out = StringIO()
+        call_command('purge_expired_tokens', batch_size=2, stdout=out)
+        self.assertIn('Reclaimed 5 outstanding and 3 blacklisted tokens in 3 batches.', out.getvalue())
+        self.assertEqual(list(OutstandingToken.objects.values_list('jti', flat=True)), ['live'])
+        self.assertEqual(BlacklistedToken.objects.count(), 1)
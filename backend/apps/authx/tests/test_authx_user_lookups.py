@@ -0,0 +1,35 @@
+from django.contrib.auth import get_user_model
+from django.db import IntegrityError, connection, transaction
+from django.test import TestCase
+
+from apps.authx.identity import users_by_email, users_by_username
+
+
+User = get_user_model()
+
+
+class UserLookupIndexTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='Lookup.User', email='Lookup.User@Example.com', password='x')
+
+    def _plan(self, queryset):
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute('SET LOCAL enable_seqscan = off')
+        return queryset.explain()
+
+    def test_lookups_are_case_insensitive(self):
+        self.assertEqual(users_by_email(' lookup.user@EXAMPLE.com').get(), self.user)
+        self.assertEqual(users_by_username('LOOKUP.user').get(), self.user)
+        self.assertFalse(users_by_email('').exists())
+
+    def test_lookups_use_expression_indexes(self):
+        self.assertIn('authx_user_email_key_uniq', self._plan(users_by_email('lookup.user@example.com')))
+        self.assertIn('authx_user_username_key_idx', self._plan(users_by_username('lookup.user')))
+
+    def test_email_unique_ignoring_case_but_blank_allowed(self):
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            User.objects.create_user(username='other', email='LOOKUP.user@example.com')
+        User.objects.create_user(username='blank_one', email='')
+        User.objects.create_user(username='blank_two', email='')
+        self.assertEqual(User.objects.filter(email='').count(), 2)
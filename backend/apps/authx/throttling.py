@@ -0,0 +1,103 @@
+import hashlib
+import logging
+import threading
+import time
+from collections.abc import Mapping
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.throttling import SimpleRateThrottle
+
+from .identity import normalize_email
+
+logger = logging.getLogger(__name__)
+
+# Entries the per-process fallback keeps before dropping expired ones.
+LOCAL_MAX_KEYS = 10_000
+
+
+class FallbackCache:
+    """Django's cache, or per-process memory while the cache raises."""
+
+    def __init__(self):
+        self._local = {}
+        self._lock = threading.Lock()
+        self._failing = False
+
+    def _fail(self, exc):
+        if not self._failing:
+            logger.warning("throttle cache unavailable, using per-process windows: %s", exc)
+        self._failing = True
+
+    def get(self, key, default=None):
+        try:
+            value = cache.get(key, default)
+        except Exception as exc:
+            self._fail(exc)
+            with self._lock:
+                expires_at, value = self._local.get(key, (0, default))
+            return value if expires_at > time.time() else default
+        self._failing = False
+        return value
+
+    def set(self, key, value, timeout):
+        try:
+            cache.set(key, value, timeout)
+            return
+        except Exception as exc:
+            self._fail(exc)
+        now = time.time()
+        with self._lock:
+            if len(self._local) >= LOCAL_MAX_KEYS:
+                self._local = {k: entry for k, entry in self._local.items() if entry[0] > now}
+            self._local[key] = (now + timeout, value)
+
+
+class IdentityRateThrottle(SimpleRateThrottle):
+    """Sliding window (SimpleRateThrottle's request history) per view scope and identity."""
+
+    cache = FallbackCache()
+    cache_format = 'authx:throttle:%(scope)s:%(ident)s'
+    identity = None
+
+    def __init__(self):
+        # The rate depends on the view; it is resolved in allow_request.
+        pass
+
+    def allow_request(self, request, view):
+        scope = getattr(view, 'throttle_scope', None)
+        if not scope:
+            return True
+        self.scope = f'{scope}_{self.identity}'
+        self.rate = getattr(settings, 'AUTHX_THROTTLE_RATES', {}).get(self.scope)
+        self.num_requests, self.duration = self.parse_rate(self.rate)
+        return super().allow_request(request, view)
+
+    def get_cache_key(self, request, view):
+        ident = self.get_identity(request)
+        if not ident:
+            return None
+        return self.cache_format % {'scope': self.scope, 'ident': ident}
+
+    def get_identity(self, request):
+        raise NotImplementedError
+
+
+class EmailRateThrottle(IdentityRateThrottle):
+    identity = 'email'
+
+    def get_identity(self, request):
+        data = request.data
+        email = data.get('email') if isinstance(data, Mapping) else None
+        email = normalize_email(email) if isinstance(email, str) else ''
+        return hashlib.sha256(email.encode()).hexdigest() if email else None
+
+
+class IPRateThrottle(IdentityRateThrottle):
+    identity = 'ip'
+
+    def get_identity(self, request):
+        return self.get_ident(request)
+
+
+IDENTITY_THROTTLES = [IPRateThrottle, EmailRateThrottle]
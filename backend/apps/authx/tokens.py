@@ -0,0 +1,105 @@
+import time
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.serializers import TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken as BaseRefreshToken
+
+from common.tenant import resolve_tenant
+
+from .blacklist import cache_is_shared, revocation_filter
+from .models import UserProfile
+from .revocation import ais_revoked, is_revoked
+
+User = get_user_model()
+
+STAMP_CLAIM = 'claims_at'
+
+
+def user_claims(user) -> dict:
+    tenant = resolve_tenant(user)
+    firm_id = tenant.client_profile[1] if tenant.is_client else tenant.firm_id
+    email_verified = (
+        UserProfile.objects.filter(user_id=user.pk).values_list('email_verified', flat=True).first() or False
+    )
+    return {
+        'role': tenant.role,
+        'firm_id': firm_id,
+        'email_verified': email_verified,
+        STAMP_CLAIM: time.time(),
+    }
+
+
+def stamp_claims(token, user):
+    for claim, value in user_claims(user).items():
+        token[claim] = value
+    return token
+
+
+class RefreshToken(BaseRefreshToken):
+    def check_blacklist(self):
+        if not cache_is_shared() or revocation_filter.might_contain(self.payload[api_settings.JTI_CLAIM]):
+            super().check_blacklist()
+
+
+class ClaimsUser(TokenUser):
+    """Authenticated user backed by token claims; never touches the database."""
+
+    @property
+    def role(self):
+        return self.token.get('role') or ''
+
+    @property
+    def firm_id(self):
+        return self.token.get('firm_id')
+
+    @property
+    def email_verified(self):
+        return bool(self.token.get('email_verified'))
+
+    def __str__(self):
+        return f'ClaimsUser {self.id}'
+
+
+class StatelessJWTAuthentication(JWTAuthentication):
+    def get_user(self, validated_token):
+        if STAMP_CLAIM not in validated_token:
+            return super().get_user(validated_token)
+        user = ClaimsUser(validated_token)
+        if is_revoked(user.id, validated_token.get(STAMP_CLAIM)):
+            raise AuthenticationFailed('Token has been revoked.', code='token_revoked')
+        return user
+
+    async def aauthenticate(self, request):
+        header = self.get_header(request)
+        if header is None:
+            return None
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+        validated_token = self.get_validated_token(raw_token)
+        if STAMP_CLAIM not in validated_token:
+            user = await sync_to_async(super().get_user)(validated_token)
+            return user, validated_token
+        user = ClaimsUser(validated_token)
+        if await ais_revoked(user.id, validated_token.get(STAMP_CLAIM)):
+            raise AuthenticationFailed('Token has been revoked.', code='token_revoked')
+        return user, validated_token
+
+
+class ClaimsTokenRefreshSerializer(TokenRefreshSerializer):
+    """Refresh that re-reads the user and stamps current claims on the new tokens."""
+
+    token_class = RefreshToken
+
+    def validate(self, attrs):
+        refresh = self.token_class(attrs['refresh'])
+        user = User.objects.filter(**{api_settings.USER_ID_FIELD: refresh[api_settings.USER_ID_CLAIM]}).first()
+        if user is None or not user.is_active:
+            raise AuthenticationFailed('No active account found for this token.', code='user_inactive')
+        stamp_claims(refresh, user)
+        return super().validate({**attrs, 'refresh': str(refresh)})
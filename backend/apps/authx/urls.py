@@ -1,3 +1,4 @@
+from django.conf import settings
 from django.urls import path
 
 from .views import (
@@ -6,17 +7,22 @@ from .views import (
     LogoutView,
     RegisterFirmView,
     MeView,
+    BootstrapView,
     VerifyOTPView,
     ResendVerificationView,
     SendOTPView,
 )
 
+if settings.AUTHX_ASYNC_VIEWS:
+    from .async_views import MeView, ResendVerificationView, SendOTPView, VerifyOTPView  # noqa: F811
+
 urlpatterns = [
     path('register-firm/', RegisterFirmView.as_view(), name='register-firm'),
     path('login/', LoginView.as_view(), name='login'),
     path('token/refresh/', JWTRefreshView.as_view(), name='token_refresh'),
     path('logout/', LogoutView.as_view(), name='logout'),
     path('me/', MeView.as_view(), name='me'),
+    path('bootstrap/', BootstrapView.as_view(), name='bootstrap'),
     path('send-otp/', SendOTPView.as_view(), name='send-otp'),
     path('verify-otp/', VerifyOTPView.as_view(), name='verify-otp'),
     path('resend-verification/', ResendVerificationView.as_view(), name='resend-verification'),
@@ -17,8 +17,11 @@ from .serializers import (
     SendOTPSerializer,
     VerifyOTPSerializer,
 )
+from .identity import users_by_email
 from .services import build_auth_body, build_tokens
-from .models import Firm, EmailOTP, UserProfile
+from . import bootstrap, otp_store
+from .throttling import IDENTITY_THROTTLES
+from .models import UserProfile
 from .services_otp import create_email_otp, send_email_otp, ensure_profile
 from datetime import timedelta
 from common.api_response import api_success, api_error
@@ -29,6 +32,8 @@ logger = logging.getLogger(__name__)
 class RegisterFirmView(APIView):
     permission_classes = [AllowAny]
     authentication_classes = []
+    throttle_classes = IDENTITY_THROTTLES
+    throttle_scope = 'register'
     serializer_class = RegisterFirmSerializer
 
     @transaction.atomic
@@ -50,6 +55,8 @@ class RegisterFirmView(APIView):
 class LoginView(APIView):
     permission_classes = [AllowAny]
     authentication_classes = []
+    throttle_classes = IDENTITY_THROTTLES
+    throttle_scope = 'login'
     serializer_class = LoginSerializer
 
     def post(self, request):
@@ -74,26 +81,18 @@ class VerifyOTPView(APIView):
         email = serializer.validated_data['email']
         code = serializer.validated_data['code']
 
-        from django.contrib.auth import get_user_model
-
-        User = get_user_model()
-        user = User.objects.filter(email__iexact=email).first()
+        user = users_by_email(email).first()
         if not user:
             return api_error('Invalid code', status=status.HTTP_400_BAD_REQUEST, code="INVALID_CODE")
 
-        otp = (
-            EmailOTP.objects.filter(user=user, purpose="email_verification", used_at__isnull=True)
-            .order_by("-created_at")
-            .first()
-        )
-        if not otp:
-            return api_error('Invalid or expired code', status=status.HTTP_400_BAD_REQUEST, code="INVALID_CODE")
-        if otp.is_expired:
-            return api_error('Invalid or expired code', status=status.HTTP_400_BAD_REQUEST, code="INVALID_CODE")
-        if otp.code != code:
+        result = otp_store.verify(user.pk, "email_verification", code)
+        if result is otp_store.Result.LOCKED:
+            return api_error(
+                'Too many attempts. Request a new code.', status=status.HTTP_400_BAD_REQUEST, code="OTP_LOCKED"
+            )
+        if result is not otp_store.Result.VERIFIED:
             return api_error('Invalid or expired code', status=status.HTTP_400_BAD_REQUEST, code="INVALID_CODE")
 
-        otp.mark_used()
         profile = ensure_profile(user)
         profile.email_verified = True
         profile.save(update_fields=['email_verified'])
@@ -104,16 +103,16 @@ class VerifyOTPView(APIView):
 class ResendVerificationView(APIView):
     permission_classes = [AllowAny]
     authentication_classes = []
+    throttle_classes = IDENTITY_THROTTLES
+    throttle_scope = 'resend_verification'
 
+    @transaction.atomic
     def post(self, request):
         serializer = SendOTPSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         email = serializer.validated_data['email']
 
-        from django.contrib.auth import get_user_model
-
-        User = get_user_model()
-        user = User.objects.filter(email__iexact=email).first()
+        user = users_by_email(email).first()
 
         if user:
             profile = ensure_profile(user)
@@ -130,16 +129,16 @@ class ResendVerificationView(APIView):
 class SendOTPView(APIView):
     permission_classes = [AllowAny]
     authentication_classes = []
+    throttle_classes = IDENTITY_THROTTLES
+    throttle_scope = 'send_otp'
 
+    @transaction.atomic
     def post(self, request):
         serializer = SendOTPSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         email = serializer.validated_data['email']
 
-        from django.contrib.auth import get_user_model
-
-        User = get_user_model()
-        user = User.objects.filter(email__iexact=email).first()
+        user = users_by_email(email).first()
 
         if user:
             profile = ensure_profile(user)
@@ -215,28 +214,22 @@ class MeView(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
-        firm = Firm.objects.filter(owner=request.user).first()
-        profile = ensure_profile(request.user)
-        role_value = getattr(request.user, "role", None) or "FIRM_OWNER"
-        return api_success(
-            {
-                'user': {
-                    'id': request.user.id,
-                    'email': request.user.email,
-                    'first_name': request.user.first_name,
-                    'last_name': request.user.last_name,
-                    'role': role_value,
-                },
-                'firm': {
-                    'id': firm.id,
-                    'name': firm.name,
-                    'slug': firm.slug,
-                }
-                if firm
-                else None,
-                'email_verified': profile.email_verified,
-            }
-        )
+        session = bootstrap.get(request.user.id)
+        if session is None:
+            return api_error('User not found', status=status.HTTP_404_NOT_FOUND, code="NOT_FOUND")
+        return api_success(bootstrap.me_body(session))
+
+
+class BootstrapView(APIView):
+    """Everything the frontend needs on page load: user, role, profile, firm and case summary."""
+
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        session = bootstrap.get(request.user.id)
+        if session is None:
+            return api_error('User not found', status=status.HTTP_404_NOT_FOUND, code="NOT_FOUND")
+        return api_success(session)
 
 
 def set_refresh_cookie(response: Response, refresh_token: str):
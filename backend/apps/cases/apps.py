@@ -4,3 +4,11 @@ from django.apps import AppConfig
 class CasesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.cases'
+
+    def ready(self):
+        from common.tenant import register_client_profile_lookup
+
+        from . import signals  # noqa: F401
+        from .utils import client_profile_of
+
+        register_client_profile_lookup(client_profile_of)
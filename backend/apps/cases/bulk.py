@@ -0,0 +1,174 @@
+from collections import Counter
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import F
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+from rest_framework import serializers
+
+from . import counts as case_counts
+from . import search, versioning
+from .models import Case, CaseStatus, ClientProfile
+from .numbering import reserve_block
+from .serializers import CaseBulkItemSerializer, CaseSerializer
+
+User = get_user_model()
+
+MAX_BULK_ITEMS = 500
+INSERT_BATCH_SIZE = 250
+UPDATE_CHUNK_SIZE = 500
+
+
+def _failure(index, errors):
+    return {"index": index, "success": False, "errors": errors}
+
+
+def _reference_errors(checker, firm, attrs, clients, leads):
+    errors = {}
+    client_id = attrs.pop("client", None)
+    lead_id = attrs.pop("assigned_lead", None)
+    attrs["client"] = clients.get(client_id) if client_id else None
+    attrs["assigned_lead"] = leads.get(lead_id) if lead_id else None
+    if client_id and attrs["client"] is None:
+        errors["client"] = ["Client not found"]
+    if lead_id and attrs["assigned_lead"] is None:
+        errors["assigned_lead"] = ["Assigned lead not found"]
+    for check, field in ((checker._check_client, "client"), (checker._check_assigned_lead, "assigned_lead")):
+        if attrs[field] is None:
+            continue
+        try:
+            check(firm, attrs[field])
+        except serializers.ValidationError as exc:
+            errors.update(exc.detail)
+    return errors
+
+
+def create_cases(items, request):
+    """Create cases from `items`. Returns (results, created), one result per item in order."""
+    context = {"request": request}
+    checker = CaseSerializer(context=context)
+    firm = checker._get_target_firm()
+
+    results = [None] * len(items)
+    valid = []
+    for index, item in enumerate(items):
+        serializer = CaseBulkItemSerializer(data=item, context=context)
+        if serializer.is_valid():
+            valid.append((index, dict(serializer.validated_data)))
+        else:
+            results[index] = _failure(index, serializer.errors)
+
+    client_ids = {attrs["client"] for _, attrs in valid if attrs.get("client")}
+    lead_ids = {attrs["assigned_lead"] for _, attrs in valid if attrs.get("assigned_lead")}
+    clients = ClientProfile.objects.in_bulk(client_ids) if client_ids else {}
+    leads = User.objects.in_bulk(lead_ids) if lead_ids else {}
+    explicit = {attrs["case_number"] for _, attrs in valid if attrs.get("case_number")}
+    existing = (
+        set(Case.objects.filter(firm=firm, case_number__in=explicit).order_by().values_list("case_number", flat=True))
+        if explicit
+        else set()
+    )
+
+    claimed = set()
+    ready = []
+    for index, attrs in valid:
+        errors = _reference_errors(checker, firm, attrs, clients, leads)
+        number = attrs.get("case_number")
+        if number:
+            if number in existing or number in claimed:
+                errors["case_number"] = ["Already exists"]
+            claimed.add(number)
+        if errors:
+            results[index] = _failure(index, errors)
+            continue
+        ready.append((index, Case(firm=firm, created_by_id=request.user.pk, **attrs)))
+
+    if ready:
+        cases = [case for _, case in ready]
+        with transaction.atomic():
+            numbers = iter(reserve_block(firm, sum(1 for case in cases if not case.case_number), exclude=claimed))
+            for case in cases:
+                if not case.case_number:
+                    case.case_number = next(numbers)
+            Case.objects.bulk_create(cases, batch_size=INSERT_BATCH_SIZE)
+            case_counts.record_created(*cases)
+            versioning.bump(firm.id)
+            search.index_cases(cases)
+        for index, case in ready:
+            results[index] = {"index": index, "success": True, "id": str(case.id), "case_number": case.case_number}
+    return results, len(ready)
+
+
+def _chunks(queryset, size):
+    ids = list(queryset.order_by().values_list("id", flat=True))
+    for start in range(0, len(ids), size):
+        yield ids[start : start + size]
+
+
+def _locked_rows(ids):
+    # Re-read inside the chunk transaction: rows changed or deleted since the
+    # ids were collected are skipped, and the counts see the values replaced.
+    return list(
+        Case.objects.select_for_update()
+        .filter(id__in=ids, is_deleted=False)
+        .order_by()
+        .values_list("id", "firm_id", "status", "priority")
+    )
+
+
+def update_cases(queryset, changes, chunk_size=UPDATE_CHUNK_SIZE):
+    """
+    Set `changes` (status, priority and/or assigned_lead) on every live case of
+    `queryset`. Returns the number of cases updated.
+    """
+    changes = dict(changes)
+    now = timezone.now()
+    values = dict(changes, updated_at=now)
+    if changes.get("status") == CaseStatus.CLOSED:
+        values["close_date"] = Coalesce(F("close_date"), timezone.localdate())
+    affected = 0
+    for ids in _chunks(queryset, chunk_size):
+        with transaction.atomic():
+            rows = _locked_rows(ids)
+            if not rows:
+                continue
+            Case.objects.filter(id__in=[row[0] for row in rows]).update(**values)
+            per_firm = {}
+            for _, firm_id, old_status, old_priority in rows:
+                deltas = per_firm.setdefault(firm_id, Counter())
+                for facet, old in (("status", old_status), ("priority", old_priority)):
+                    new = changes.get(facet, old)
+                    if new != old:
+                        deltas[(facet, old)] -= 1
+                        deltas[(facet, new)] += 1
+            for firm_id, deltas in per_firm.items():
+                case_counts.apply_deltas(firm_id, deltas)
+            versioning.bump(*per_firm)
+            affected += len(rows)
+    return affected
+
+
+def soft_delete_cases(queryset, chunk_size=UPDATE_CHUNK_SIZE):
+    """Soft delete every live case of `queryset`. Returns the number deleted."""
+    now = timezone.now()
+    affected = 0
+    for ids in _chunks(queryset, chunk_size):
+        with transaction.atomic():
+            rows = _locked_rows(ids)
+            if not rows:
+                continue
+            case_ids = [row[0] for row in rows]
+            Case.objects.filter(id__in=case_ids).update(is_deleted=True, deleted_at=now, updated_at=now)
+            per_firm = {}
+            for _, firm_id, status, priority in rows:
+                deltas = per_firm.setdefault(firm_id, Counter())
+                deltas[case_counts.TOTAL] -= 1
+                deltas[("status", status)] -= 1
+                deltas[("priority", priority)] -= 1
+            for firm_id, deltas in per_firm.items():
+                case_counts.apply_deltas(firm_id, deltas)
+            versioning.bump(*per_firm)
+            search.remove_cases(case_ids)
+            affected += len(rows)
+    return affected
@@ -0,0 +1,152 @@
+import json
+from collections import Counter
+
+from django.conf import settings
+from django.db import IntegrityError, connections, transaction
+from django.db.models import Count, F
+
+from apps.authx.models import Firm
+
+from .models import Case, FirmCaseCount
+
+TOTAL = ("all", "")
+FACETS = ("status", "priority")
+
+
+def _rows_exist(firm_id):
+    return FirmCaseCount.objects.filter(firm_id=firm_id, facet=TOTAL[0], value=TOTAL[1]).exists()
+
+
+def _lock_firm(firm_id):
+    # NO KEY UPDATE leaves the firm free for the key-share locks of case inserts.
+    list(Firm.objects.select_for_update(no_key=True).filter(pk=firm_id).values_list("pk", flat=True))
+
+
+def _add_total(firm_id, n):
+    return FirmCaseCount.objects.filter(firm_id=firm_id, facet=TOTAL[0], value=TOTAL[1]).update(count=F("count") + n)
+
+
+def recompute(firm_id):
+    """Rebuild the count rows of one firm from the cases table."""
+    with transaction.atomic():
+        _lock_firm(firm_id)
+        # Writers already holding a count row commit before the cases are counted.
+        list(FirmCaseCount.objects.select_for_update().filter(firm_id=firm_id).values_list("pk", flat=True))
+        live = Case.objects.filter(firm_id=firm_id, is_deleted=False).order_by()
+        counts = Counter()
+        for row in live.values("status", "priority").annotate(n=Count("id")):
+            counts[TOTAL] += row["n"]
+            counts[("status", row["status"])] += row["n"]
+            counts[("priority", row["priority"])] += row["n"]
+        counts.setdefault(TOTAL, 0)
+        FirmCaseCount.objects.filter(firm_id=firm_id).delete()
+        FirmCaseCount.objects.bulk_create(
+            [FirmCaseCount(firm_id=firm_id, facet=facet, value=value, count=n) for (facet, value), n in counts.items()],
+            ignore_conflicts=True,
+        )
+    return counts
+
+
+def apply_deltas(firm_id, deltas):
+    """
+    Add `deltas` ({(facet, value): n}) to a firm's rows. Firms whose rows were
+    never built are skipped; the lazy rebuild will include these cases.
+    """
+    deltas = {key: n for key, n in deltas.items() if n}
+    if not deltas:
+        return
+    with transaction.atomic():
+        total = deltas.pop(TOTAL, 0)
+        if not _add_total(firm_id, total):
+            # No rows, or a rebuild just replaced them: once any rebuild has
+            # committed, its rows exist (and did not count this change) or
+            # the next one will see this change.
+            _lock_firm(firm_id)
+            if not _add_total(firm_id, total):
+                return
+        for (facet, value), n in deltas.items():
+            if FirmCaseCount.objects.filter(firm_id=firm_id, facet=facet, value=value).update(count=F("count") + n):
+                continue
+            try:
+                with transaction.atomic():
+                    FirmCaseCount.objects.create(firm_id=firm_id, facet=facet, value=value, count=n)
+            except IntegrityError:
+                # A concurrent writer created the row first.
+                FirmCaseCount.objects.filter(firm_id=firm_id, facet=facet, value=value).update(count=F("count") + n)
+
+
+def case_deltas(cases, sign):
+    """Per-firm deltas for adding (sign=1) or removing (sign=-1) live cases."""
+    per_firm = {}
+    for case in cases:
+        deltas = per_firm.setdefault(case.firm_id, Counter())
+        deltas[TOTAL] += sign
+        deltas[("status", case.status)] += sign
+        deltas[("priority", case.priority)] += sign
+    return per_firm
+
+
+def record_created(*cases):
+    for firm_id, deltas in case_deltas(cases, 1).items():
+        apply_deltas(firm_id, deltas)
+
+
+def record_deleted(*cases):
+    for firm_id, deltas in case_deltas(cases, -1).items():
+        apply_deltas(firm_id, deltas)
+
+
+def record_changed(case, old_status, old_priority):
+    deltas = Counter()
+    if old_status != case.status:
+        deltas[("status", old_status)] -= 1
+        deltas[("status", case.status)] += 1
+    if old_priority != case.priority:
+        deltas[("priority", old_priority)] -= 1
+        deltas[("priority", case.priority)] += 1
+    apply_deltas(case.firm_id, deltas)
+
+
+def stored_count(firm_id, facet=None, value=None):
+    key = (facet, value) if facet else TOTAL
+    row = FirmCaseCount.objects.filter(firm_id=firm_id, facet=key[0], value=key[1]).values_list("count", flat=True)
+    found = list(row[:1])
+    if found:
+        return found[0]
+    if facet and _rows_exist(firm_id):
+        return 0
+    return recompute(firm_id).get(key, 0)
+
+
+def estimate_limit():
+    return getattr(settings, "CASE_COUNT_ESTIMATE_LIMIT", 1000)
+
+
+def _planner_estimate(queryset):
+    conn = connections[queryset.db]
+    if conn.vendor != "postgresql":
+        return None
+    plan = json.loads(queryset.order_by().explain(format="json"))
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def bounded_count(queryset):
+    """Exact count up to the estimate limit, an estimate beyond it. Returns (count, exact)."""
+    limit = estimate_limit()
+    seen = queryset.order_by()[: limit + 1].count()
+    if seen <= limit:
+        return seen, True
+    estimate = _planner_estimate(queryset) or 0
+    return max(estimate, seen), False
+
+
+def resolve(queryset, firm_id, active_filters):
+    """(count, exact) for a case list. `firm_id` is set when the list is the firm's live cases before filtering."""
+    if firm_id is not None:
+        if not active_filters:
+            return stored_count(firm_id), True
+        if len(active_filters) == 1:
+            (name, value), = active_filters.items()
+            if name in FACETS:
+                return stored_count(firm_id, name, value.upper()), True
+    return bounded_count(queryset)
@@ -0,0 +1,86 @@
+import csv
+import json
+
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+
+from .readers import case_rows
+
+CHUNK_SIZE = 2000
+LINES_PER_WRITE = 200
+
+FORMATS = {
+    "csv": ("text/csv; charset=utf-8", "csv"),
+    "ndjson": ("application/x-ndjson", "ndjson"),
+}
+
+CSV_COLUMNS = (
+    "id",
+    "title",
+    "case_type",
+    "case_number",
+    "status",
+    "priority",
+    "description",
+    "court_name",
+    "judge_name",
+    "open_date",
+    "close_date",
+    "close_reason",
+    "client_id",
+    "client_name",
+    "assigned_lead_id",
+    "assigned_lead_email",
+    "created_at",
+    "updated_at",
+)
+
+
+class _Echo:
+    """File-like object whose write() returns the line instead of storing it."""
+
+    def write(self, value):
+        return value
+
+
+def _csv_record(data):
+    client = data["client_detail"] or {}
+    lead = data["assigned_lead_detail"] or {}
+    record = dict(data, client_id=client.get("id"), client_name=client.get("name"))
+    record.update(assigned_lead_id=lead.get("id"), assigned_lead_email=lead.get("email"))
+    return ["" if record[column] is None else record[column] for column in CSV_COLUMNS]
+
+
+def csv_lines(rows):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(CSV_COLUMNS)
+    for row in rows:
+        yield writer.writerow(_csv_record(case_rows.to_representation(row)))
+
+
+def ndjson_lines(rows):
+    for row in rows:
+        yield json.dumps(case_rows.to_representation(row), ensure_ascii=False) + "\n"
+
+
+def _buffered(lines):
+    buffer = []
+    for line in lines:
+        buffer.append(line)
+        if len(buffer) >= LINES_PER_WRITE:
+            yield "".join(buffer).encode("utf-8")
+            buffer = []
+    if buffer:
+        yield "".join(buffer).encode("utf-8")
+
+
+def stream_export(queryset, export_format):
+    """StreamingHttpResponse with every case of `queryset` in `export_format` (csv or ndjson)."""
+    content_type, extension = FORMATS[export_format]
+    rows = case_rows.project(queryset).iterator(chunk_size=CHUNK_SIZE)
+    lines = csv_lines(rows) if export_format == "csv" else ndjson_lines(rows)
+    response = StreamingHttpResponse(_buffered(lines), content_type=content_type)
+    filename = f"cases-{timezone.localdate().isoformat()}.{extension}"
+    response["Content-Disposition"] = f'attachment; filename="{filename}"'
+    response["Cache-Control"] = "no-store"
+    return response
@@ -1,16 +1,23 @@
-from django.db.models import Q
+from django.db.models.functions import Upper
 from rest_framework.filters import OrderingFilter
 from django_filters import rest_framework as filters
 
+from common.tenant import get_tenant_context
+
 from .models import Case
+from .pagination import CaseCursorPagination
+from .search import search_cases
 
 
 class CaseFilter(filters.FilterSet):
     search = filters.CharFilter(method="filter_search")
-    status = filters.CharFilter(field_name="status", lookup_expr="iexact")
-    priority = filters.CharFilter(field_name="priority", lookup_expr="iexact")
-    case_type = filters.CharFilter(field_name="case_type", lookup_expr="iexact")
-    assigned_lead = filters.UUIDFilter(field_name="assigned_lead")
+    # status/priority hold upper-case choice values, so an exact match on the
+    # upper-cased input is equivalent to iexact and can use the firm indexes.
+    status = filters.CharFilter(method="filter_choice")
+    priority = filters.CharFilter(method="filter_choice")
+    case_type = filters.CharFilter(method="filter_case_type")
+    # The user primary key is an integer.
+    assigned_lead = filters.NumberFilter(field_name="assigned_lead")
     client = filters.UUIDFilter(field_name="client")
     date_from = filters.DateFilter(field_name="open_date", lookup_expr="gte")
     date_to = filters.DateFilter(field_name="open_date", lookup_expr="lte")
@@ -19,10 +26,20 @@ class CaseFilter(filters.FilterSet):
         model = Case
         fields = []
 
+    def filter_choice(self, queryset, name, value):
+        return queryset.filter(**{name: value.upper()})
+
+    def filter_case_type(self, queryset, name, value):
+        # Matches the UPPER("case_type") expression of the case_firm_type_live index.
+        return queryset.alias(case_type_upper=Upper("case_type")).filter(case_type_upper=value.upper())
+
     def filter_search(self, queryset, name, value):
         if not value:
             return queryset
-        return queryset.filter(Q(title__icontains=value) | Q(case_number__icontains=value))
+        # Owners search only their firm's index rows.
+        tenant = get_tenant_context(self.request) if self.request is not None else None
+        firm_id = tenant.firm_id if tenant is not None and tenant.is_firm_owner else None
+        return search_cases(queryset, value, firm_id=firm_id)
 
 
 class CaseOrderingFilter(OrderingFilter):
@@ -30,6 +47,18 @@ class CaseOrderingFilter(OrderingFilter):
     allowed_fields = {"created_at", "open_date", "title"}
     ordering_fields = ("created_at", "open_date", "title")
 
+    def filter_queryset(self, request, queryset, view):
+        # Without an explicit sort, search results keep their relevance order.
+        # Cursor pages need a sort column they can seek on, so they fall back
+        # to the default ordering instead.
+        if (
+            "search_rank" in queryset.query.extra_select
+            and not request.query_params.get(self.ordering_param)
+            and not CaseCursorPagination.is_requested(request)
+        ):
+            return queryset.order_by("search_rank", "-created_at")
+        return super().filter_queryset(request, queryset, view)
+
     def remove_invalid_fields(self, queryset, ordering, view, request):
         valid = []
         for term in ordering:
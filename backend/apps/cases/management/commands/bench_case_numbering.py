@@ -0,0 +1,116 @@
+import threading
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import OperationalError, connection, connections, transaction
+
+from apps.authx.models import Firm
+from apps.cases import numbering
+from apps.cases.models import Case, FirmCaseCounter
+from core.benchmarking import benchmark_database, summarize
+
+
+def row_lock_number(firm):
+    """The previous allocator: lock the counter row, then probe one number at a time."""
+    prefix = numbering.case_number_prefix()
+    counter, _ = FirmCaseCounter.objects.select_for_update().get_or_create(firm=firm)
+    while True:
+        candidate = numbering.format_case_number(prefix, counter.next_number)
+        counter.next_number += 1
+        if not Case.objects.filter(firm=firm, case_number=candidate).exists():
+            counter.save(update_fields=["next_number", "updated_at"])
+            return candidate
+
+
+STRATEGIES = {
+    "row lock + probes": row_lock_number,
+    "leased": numbering.allocate_case_number,
+}
+
+
+class Command(BaseCommand):
+    help = "Case creation throughput with parallel creators in one firm, per numbering strategy (runs on a throwaway test database)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, nargs="+", default=[1, 8, 32])
+        parser.add_argument("--per-worker", type=int, default=50)
+        parser.add_argument(
+            "--manual", type=int, default=200, help="Hand-entered numbers placed ahead of the counter"
+        )
+
+    def handle(self, *args, **options):
+        with benchmark_database():
+            if connection.vendor == "sqlite":
+                self.stdout.write(
+                    self.style.WARNING("SQLite serializes all writers; run against PostgreSQL for representative numbers.")
+                )
+            User = get_user_model()
+            self.stdout.write(f"{'strategy':<18} {'workers':>7} {'cases/s':>9} {'p50 ms':>8} {'p99 ms':>8} {'retries':>8}")
+            run = 0
+            for workers in options["workers"]:
+                for name, allocate in STRATEGIES.items():
+                    run += 1
+                    # Firm.owner is one-to-one, so every run gets its own firm and owner.
+                    owner = User.objects.create_user(username=f"bench_numbering_{run}", email=f"bench_numbering_{run}@example.com")
+                    firm = Firm.objects.create(name=f"Numbering {run}", slug=f"bench-numbering-{run}", owner=owner)
+                    self._seed_manual_numbers(firm, owner, options["manual"])
+                    numbering.reset_leases()
+                    self._run(name, allocate, firm, owner, workers, options["per_worker"])
+
+    def _seed_manual_numbers(self, firm, owner, count):
+        # Manual entries every other slot ahead of the counter.
+        prefix = numbering.case_number_prefix()
+        Case.objects.bulk_create(
+            Case(firm=firm, created_by=owner, title="Manual", case_number=numbering.format_case_number(prefix, 2 * i + 1))
+            for i in range(count)
+        )
+
+    def _run(self, name, allocate, firm, owner, workers, per_worker):
+        samples = []
+        retries = [0]
+        lock = threading.Lock()
+        start_gate = threading.Barrier(workers + 1)
+
+        def create_one(i):
+            while True:
+                try:
+                    with transaction.atomic():
+                        Case.objects.create(firm=firm, created_by=owner, title=f"Bench {i}", case_number=allocate(firm))
+                    return
+                except OperationalError:
+                    # SQLite "database is locked"; PostgreSQL waits on the row lock instead.
+                    with lock:
+                        retries[0] += 1
+                    time.sleep(0.001)
+
+        def worker(offset):
+            local = []
+            try:
+                start_gate.wait()
+                for i in range(per_worker):
+                    began = time.perf_counter()
+                    create_one(offset + i)
+                    local.append(time.perf_counter() - began)
+            finally:
+                connections.close_all()
+            with lock:
+                samples.extend(local)
+
+        threads = [threading.Thread(target=worker, args=(n * per_worker,)) for n in range(workers)]
+        for thread in threads:
+            thread.start()
+        start_gate.wait()
+        began = time.perf_counter()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - began
+
+        created = Case.objects.filter(firm=firm, title__startswith="Bench").values_list("case_number", flat=True)
+        if len(set(created)) != workers * per_worker:
+            self.stderr.write(self.style.ERROR(f"{name}: expected {workers * per_worker} unique numbers, got {len(set(created))}"))
+        stats = summarize(samples)
+        self.stdout.write(
+            f"{name:<18} {workers:>7} {len(samples) / elapsed:>9.0f} "
+            f"{stats['p50'] * 1e3:>8.2f} {stats['p99'] * 1e3:>8.2f} {retries[0]:>8}"
+        )
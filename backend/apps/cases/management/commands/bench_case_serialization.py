@@ -0,0 +1,65 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+
+from apps.authx.models import Firm
+from apps.cases.models import Case, ClientProfile
+from apps.cases.readers import case_rows
+from apps.cases.serializers import CaseSerializer
+from core.benchmarking import benchmark_database, percentile, timed
+
+
+class Command(BaseCommand):
+    help = "Compare per-row cost of CaseSerializer and the values() read path (runs on a throwaway test database)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--page-sizes", type=int, nargs="+", default=[20, 100])
+        parser.add_argument("--repeat", type=int, default=200)
+
+    def handle(self, *args, **options):
+        page_sizes = options["page_sizes"]
+        repeat = options["repeat"]
+        with benchmark_database():
+            self._seed(max(page_sizes))
+            base = Case.objects.filter(is_deleted=False).order_by("-created_at")
+            self.stdout.write(f"{'page':>5} {'path':<22} {'serialize us/row':>17} {'fetch+serialize us/row':>23}")
+            for size in page_sizes:
+                instances = list(base.select_related("client", "assigned_lead", "firm")[:size])
+                rows = list(case_rows.project(base)[:size])
+                paths = {
+                    "CaseSerializer": (
+                        lambda: CaseSerializer(instances, many=True).data,
+                        lambda: CaseSerializer(
+                            list(base.select_related("client", "assigned_lead", "firm")[:size]), many=True
+                        ).data,
+                    ),
+                    "case_rows (values)": (
+                        lambda: case_rows.to_representation_many(rows),
+                        lambda: case_rows.to_representation_many(case_rows.project(base)[:size]),
+                    ),
+                }
+                for name, (serialize_only, end_to_end) in paths.items():
+                    serialize = percentile(timed(serialize_only, repeat), 50) / size * 1e6
+                    total = percentile(timed(end_to_end, repeat), 50) / size * 1e6
+                    self.stdout.write(f"{size:>5} {name:<22} {serialize:>17.1f} {total:>23.1f}")
+
+    def _seed(self, count):
+        User = get_user_model()
+        owner = User.objects.create_user(username="bench_owner", email="bench_owner@example.com")
+        firm = Firm.objects.create(name="Bench Firm", slug="bench-firm", owner=owner)
+        client_user = User.objects.create_user(username="bench_client", email="bench_client@example.com")
+        profile = ClientProfile.objects.create(firm=firm, user=client_user, name="Bench Client")
+        Case.objects.bulk_create(
+            Case(
+                firm=firm,
+                created_by=owner,
+                client=profile,
+                assigned_lead=owner,
+                title=f"Benchmark matter {i}",
+                case_type="Civil",
+                case_number=f"CIV-BENCH-{i:05d}",
+                description="Lorem ipsum " * 10,
+                court_name="Central Court",
+                judge_name="Judge Bench",
+            )
+            for i in range(count)
+        )
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from apps.authx.models import Firm
+from apps.cases import counts
+
+
+class Command(BaseCommand):
+    help = "Recompute the stored per-firm case counts from the cases table"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--firm", type=int, action="append", dest="firms", help="Firm id (repeatable)")
+
+    def handle(self, *args, **options):
+        firm_ids = options["firms"] or Firm.objects.order_by("id").values_list("id", flat=True)
+        rebuilt = 0
+        for firm_id in firm_ids:
+            counts.recompute(firm_id)
+            rebuilt += 1
+        self.stdout.write(self.style.SUCCESS(f"Recomputed case counts for {rebuilt} firms."))
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from apps.cases import search
+from apps.cases.models import Case
+
+
+class Command(BaseCommand):
+    help = "Rebuild the case full-text search index from live cases"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=2000)
+
+    def handle(self, *args, **options):
+        if search.get_backend() is None:
+            self.stdout.write(self.style.WARNING("No search index for this database; search uses icontains."))
+            return
+        with transaction.atomic():
+            total = search.rebuild_index(Case, batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"Indexed {total} cases."))
@@ -0,0 +1,50 @@
+# Generated by Django 4.2.30 on 2026-10-18 19:28
+
+from django.db import migrations, models
+import django.db.models.functions.text
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cases', '0002_firmcasecounter'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='case',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['firm', 'created_at', 'id'], name='case_firm_created_live'),
+        ),
+        migrations.AddIndex(
+            model_name='case',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['firm', 'open_date', 'id'], name='case_firm_open_date_live'),
+        ),
+        migrations.AddIndex(
+            model_name='case',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['firm', 'title', 'id'], name='case_firm_title_live'),
+        ),
+        migrations.AddIndex(
+            model_name='case',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['firm', 'status', 'created_at'], name='case_firm_status_live'),
+        ),
+        migrations.AddIndex(
+            model_name='case',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['firm', 'priority', 'created_at'], name='case_firm_priority_live'),
+        ),
+        migrations.AddIndex(
+            model_name='case',
+            index=models.Index(models.F('firm'), django.db.models.functions.text.Upper('case_type'), models.F('created_at'), condition=models.Q(('is_deleted', False)), name='case_firm_type_live'),
+        ),
+        migrations.AddIndex(
+            model_name='case',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['firm', 'assigned_lead', 'created_at'], name='case_firm_lead_live'),
+        ),
+        migrations.AddIndex(
+            model_name='case',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['client', 'created_at'], name='case_client_created_live'),
+        ),
+        migrations.AddIndex(
+            model_name='case',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['created_at', 'id'], name='case_created_live'),
+        ),
+    ]
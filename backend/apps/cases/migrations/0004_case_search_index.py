@@ -0,0 +1,27 @@
+from django.db import migrations
+
+
+def create_search_index(apps, schema_editor):
+    from apps.cases import search
+
+    search.rebuild_index(apps.get_model("cases", "Case"), conn=schema_editor.connection)
+
+
+def drop_search_index(apps, schema_editor):
+    from apps.cases import search
+
+    backend = search.get_backend(schema_editor.connection)
+    if backend is not None:
+        with schema_editor.connection.cursor() as cursor:
+            backend.drop(cursor)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cases', '0003_case_list_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
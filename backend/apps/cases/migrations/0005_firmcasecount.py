@@ -0,0 +1,32 @@
+# Generated by Django 4.2.30 on 2026-10-18 19:33
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authx', '0004_emailotp'),
+        ('cases', '0004_case_search_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FirmCaseCount',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('facet', models.CharField(max_length=16)),
+                ('value', models.CharField(blank=True, default='', max_length=16)),
+                ('count', models.IntegerField(default=0)),
+                ('firm', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='case_counts', to='authx.firm')),
+            ],
+            options={
+                'ordering': ['firm_id', 'facet', 'value'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='firmcasecount',
+            constraint=models.UniqueConstraint(fields=('firm', 'facet', 'value'), name='uniq_firm_case_count_facet_value'),
+        ),
+    ]
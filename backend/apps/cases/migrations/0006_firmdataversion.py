@@ -0,0 +1,24 @@
+# Generated by Django 4.2.30 on 2026-10-18 19:36
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authx', '0004_emailotp'),
+        ('cases', '0005_firmcasecount'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FirmDataVersion',
+            fields=[
+                ('firm', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='data_version', serialize=False, to='authx.firm')),
+                ('version', models.PositiveBigIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+        ),
+    ]
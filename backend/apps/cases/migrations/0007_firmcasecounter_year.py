@@ -0,0 +1,19 @@
+# Generated by Django 4.2.30 on 2026-10-18 19:40
+
+import apps.cases.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cases', '0006_firmdataversion'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='firmcasecounter',
+            name='year',
+            field=models.PositiveSmallIntegerField(default=apps.cases.models.current_year),
+        ),
+    ]
@@ -1,7 +1,8 @@
 import uuid
 from django.conf import settings
 from django.db import models
-from django.db.models import Q
+from django.db.models import F, Q
+from django.db.models.functions import Upper
 from django.utils import timezone
 
 from apps.authx.models import Firm
@@ -75,13 +76,35 @@ class Case(models.Model):
                 name="uniq_case_number_per_firm_nonblank",
             )
         ]
+        # Partial indexes over live rows, one per list access path: the three
+        # sort keys (with id as the keyset tie-breaker) and each filter facet
+        # followed by the default sort. See tests/test_cases_query_plans.py.
+        indexes = [
+            models.Index(fields=["firm", "created_at", "id"], condition=Q(is_deleted=False), name="case_firm_created_live"),
+            models.Index(fields=["firm", "open_date", "id"], condition=Q(is_deleted=False), name="case_firm_open_date_live"),
+            models.Index(fields=["firm", "title", "id"], condition=Q(is_deleted=False), name="case_firm_title_live"),
+            models.Index(fields=["firm", "status", "created_at"], condition=Q(is_deleted=False), name="case_firm_status_live"),
+            models.Index(fields=["firm", "priority", "created_at"], condition=Q(is_deleted=False), name="case_firm_priority_live"),
+            models.Index(
+                F("firm"), Upper("case_type"), F("created_at"), condition=Q(is_deleted=False), name="case_firm_type_live"
+            ),
+            models.Index(fields=["firm", "assigned_lead", "created_at"], condition=Q(is_deleted=False), name="case_firm_lead_live"),
+            models.Index(fields=["client", "created_at"], condition=Q(is_deleted=False), name="case_client_created_live"),
+            models.Index(fields=["created_at", "id"], condition=Q(is_deleted=False), name="case_created_live"),
+        ]
 
     def __str__(self):
         return self.title
 
 
+def current_year():
+    return timezone.localdate().year
+
+
 class FirmCaseCounter(models.Model):
     firm = models.OneToOneField(Firm, on_delete=models.CASCADE, related_name="case_counter")
+    # next_number counts within `year`; see apps.cases.numbering.
+    year = models.PositiveSmallIntegerField(default=current_year)
     next_number = models.PositiveIntegerField(default=1)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -91,3 +114,38 @@ class FirmCaseCounter(models.Model):
 
     def __str__(self):
         return f"{self.firm_id}: {self.next_number}"
+
+
+class FirmCaseCount(models.Model):
+    """
+    Live case totals per firm, overall (facet "all") and per status/priority
+    value. Maintained by apps.cases.counts alongside case writes.
+    """
+
+    firm = models.ForeignKey(Firm, on_delete=models.CASCADE, related_name="case_counts")
+    facet = models.CharField(max_length=16)
+    value = models.CharField(max_length=16, blank=True, default="")
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        ordering = ["firm_id", "facet", "value"]
+        constraints = [
+            models.UniqueConstraint(fields=["firm", "facet", "value"], name="uniq_firm_case_count_facet_value"),
+        ]
+
+    def __str__(self):
+        return f"{self.firm_id} {self.facet}={self.value}: {self.count}"
+
+
+class FirmDataVersion(models.Model):
+    """
+    Monotonic version of a firm's case data, bumped on every case or client
+    profile write. Case list/retrieve derive their ETag from it.
+    """
+
+    firm = models.OneToOneField(Firm, on_delete=models.CASCADE, primary_key=True, related_name="data_version")
+    version = models.PositiveBigIntegerField(default=0)
+    updated_at = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        return f"{self.firm_id}: v{self.version}"
@@ -0,0 +1,124 @@
+import threading
+from collections import deque
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from .models import Case, FirmCaseCounter
+
+MAX_NUMBER_ATTEMPTS = 5
+
+_leases = {}
+_leases_lock = threading.Lock()
+
+
+def case_number_prefix(year=None):
+    return f"CIV-{year or timezone.localdate().year}-"
+
+
+def format_case_number(prefix, number):
+    return f"{prefix}{number:03d}"
+
+
+def lease_size():
+    return max(1, getattr(settings, "CASE_NUMBER_LEASE_SIZE", 20))
+
+
+def _free_numbers(firm, prefix, start, stop, exclude=()):
+    window = range(start, stop)
+    candidates = [format_case_number(prefix, n) for n in window]
+    taken = set(
+        Case.objects.filter(firm=firm, case_number__in=candidates).order_by().values_list("case_number", flat=True)
+    )
+    taken.update(exclude)
+    return [n for n, candidate in zip(window, candidates) if candidate not in taken]
+
+
+def _locked_counter(firm, year):
+    counter, _ = FirmCaseCounter.objects.select_for_update().get_or_create(firm=firm, defaults={"year": year})
+    if counter.year != year:
+        counter.year = year
+        counter.next_number = 1
+    return counter
+
+
+def reserve_block(firm, count, exclude=()):
+    """
+    Reserve `count` unused numbers for `firm` with one counter update.
+    `exclude` holds numbers claimed elsewhere in the same write.
+    """
+    if count <= 0:
+        return []
+    year = timezone.localdate().year
+    prefix = case_number_prefix(year)
+    exclude = set(exclude)
+    numbers = []
+    with transaction.atomic():
+        counter = _locked_counter(firm, year)
+        next_number = counter.next_number
+        while len(numbers) < count:
+            stop = next_number + count - len(numbers)
+            numbers.extend(_free_numbers(firm, prefix, next_number, stop, exclude))
+            next_number = stop
+        counter.next_number = next_number
+        counter.save(update_fields=["year", "next_number", "updated_at"])
+    return [format_case_number(prefix, n) for n in numbers]
+
+
+def _lease(firm, year, size):
+    """Advance the counter past the next window holding a free number; return its free numbers."""
+    prefix = case_number_prefix(year)
+    with transaction.atomic():
+        counter = _locked_counter(firm, year)
+        free = []
+        while not free:
+            start = counter.next_number
+            counter.next_number = start + size
+            free = _free_numbers(firm, prefix, start, counter.next_number)
+        counter.save(update_fields=["year", "next_number", "updated_at"])
+    return free
+
+
+def _publish(key, numbers):
+    def publish():
+        with _leases_lock:
+            for stale in [other for other in _leases if other[1] != key[1]]:
+                del _leases[stale]
+            _leases.setdefault(key, deque()).extend(numbers)
+
+    return publish
+
+
+def allocate_case_number(firm):
+    """Next case number for `firm`, from this process's lease when one is available."""
+    year = timezone.localdate().year
+    key = (firm.id, year)
+    with _leases_lock:
+        pool = _leases.get(key)
+        number = pool.popleft() if pool else None
+    if number is None:
+        free = _lease(firm, year, lease_size())
+        number = free.pop(0)
+        if free:
+            transaction.on_commit(_publish(key, free))
+    return format_case_number(case_number_prefix(year), number)
+
+
+def create_numbered(firm, create):
+    """`create(case_number)` in a savepoint, retried with the next number while the number is taken."""
+    for attempt in range(MAX_NUMBER_ATTEMPTS):
+        number = allocate_case_number(firm)
+        try:
+            with transaction.atomic():
+                return create(number)
+        except IntegrityError:
+            taken = Case.objects.filter(firm=firm, case_number=number).exists()
+            if not taken or attempt == MAX_NUMBER_ATTEMPTS - 1:
+                raise
+
+
+def reset_leases():
+    """Forget all in-memory leases (tests, or after the counters were edited by hand)."""
+    with _leases_lock:
+        _leases.clear()
@@ -0,0 +1,163 @@
+import base64
+import binascii
+import json
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError as DjangoValidationError
+from django.core.paginator import EmptyPage, Paginator
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+
+from .models import Case
+
+
+class CountedPaginator(Paginator):
+    """Paginator whose total is supplied by the caller instead of COUNT(*)."""
+
+    def __init__(self, object_list, per_page, count=None, exact=True):
+        super().__init__(object_list, per_page)
+        if count is not None:
+            self.count = count
+        self.count_exact = exact
+
+    def validate_number(self, number):
+        try:
+            return super().validate_number(number)
+        except EmptyPage:
+            # An estimated total must not hide pages that exist past it.
+            if self.count_exact or int(number) < 1:
+                raise
+            return int(number)
+
+    def page(self, number):
+        if self.count_exact:
+            return super().page(number)
+        number = self.validate_number(number)
+        bottom = (number - 1) * self.per_page
+        return self._get_page(self.object_list[bottom : bottom + self.per_page], number, self)
+
+
+class CasePagination(PageNumberPagination):
+    page_size = 20
+    page_size_query_param = "page_size"
+    max_page_size = 100
+
+    def django_paginator_class(self, object_list, per_page):
+        return CountedPaginator(object_list, per_page, count=self.count, exact=self.count_exact)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.count, self.count_exact = None, True
+        if view is not None and hasattr(view, "get_list_count"):
+            self.count, self.count_exact = view.get_list_count(queryset)
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_meta(self, request):
+        return {
+            "page": self.page.number,
+            "page_size": self.get_page_size(request),
+            "count": self.page.paginator.count,
+            "total_pages": self.page.paginator.num_pages,
+            "count_exact": self.page.paginator.count_exact,
+        }
+
+
+class CaseCursorPagination(BasePagination):
+    """Keyset pagination over (sort key, id), opted into with `?pagination=cursor`; no COUNT(*)."""
+
+    cursor_query_param = "cursor"
+    mode_query_param = "pagination"
+    page_size = CasePagination.page_size
+    page_size_query_param = CasePagination.page_size_query_param
+    max_page_size = CasePagination.max_page_size
+    default_ordering = "-created_at"
+    invalid_cursor_message = "Invalid cursor"
+
+    @classmethod
+    def is_requested(cls, request):
+        params = request.query_params
+        return cls.cursor_query_param in params or params.get(cls.mode_query_param) == "cursor"
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params.get(self.page_size_query_param, self.page_size))
+        except (TypeError, ValueError):
+            return self.page_size
+        if size <= 0:
+            return self.page_size
+        return min(size, self.max_page_size)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size_value = self.get_page_size(request)
+        ordering = [term for term in queryset.query.order_by if term.lstrip("-") != "id"]
+        sort_term = ordering[0] if ordering else self.default_ordering
+        field = sort_term.lstrip("-")
+
+        cursor = self.decode_cursor(request, sort_term)
+        reverse = bool(cursor and cursor["reverse"])
+        descending = sort_term.startswith("-") != reverse
+        prefix = "-" if descending else ""
+        queryset = queryset.order_by(f"{prefix}{field}", f"{prefix}id")
+
+        if cursor:
+            op = "lt" if descending else "gt"
+            queryset = queryset.filter(
+                Q(**{f"{field}__{op}": cursor["value"]})
+                | Q(**{field: cursor["value"], f"id__{op}": cursor["id"]})
+            )
+
+        rows = list(queryset[: self.page_size_value + 1])
+        has_more = len(rows) > self.page_size_value
+        rows = rows[: self.page_size_value]
+        if reverse:
+            rows.reverse()
+            has_next, has_prev = cursor is not None, has_more
+        else:
+            has_next, has_prev = has_more, cursor is not None
+
+        self.next_cursor = self.encode_cursor(sort_term, rows[-1], reverse=False) if has_next and rows else None
+        self.prev_cursor = self.encode_cursor(sort_term, rows[0], reverse=True) if has_prev and rows else None
+        return rows
+
+    def get_meta(self, request):
+        return {
+            "pagination": "cursor",
+            "page_size": self.page_size_value,
+            "next_cursor": self.next_cursor,
+            "prev_cursor": self.prev_cursor,
+        }
+
+    @staticmethod
+    def _row_value(row, field):
+        if isinstance(row, dict):
+            return row[field]
+        return getattr(row, field)
+
+    def encode_cursor(self, sort_term, row, reverse):
+        value = self._row_value(row, sort_term.lstrip("-"))
+        payload = {
+            "s": sort_term,
+            "v": value.isoformat() if hasattr(value, "isoformat") else value,
+            "id": str(self._row_value(row, "id")),
+            "r": 1 if reverse else 0,
+        }
+        raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+        return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+    def decode_cursor(self, request, sort_term):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            padded = encoded + "=" * (-len(encoded) % 4)
+            payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+            if payload["s"] != sort_term:
+                raise ValueError("cursor was issued for a different sort")
+            field = Case._meta.get_field(sort_term.lstrip("-"))
+            value, pk = field.to_python(payload["v"]), Case._meta.pk.to_python(payload["id"])
+            # Sort keys are never null, so only a crafted cursor carries None.
+            if value is None or pk is None:
+                raise ValueError("cursor has no position")
+            return {"value": value, "id": pk, "reverse": bool(payload.get("r"))}
+        except (TypeError, ValueError, KeyError, binascii.Error, DjangoValidationError, FieldDoesNotExist):
+            raise NotFound(self.invalid_cursor_message)
@@ -1,39 +1,34 @@
 from rest_framework.permissions import BasePermission, SAFE_METHODS
 
+from common.tenant import get_tenant_context
+
 
 class CasePermission(BasePermission):
     """
     Permissions:
     - SUPER_ADMIN: all
-    - FIRM_OWNER: CRUD within firm
+    - FIRM_OWNER: CRUD within firm (users without a role who own a firm count as FIRM_OWNER)
     - CLIENT: read-only, only their cases
     """
 
     def has_permission(self, request, view):
-        role = (getattr(request.user, "role", "") or "").upper()
-        if role in {"SUPER_ADMIN", "FIRM_OWNER", "OWNER"}:
-            return True
-        # Fallback: treat firm owners without explicit role as FIRM_OWNER
-        owner_firm = getattr(request.user, "owned_firm", None)
-        if owner_firm:
+        tenant = get_tenant_context(request)
+        if tenant.is_super_admin or tenant.is_firm_owner:
             return True
-        if role == "CLIENT":
+        if tenant.is_client:
             return request.method in SAFE_METHODS
         return False
 
     def has_object_permission(self, request, view, obj):
-        role = (getattr(request.user, "role", "") or "").upper()
-        if role == "SUPER_ADMIN":
+        tenant = get_tenant_context(request)
+        if tenant.is_super_admin:
             return True
-        if role in {"FIRM_OWNER", "OWNER"}:
-            return getattr(request.user, "firm_id", None) == getattr(obj, "firm_id", None)
-        owner_firm = getattr(request.user, "owned_firm", None)
-        if owner_firm:
-            return owner_firm.id == getattr(obj, "firm_id", None)
-        if role == "CLIENT":
+        if tenant.is_firm_owner:
+            return tenant.firm_id is not None and tenant.firm_id == getattr(obj, "firm_id", None)
+        if tenant.is_client:
             return (
                 request.method in SAFE_METHODS
                 and obj.client
-                and getattr(obj.client, "user_id", None) == request.user.id
+                and getattr(obj.client, "user_id", None) == tenant.user_id
             )
         return False
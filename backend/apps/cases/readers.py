@@ -0,0 +1,89 @@
+from types import SimpleNamespace
+
+from rest_framework import serializers
+
+
+class CaseRowMapper:
+    columns = (
+        "id",
+        "firm_id",
+        "title",
+        "case_type",
+        "case_number",
+        "status",
+        "priority",
+        "description",
+        "court_name",
+        "judge_name",
+        "open_date",
+        "close_date",
+        "close_reason",
+        "client_id",
+        "client__name",
+        "client__user_id",
+        "assigned_lead_id",
+        "assigned_lead__email",
+        "created_at",
+        "updated_at",
+        "is_deleted",
+        "deleted_at",
+    )
+
+    def __init__(self):
+        self._date = serializers.DateField()
+        self._datetime = serializers.DateTimeField()
+
+    def project(self, queryset):
+        columns = self.columns
+        if "search_rank" in queryset.query.extra_select:
+            columns += ("search_rank",)
+        return queryset.values(*columns)
+
+    def to_representation(self, row):
+        date = self._date.to_representation
+        datetime = self._datetime.to_representation
+        client_id = row["client_id"]
+        lead_id = row["assigned_lead_id"]
+        # Key order matches CaseSerializer.Meta.fields minus write-only fields.
+        return {
+            "id": str(row["id"]),
+            "title": row["title"],
+            "case_type": row["case_type"],
+            "case_number": row["case_number"],
+            "status": row["status"],
+            "priority": row["priority"],
+            "description": row["description"],
+            "court_name": row["court_name"],
+            "judge_name": row["judge_name"],
+            "open_date": date(row["open_date"]),
+            "close_date": date(row["close_date"]),
+            "close_reason": row["close_reason"],
+            "client_detail": {
+                "id": str(client_id),
+                "name": row["client__name"],
+                "user_id": row["client__user_id"],
+            }
+            if client_id
+            else None,
+            "assigned_lead_detail": {
+                "id": lead_id,
+                "email": row["assigned_lead__email"],
+            }
+            if lead_id
+            else None,
+            "created_at": datetime(row["created_at"]),
+            "updated_at": datetime(row["updated_at"]),
+            "is_deleted": bool(row["is_deleted"]),
+            "deleted_at": datetime(row["deleted_at"]),
+        }
+
+    def to_representation_many(self, rows):
+        return [self.to_representation(row) for row in rows]
+
+    def permission_target(self, row):
+        """Object with the attributes CasePermission.has_object_permission reads."""
+        client = SimpleNamespace(user_id=row["client__user_id"]) if row["client_id"] else None
+        return SimpleNamespace(id=row["id"], firm_id=row["firm_id"], client=client)
+
+
+case_rows = CaseRowMapper()
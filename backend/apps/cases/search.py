@@ -0,0 +1,208 @@
+import re
+
+from django.db import connection, connections
+from django.db.models import Q
+
+SEARCH_FIELDS = ("title", "case_number", "court_name", "judge_name", "description")
+MAX_TERMS = 8
+BATCH_SIZE = 500
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def search_terms(text):
+    return [token.lower() for token in _TOKEN_RE.findall(text or "")][:MAX_TERMS]
+
+
+class SqliteSearchBackend:
+    table = "cases_case_fts"
+    # bm25 weights follow the column order below; ids are never ranked.
+    rank_sql = f"bm25({table}, 0, 0, 10.0, 8.0, 2.0, 2.0, 1.0)"
+
+    def create(self, cursor):
+        cursor.execute(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {self.table} USING fts5("
+            "case_id, firm_id, title, case_number, court_name, judge_name, description, "
+            "tokenize = 'unicode61 remove_diacritics 2')"
+        )
+
+    def drop(self, cursor):
+        cursor.execute(f"DROP TABLE IF EXISTS {self.table}")
+
+    @staticmethod
+    def _key(case_id):
+        # Same text representation Django stores for UUIDField on SQLite.
+        return case_id.hex
+
+    def delete(self, cursor, case_ids):
+        keys = [self._key(case_id) for case_id in case_ids]
+        for start in range(0, len(keys), BATCH_SIZE):
+            chunk = keys[start : start + BATCH_SIZE]
+            match = "case_id: (" + " OR ".join(f'"{key}"' for key in chunk) + ")"
+            cursor.execute(
+                f"DELETE FROM {self.table} WHERE rowid IN (SELECT rowid FROM {self.table} WHERE {self.table} MATCH %s)",
+                [match],
+            )
+
+    def insert(self, cursor, rows):
+        cursor.executemany(
+            f"INSERT INTO {self.table} (case_id, firm_id, {', '.join(SEARCH_FIELDS)}) VALUES (%s, %s, %s, %s, %s, %s, %s)",
+            [
+                [self._key(row["id"]), str(row["firm_id"])] + [row.get(field) or "" for field in SEARCH_FIELDS]
+                for row in rows
+            ],
+        )
+
+    def match(self, queryset, terms, firm_id=None):
+        expression = "{" + " ".join(SEARCH_FIELDS) + "}: (" + " AND ".join(f'"{term}"*' for term in terms) + ")"
+        if firm_id is not None:
+            expression = f'firm_id: "{firm_id}" AND {expression}'
+        table = queryset.model._meta.db_table
+        return queryset.extra(
+            select={"search_rank": self.rank_sql},
+            tables=[self.table],
+            where=[f"{self.table}.case_id = {table}.id", f"{self.table} MATCH %s"],
+            params=[expression],
+        )
+
+
+class PostgresSearchBackend:
+    table = "cases_case_search"
+    document_sql = (
+        "setweight(to_tsvector('simple', coalesce(%s, '')), 'A') || "
+        "setweight(to_tsvector('simple', coalesce(%s, '')), 'A') || "
+        "setweight(to_tsvector('simple', coalesce(%s, '')), 'C') || "
+        "setweight(to_tsvector('simple', coalesce(%s, '')), 'C') || "
+        "setweight(to_tsvector('simple', coalesce(%s, '')), 'D')"
+    )
+
+    def create(self, cursor):
+        cursor.execute(
+            f"CREATE TABLE IF NOT EXISTS {self.table} ("
+            "case_id uuid PRIMARY KEY, "
+            "firm_id bigint NOT NULL, "
+            "document tsvector NOT NULL)"
+        )
+        cursor.execute(f"CREATE INDEX IF NOT EXISTS {self.table}_document ON {self.table} USING gin (document)")
+        cursor.execute(f"CREATE INDEX IF NOT EXISTS {self.table}_firm ON {self.table} (firm_id)")
+
+    def drop(self, cursor):
+        cursor.execute(f"DROP TABLE IF EXISTS {self.table}")
+
+    def delete(self, cursor, case_ids):
+        ids = list(case_ids)
+        for start in range(0, len(ids), BATCH_SIZE):
+            cursor.execute(f"DELETE FROM {self.table} WHERE case_id = ANY(%s)", [ids[start : start + BATCH_SIZE]])
+
+    def insert(self, cursor, rows):
+        cursor.executemany(
+            f"INSERT INTO {self.table} (case_id, firm_id, document) VALUES (%s, %s, {self.document_sql}) "
+            "ON CONFLICT (case_id) DO UPDATE SET firm_id = EXCLUDED.firm_id, document = EXCLUDED.document",
+            [[row["id"], row["firm_id"]] + [row.get(field) for field in SEARCH_FIELDS] for row in rows],
+        )
+
+    def match(self, queryset, terms, firm_id=None):
+        tsquery = " & ".join(f"{term}:*" for term in terms)
+        table = queryset.model._meta.db_table
+        where = [f"{self.table}.case_id = {table}.id", f"{self.table}.document @@ to_tsquery('simple', %s)"]
+        params = [tsquery]
+        if firm_id is not None:
+            where.append(f"{self.table}.firm_id = %s")
+            params.append(firm_id)
+        return queryset.extra(
+            # Negated so that ascending order is best-first on both backends.
+            select={"search_rank": f"-ts_rank_cd({self.table}.document, to_tsquery('simple', %s))"},
+            select_params=[tsquery],
+            tables=[self.table],
+            where=where,
+            params=params,
+        )
+
+
+BACKENDS = {
+    "sqlite": SqliteSearchBackend(),
+    "postgresql": PostgresSearchBackend(),
+}
+
+
+def get_backend(conn=None):
+    return BACKENDS.get((conn or connection).vendor)
+
+
+def _row(case):
+    row = {"id": case.id, "firm_id": case.firm_id}
+    row.update({field: getattr(case, field) for field in SEARCH_FIELDS})
+    return row
+
+
+def index_rows(rows, conn=None):
+    """(Re)index case rows given as dicts with id, firm_id and SEARCH_FIELDS."""
+    conn = conn or connection
+    backend = get_backend(conn)
+    rows = list(rows)
+    if backend is None or not rows:
+        return
+    with conn.cursor() as cursor:
+        backend.delete(cursor, [row["id"] for row in rows])
+        backend.insert(cursor, rows)
+
+
+def index_cases(cases):
+    """Sync the index with the given Case instances; deleted ones are dropped."""
+    cases = list(cases)
+    remove_cases([case.id for case in cases if case.is_deleted])
+    index_rows([_row(case) for case in cases if not case.is_deleted])
+
+
+def remove_cases(case_ids):
+    backend = get_backend()
+    case_ids = list(case_ids)
+    if backend is None or not case_ids:
+        return
+    with connection.cursor() as cursor:
+        backend.delete(cursor, case_ids)
+
+
+def rebuild_index(case_model, conn=None, batch_size=2000):
+    """Drop and refill the index from live cases. Returns the number indexed."""
+    conn = conn or connection
+    backend = get_backend(conn)
+    if backend is None:
+        return 0
+    with conn.cursor() as cursor:
+        backend.drop(cursor)
+        backend.create(cursor)
+    total = 0
+    batch = []
+    rows = (
+        case_model._base_manager.using(conn.alias)
+        .filter(is_deleted=False)
+        .order_by()
+        .values("id", "firm_id", *SEARCH_FIELDS)
+        .iterator(chunk_size=batch_size)
+    )
+    with conn.cursor() as cursor:
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= batch_size:
+                backend.insert(cursor, batch)
+                total += len(batch)
+                batch = []
+        if batch:
+            backend.insert(cursor, batch)
+            total += len(batch)
+    return total
+
+
+def search_cases(queryset, text, firm_id=None):
+    """
+    Restrict `queryset` to cases matching every term of `text` (prefix match)
+    and annotate `search_rank`, where lower is more relevant.
+    """
+    backend = get_backend(connections[queryset.db])
+    if backend is None:
+        return queryset.filter(Q(title__icontains=text) | Q(case_number__icontains=text))
+    terms = search_terms(text)
+    if not terms:
+        return queryset.none()
+    return backend.match(queryset, terms, firm_id=firm_id)
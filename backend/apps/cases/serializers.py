@@ -2,17 +2,22 @@ from django.contrib.auth import get_user_model
 from django.utils import timezone
 from rest_framework import serializers
 
-from apps.authx.models import Firm
-from django.db import transaction
+from common.tenant import get_tenant_context
 
-from .models import Case, CaseStatus, CasePriority, ClientProfile, FirmCaseCounter
+from .models import Case, CaseStatus, CasePriority, ClientProfile
+from .numbering import create_numbered
 
 User = get_user_model()
 
 
+def assigned_lead_field(**kwargs):
+    """`assigned_lead` of every case write: the user primary key is an integer."""
+    return serializers.IntegerField(required=False, allow_null=True, **kwargs)
+
+
 class CaseSerializer(serializers.ModelSerializer):
     client = serializers.UUIDField(required=False, allow_null=True, write_only=True)
-    assigned_lead = serializers.UUIDField(required=False, allow_null=True, write_only=True)
+    assigned_lead = assigned_lead_field(write_only=True)
 
     client_detail = serializers.SerializerMethodField(read_only=True)
     assigned_lead_detail = serializers.SerializerMethodField(read_only=True)
@@ -63,21 +68,14 @@ class CaseSerializer(serializers.ModelSerializer):
         cleaned = value.strip()
         return cleaned or None
 
+    def _tenant(self):
+        return get_tenant_context(self.context.get("request"))
+
     def _get_target_firm(self):
-        request = self.context.get("request")
-        user = getattr(request, "user", None)
-        role = (getattr(user, "role", "") or "").upper()
-        header_firm = request.headers.get("X-FIRM-ID") if request else None
-        if role == "SUPER_ADMIN" and header_firm:
-            try:
-                return Firm.objects.get(id=header_firm)
-            except Firm.DoesNotExist:
-                raise serializers.ValidationError({"firm": "Invalid firm id"})
-        firm = getattr(user, "firm", None)
-        if not firm and hasattr(user, "owned_firm"):
-            firm = getattr(user, "owned_firm")
-        if not firm and getattr(user, "firm_id", None):
-            firm = Firm.objects.filter(id=user.firm_id).first()
+        tenant = self._tenant()
+        firm = tenant.firm
+        if tenant.is_super_admin and tenant.firm_id and firm is None:
+            raise serializers.ValidationError({"firm": "Invalid firm id"})
         if not firm:
             raise serializers.ValidationError({"firm": "User is not associated with a firm"})
         return firm
@@ -89,11 +87,16 @@ class CaseSerializer(serializers.ModelSerializer):
             client = ClientProfile.objects.get(id=client_id)
         except ClientProfile.DoesNotExist:
             raise serializers.ValidationError({"client": "Client not found"})
-        role = (getattr(self.context.get("request").user, "role", "") or "").upper()
-        if role != "SUPER_ADMIN" and client.firm_id != firm.id:
-            raise serializers.ValidationError({"client": "Client must belong to the same firm"})
+        self._check_client(firm, client)
         return client
 
+    def _is_super_admin(self):
+        return self._tenant().is_super_admin
+
+    def _check_client(self, firm, client):
+        if not self._is_super_admin() and client.firm_id != firm.id:
+            raise serializers.ValidationError({"client": "Client must belong to the same firm"})
+
     def _resolve_assigned_lead(self, firm, lead_id):
         if not lead_id:
             return None
@@ -101,16 +104,18 @@ class CaseSerializer(serializers.ModelSerializer):
             user = User.objects.get(id=lead_id)
         except User.DoesNotExist:
             raise serializers.ValidationError({"assigned_lead": "Assigned lead not found"})
-        role = (getattr(self.context.get("request").user, "role", "") or "").upper()
-        if role != "SUPER_ADMIN" and getattr(user, "firm_id", None) != firm.id:
-            raise serializers.ValidationError({"assigned_lead": "Assigned lead must belong to the same firm"})
+        self._check_assigned_lead(firm, user)
         return user
 
+    def _check_assigned_lead(self, firm, user):
+        # The firm's own users are its owner; client users have ClientProfiles, not leads.
+        if not self._is_super_admin() and user.pk != firm.owner_id:
+            raise serializers.ValidationError({"assigned_lead": "Assigned lead must belong to the same firm"})
+
     def validate(self, attrs):
         request = self.context.get("request")
         firm = self._get_target_firm()
         attrs["firm"] = firm
-        is_create = self.instance is None
         provided_case_number = self.validate_case_number(attrs.get("case_number"))
         attrs["case_number"] = provided_case_number
 
@@ -123,24 +128,20 @@ class CaseSerializer(serializers.ModelSerializer):
         if status_val == CaseStatus.CLOSED and not attrs.get("close_date"):
             attrs["close_date"] = timezone.localdate()
 
-        if is_create and not provided_case_number:
-            attrs["case_number"] = self._generate_case_number(firm)
-
-        attrs["created_by"] = request.user if self.instance is None else getattr(self.instance, "created_by", request.user)
+        if self.instance is None:
+            # By id: request.user may be a token-backed ClaimsUser.
+            attrs["created_by_id"] = request.user.pk
         return attrs
 
-    def _generate_case_number(self, firm):
-        prefix = f"CIV-{timezone.localdate().year}-"
-        with transaction.atomic():
-            counter, _ = FirmCaseCounter.objects.select_for_update().get_or_create(firm=firm)
-            while True:
-                num = counter.next_number
-                candidate = f"{prefix}{num:03d}"
-                if not Case.objects.filter(firm=firm, case_number=candidate).exists():
-                    counter.next_number = num + 1
-                    counter.save(update_fields=["next_number", "updated_at"])
-                    return candidate
-                counter.next_number = num + 1
+    def create(self, validated_data):
+        # Without a case_number one is generated at insert time, so a number
+        # taken meanwhile can be swapped for the next one.
+        if validated_data.get("case_number"):
+            return super().create(validated_data)
+        return create_numbered(
+            validated_data["firm"],
+            lambda number: super(CaseSerializer, self).create({**validated_data, "case_number": number}),
+        )
 
     def get_client_detail(self, obj):
         if not obj.client:
@@ -158,3 +159,44 @@ class CaseSerializer(serializers.ModelSerializer):
             "id": obj.assigned_lead.id,
             "email": obj.assigned_lead.email,
         }
+
+
+class CaseBulkItemSerializer(CaseSerializer):
+    """One item of a bulk create; references and case numbers are resolved per batch in apps.cases.bulk."""
+
+    def validate(self, attrs):
+        status_val = attrs.get("status") or CaseStatus.OPEN
+        if status_val == CaseStatus.CLOSED and not attrs.get("close_date"):
+            attrs["close_date"] = timezone.localdate()
+        return attrs
+
+
+class CaseBulkSelectionSerializer(serializers.Serializer):
+    """Target of a bulk update/delete: explicit ids or CaseFilter params."""
+
+    ids = serializers.ListField(child=serializers.UUIDField(), required=False, allow_empty=False, max_length=5000)
+    filter = serializers.DictField(required=False)
+
+    def validate_filter(self, value):
+        cleaned = {key: item for key, item in value.items() if item not in (None, "")}
+        if not cleaned:
+            raise serializers.ValidationError("Provide at least one filter value.")
+        return cleaned
+
+    def validate(self, attrs):
+        if not attrs.get("ids") and not attrs.get("filter"):
+            raise serializers.ValidationError({"ids": "Provide case ids or a filter."})
+        return attrs
+
+
+class CaseBulkUpdateSerializer(CaseBulkSelectionSerializer):
+    status = serializers.ChoiceField(choices=CaseStatus.choices, required=False)
+    priority = serializers.ChoiceField(choices=CasePriority.choices, required=False)
+    # null unassigns.
+    assigned_lead = assigned_lead_field()
+
+    def validate(self, attrs):
+        attrs = super().validate(attrs)
+        if not any(field in attrs for field in ("status", "priority", "assigned_lead")):
+            raise serializers.ValidationError({"status": "Provide status, priority or assigned_lead."})
+        return attrs
@@ -0,0 +1,55 @@
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from apps.authx.signals import revoke_on_commit
+
+from . import search, versioning
+from .models import Case, ClientProfile
+
+User = get_user_model()
+
+@receiver(post_save, sender=Case, dispatch_uid="cases_search_index_save")
+def index_case_on_save(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    search.index_cases([instance])
+
+
+@receiver(post_delete, sender=Case, dispatch_uid="cases_search_index_delete")
+def remove_case_on_delete(sender, instance, **kwargs):
+    search.remove_cases([instance.id])
+
+
+@receiver(post_save, sender=Case, dispatch_uid="cases_data_version_case_save")
+@receiver(post_delete, sender=Case, dispatch_uid="cases_data_version_case_delete")
+@receiver(post_save, sender=ClientProfile, dispatch_uid="cases_data_version_client_save")
+@receiver(post_delete, sender=ClientProfile, dispatch_uid="cases_data_version_client_delete")
+def bump_firm_data_version(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    versioning.bump(instance.firm_id)
+
+
+@receiver(pre_save, sender=User, dispatch_uid="cases_data_version_lead_email_old")
+def remember_lead_email(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw or instance.pk is None or (update_fields is not None and "email" not in update_fields):
+        return
+    instance._cases_old_email = User._base_manager.filter(pk=instance.pk).values_list("email", flat=True).first()
+
+
+@receiver(post_save, sender=User, dispatch_uid="cases_data_version_lead_email_save")
+def bump_lead_firms_data_version(sender, instance, raw=False, **kwargs):
+    # Case payloads embed the assigned lead's email.
+    old_email = instance.__dict__.pop("_cases_old_email", None)
+    if raw or old_email is None or old_email == instance.email:
+        return
+    versioning.bump(*Case.objects.filter(assigned_lead=instance).values_list("firm_id", flat=True).distinct())
+
+
+@receiver(post_save, sender=ClientProfile, dispatch_uid="cases_revoke_client_tokens_save")
+@receiver(post_delete, sender=ClientProfile, dispatch_uid="cases_revoke_client_tokens_delete")
+def revoke_client_tokens(sender, instance, raw=False, **kwargs):
+    # The client's firm is an access token claim.
+    if not raw:
+        revoke_on_commit(instance.user_id)
@@ -0,0 +1,33 @@
+from django.contrib.auth import get_user_model
+
+from apps.authx.models import Firm
+from apps.cases.models import ClientProfile
+
+
+User = get_user_model()
+
+
+def create_user(username, role=None, password="x", **fields):
+    """User `username` with email `<username>@example.com`; `role` is only set on the instance."""
+    user = User.objects.create_user(username=username, email=f"{username}@example.com", password=password, **fields)
+    if role:
+        user.role = role
+    return user
+
+
+def create_firm(name, owner=None, role="FIRM_OWNER", **fields):
+    """
+    (owner, firm) for a firm "<Name> Firm" owned by `owner` or a new user "owner_<name>".
+    With a `role`, the owner instance carries role and firm_id like an authenticated firm user.
+    """
+    owner = owner or create_user(f"owner_{name}")
+    label = name.replace("_", " ").title()
+    firm = Firm.objects.create(name=f"{label} Firm", slug=f"{name.replace('_', '-')}-firm", owner=owner, **fields)
+    if role:
+        owner.role, owner.firm_id = role, firm.id
+    return owner, firm
+
+
+def create_client(firm, username, role=None, name="Client"):
+    """ClientProfile `name` in `firm` for a new user `username`."""
+    return ClientProfile.objects.create(firm=firm, user=create_user(username, role=role), name=name)
@@ -0,0 +1,80 @@
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from apps.cases.models import Case, FirmCaseCounter
+from apps.cases.tests.factories import create_client, create_firm
+
+
+class CaseBulkCreateTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.owner, self.firm = create_firm("bulk")
+        self.profile = create_client(self.firm, "client_bulk", name="Bulk Client")
+        self.prefix = f"CIV-{timezone.localdate().year}-"
+        self.client.force_authenticate(self.owner)
+
+    def test_creates_batch_with_block_numbers_in_constant_queries(self):
+        # A hand-entered number ahead of the counter must be skipped.
+        Case.objects.create(firm=self.firm, created_by=self.owner, title="Manual", case_number=f"{self.prefix}002")
+        items = [{"title": f"Imported {i}", "client": str(self.profile.id)} for i in range(40)]
+        items[5]["case_number"] = "LEGACY-1"
+        # The firm's count rows are not built, so the count update waits on the firm row.
+        with self.assertNumQueries(23):
+            response = self.client.post("/api/v1/cases/bulk/", items, format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["meta"], {"total": 40, "created": 40, "failed": 0})
+        numbers = [row["case_number"] for row in response.data["data"]]
+        self.assertEqual(numbers[5], "LEGACY-1")
+        generated = numbers[:5] + numbers[6:]
+        self.assertNotIn(f"{self.prefix}002", generated)
+        self.assertEqual(generated[:2], [f"{self.prefix}001", f"{self.prefix}003"])
+        self.assertEqual(FirmCaseCounter.objects.get(firm=self.firm).next_number, 41)
+        self.assertEqual(Case.objects.filter(firm=self.firm, client=self.profile).count(), 40)
+        self.assertEqual(self.client.get("/api/v1/cases/", {"search": "imported"}).data["meta"]["count"], 40)
+
+    def test_reports_per_item_errors_and_keeps_valid_items(self):
+        Case.objects.create(firm=self.firm, created_by=self.owner, title="Existing", case_number="DUP-1")
+        other_owner, other_firm = create_firm("other_bulk", role=None)
+        foreign = create_client(other_firm, "other_client", name="Foreign")
+        items = [
+            {"title": "Good one"},
+            {"title": "x"},
+            {"title": "Taken number", "case_number": "DUP-1"},
+            {"title": "Foreign client", "client": str(foreign.id)},
+            {"title": "Repeated", "case_number": "NEW-1"},
+            {"title": "Repeated again", "case_number": "NEW-1"},
+            {"title": "Own lead", "assigned_lead": self.owner.id},
+            {"title": "Foreign lead", "assigned_lead": other_owner.id},
+        ]
+        response = self.client.post("/api/v1/cases/bulk/", {"items": items}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["meta"], {"total": 8, "created": 3, "failed": 5})
+        results = response.data["data"]
+        self.assertEqual([r["success"] for r in results], [True, False, False, False, True, False, True, False])
+        self.assertIn("title", results[1]["errors"])
+        self.assertIn("case_number", results[2]["errors"])
+        self.assertIn("client", results[3]["errors"])
+        self.assertIn("case_number", results[5]["errors"])
+        self.assertEqual(Case.objects.get(id=results[6]["id"]).assigned_lead, self.owner)
+        self.assertIn("assigned_lead", results[7]["errors"])
+
+    def test_rejects_empty_and_all_invalid_batches(self):
+        self.assertEqual(self.client.post("/api/v1/cases/bulk/", [], format="json").status_code, 400)
+        response = self.client.post("/api/v1/cases/bulk/", [{"title": ""}], format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(response.data["success"])
+        self.assertEqual(Case.objects.count(), 0)
+
+    def test_assigned_lead_takes_a_user_id_on_every_endpoint(self):
+        uuid_lead = "5b6f0c3e-7a51-4a0e-9a55-0d1f3c1e2a90"
+        single = self.client.post("/api/v1/cases/", {"title": "Single", "assigned_lead": uuid_lead}, format="json")
+        bulk = self.client.post("/api/v1/cases/bulk/", [{"title": "Bulk", "assigned_lead": uuid_lead}], format="json")
+        case = Case.objects.create(firm=self.firm, created_by=self.owner, title="Existing", case_number="EX-1")
+        update = self.client.patch("/api/v1/cases/bulk/", {"ids": [str(case.id)], "assigned_lead": uuid_lead}, format="json")
+        for response in (single, bulk, update):
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("assigned_lead", single.data["errors"])
+        self.assertIn("assigned_lead", update.data["errors"])
+        self.assertEqual(Case.objects.count(), 1)
@@ -0,0 +1,101 @@
+from django.test import TestCase
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from apps.cases import bulk, counts
+from apps.cases.models import Case
+from apps.cases.tests.factories import create_client, create_firm
+
+
+class CaseBulkUpdateTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.owner, self.firm = create_firm("bulk_up")
+        self.cases = [
+            Case.objects.create(firm=self.firm, created_by=self.owner, title=f"Batch {i}", priority="LOW")
+            for i in range(7)
+        ]
+        self.other_owner, other_firm = create_firm("other_up", role=None)
+        self.foreign = Case.objects.create(firm=other_firm, created_by=self.other_owner, title="Foreign", priority="LOW")
+        self.client.force_authenticate(self.owner)
+        counts.recompute(self.firm.id)
+
+    def _stored(self):
+        return {key: n for key, n in counts.recompute(self.firm.id).items() if n}
+
+    def test_update_by_ids_stays_inside_the_firm(self):
+        ids = [str(case.id) for case in self.cases[:3]] + [str(self.foreign.id)]
+        response = self.client.patch(
+            "/api/v1/cases/bulk/", {"ids": ids, "status": "CLOSED", "priority": "HIGH"}, format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["data"], {"updated": 3})
+        closed = Case.objects.filter(status="CLOSED")
+        self.assertEqual(closed.count(), 3)
+        self.assertTrue(all(case.close_date for case in closed))
+        self.foreign.refresh_from_db()
+        self.assertEqual(self.foreign.status, "OPEN")
+        stored = {(f, v): n for f, v, n in self.firm.case_counts.values_list("facet", "value", "count") if n}
+        self.assertEqual(stored, self._stored())
+
+    def test_update_by_filter_in_chunks(self):
+        self.cases[0].priority = "URGENT"
+        self.cases[0].save()
+        queryset = Case.objects.filter(firm=self.firm, is_deleted=False, priority="LOW")
+        self.assertEqual(bulk.update_cases(queryset, {"status": "HOLD"}, chunk_size=2), 6)
+        response = self.client.patch(
+            "/api/v1/cases/bulk/", {"filter": {"status": "hold"}, "priority": "MEDIUM"}, format="json"
+        )
+        self.assertEqual(response.data["data"], {"updated": 6})
+        self.assertEqual(Case.objects.filter(firm=self.firm, priority="MEDIUM").count(), 6)
+
+    def test_assign_and_unassign_lead_of_the_firm(self):
+        ids = [str(case.id) for case in self.cases[:2]]
+        response = self.client.patch("/api/v1/cases/bulk/", {"ids": ids, "assigned_lead": self.owner.id}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["data"], {"updated": 2})
+        self.assertEqual(Case.objects.filter(assigned_lead=self.owner).count(), 2)
+        response = self.client.patch("/api/v1/cases/bulk/", {"ids": ids, "assigned_lead": None}, format="json")
+        self.assertEqual(response.data["data"], {"updated": 2})
+        self.assertFalse(Case.objects.filter(assigned_lead__isnull=False).exists())
+
+    def test_single_create_takes_the_same_lead(self):
+        response = self.client.post("/api/v1/cases/", {"title": "Led", "assigned_lead": self.owner.id}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["data"]["assigned_lead_detail"]["id"], self.owner.id)
+        response = self.client.post("/api/v1/cases/", {"title": "Foreign", "assigned_lead": self.other_owner.id}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_assigned_lead_outside_the_firm_rejected(self):
+        client_user = create_client(self.firm, "client_bulk_up").user
+        ids = [str(self.cases[0].id)]
+        for lead in (self.other_owner, client_user):
+            with self.subTest(lead=lead.username):
+                response = self.client.patch(
+                    "/api/v1/cases/bulk/", {"ids": ids, "assigned_lead": lead.id}, format="json"
+                )
+                self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+                self.assertIn("assigned_lead", response.data["errors"])
+        response = self.client.patch("/api/v1/cases/bulk/", {"ids": ids, "assigned_lead": 999999}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Case.objects.filter(assigned_lead__isnull=False).exists())
+
+    def test_bulk_soft_delete(self):
+        ids = [str(case.id) for case in self.cases[:2]] + [str(self.foreign.id)]
+        response = self.client.delete("/api/v1/cases/bulk/", {"ids": ids}, format="json")
+        self.assertEqual(response.data["data"], {"deleted": 2})
+        self.assertEqual(Case.objects.filter(is_deleted=True).count(), 2)
+        self.assertEqual(self.client.get("/api/v1/cases/").data["meta"]["count"], 5)
+        self.assertEqual(self.client.get("/api/v1/cases/", {"search": "batch"}).data["meta"]["count"], 5)
+
+    def test_requires_a_selection_and_a_change(self):
+        self.assertEqual(self.client.patch("/api/v1/cases/bulk/", {"status": "CLOSED"}, format="json").status_code, 400)
+        ids = [str(self.cases[0].id)]
+        self.assertEqual(self.client.patch("/api/v1/cases/bulk/", {"ids": ids}, format="json").status_code, 400)
+        self.assertEqual(self.client.delete("/api/v1/cases/bulk/", {"filter": {"status": ""}}, format="json").status_code, 400)
+
+    def test_clients_cannot_bulk_write(self):
+        client_user = create_client(self.firm, "client_bulk_up", role="CLIENT").user
+        self.client.force_authenticate(client_user)
+        response = self.client.delete("/api/v1/cases/bulk/", {"ids": [str(self.cases[0].id)]}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
@@ -0,0 +1,72 @@
+from django.test import TestCase
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from apps.cases.models import Case
+from apps.cases.tests.factories import create_client, create_firm
+
+
+class CaseConditionalGetTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.owner, self.firm = create_firm("etag")
+        self.case = Case.objects.create(firm=self.firm, created_by=self.owner, title="Tagged")
+        self.client.force_authenticate(self.owner)
+
+    def _get(self, url, etag=None, **params):
+        headers = {"HTTP_IF_NONE_MATCH": etag} if etag else {}
+        return self.client.get(url, params, **headers)
+
+    def test_list_and_retrieve_return_304_without_querying_cases(self):
+        for url in ("/api/v1/cases/", f"/api/v1/cases/{self.case.id}/"):
+            with self.subTest(url=url):
+                first = self._get(url)
+                self.assertEqual(first.status_code, status.HTTP_200_OK)
+                self.assertIn("Last-Modified", first)
+                with self.assertNumQueries(1):
+                    again = self._get(url, first["ETag"])
+                self.assertEqual(again.status_code, status.HTTP_304_NOT_MODIFIED)
+                self.assertEqual(again["ETag"], first["ETag"])
+
+    def test_etag_depends_on_query_string(self):
+        first = self._get("/api/v1/cases/", page_size=5)
+        other = self._get("/api/v1/cases/", first["ETag"], page_size=10)
+        self.assertEqual(other.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(other["ETag"], first["ETag"])
+
+    def test_mutations_change_the_etag(self):
+        etag = self._get("/api/v1/cases/")["ETag"]
+        self.client.patch(f"/api/v1/cases/{self.case.id}/", {"title": "Renamed"}, format="json")
+        response = self._get("/api/v1/cases/", etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["data"][0]["title"], "Renamed")
+
+        etag = response["ETag"]
+        self.client.delete(f"/api/v1/cases/{self.case.id}/")
+        self.assertEqual(self._get("/api/v1/cases/", etag).status_code, status.HTTP_200_OK)
+
+    def test_lead_email_change_changes_the_etag(self):
+        self.case.assigned_lead = self.owner
+        self.case.save()
+        etag = self._get("/api/v1/cases/")["ETag"]
+        self.owner.first_name = "Renamed"
+        self.owner.save(update_fields=["first_name"])
+        self.assertEqual(self._get("/api/v1/cases/", etag).status_code, status.HTTP_304_NOT_MODIFIED)
+
+        self.owner.email = "lead_etag@example.com"
+        self.owner.save()
+        response = self._get("/api/v1/cases/", etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["data"][0]["assigned_lead_detail"]["email"], "lead_etag@example.com")
+
+    def test_client_etag_tracks_own_firm(self):
+        profile = create_client(self.firm, "client_etag", role="CLIENT")
+        self.case.client = profile
+        self.case.save()
+        self.client.force_authenticate(profile.user)
+        first = self._get("/api/v1/cases/")
+        self.assertEqual(len(first.data["data"]), 1)
+        self.assertEqual(self._get("/api/v1/cases/", first["ETag"]).status_code, status.HTTP_304_NOT_MODIFIED)
+        profile.name = "Client Renamed"
+        profile.save()
+        self.assertEqual(self._get("/api/v1/cases/", first["ETag"]).status_code, status.HTTP_200_OK)
@@ -0,0 +1,89 @@
+from unittest import mock
+
+from django.test import TestCase, override_settings
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from apps.cases import counts
+from apps.cases.models import Case, FirmCaseCount
+from apps.cases.tests.factories import create_firm
+
+
+class CaseCountTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.owner, self.firm = create_firm("counts")
+        for i in range(6):
+            Case.objects.create(
+                firm=self.firm,
+                created_by=self.owner,
+                title=f"Count {i}",
+                status="OPEN" if i < 4 else "HOLD",
+                priority="HIGH" if i % 2 else "LOW",
+            )
+        self.client.force_authenticate(self.owner)
+
+    def _meta(self, params=None):
+        response = self.client.get("/api/v1/cases/", params or {})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data["meta"]
+
+    def _stored(self):
+        rows = FirmCaseCount.objects.filter(firm=self.firm).values_list("facet", "value", "count")
+        return {(facet, value): n for facet, value, n in rows if n}
+
+    def test_unfiltered_and_facet_totals_read_stored_counts(self):
+        self.assertEqual(self._meta()["count"], 6)
+        self.assertEqual(self._stored()[counts.TOTAL], 6)
+        with self.assertNumQueries(3):
+            # Data version + stored count row + page query; no COUNT(*) over cases.
+            meta = self._meta({"status": "hold"})
+        self.assertEqual(meta["count"], 2)
+        self.assertTrue(meta["count_exact"])
+
+    def test_write_paths_keep_counts_in_sync(self):
+        self._meta()  # builds the firm's rows
+        response = self.client.post("/api/v1/cases/", {"title": "New", "status": "HOLD", "priority": "LOW"})
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        case_id = response.data["data"]["id"]
+        self.client.patch(f"/api/v1/cases/{case_id}/", {"status": "CLOSED", "priority": "URGENT"}, format="json")
+        victim = Case.objects.filter(firm=self.firm, status="OPEN").first()
+        self.client.delete(f"/api/v1/cases/{victim.id}/")
+
+        stored = self._stored()
+        self.assertEqual(stored, {key: n for key, n in counts.recompute(self.firm.id).items() if n})
+        self.assertEqual(stored[counts.TOTAL], 6)
+        self.assertEqual(stored[("status", "CLOSED")], 1)
+        self.assertEqual(self._meta({"priority": "urgent"})["count"], 1)
+
+    def test_writer_waiting_on_a_rebuild_applies_its_delta(self):
+        # A rebuild commits while the writer waits on the firm row; its rows
+        # do not include the writer's uncommitted case.
+        built = counts.recompute(self.firm.id)
+        FirmCaseCount.objects.filter(firm=self.firm).delete()
+        case = Case.objects.create(firm=self.firm, created_by=self.owner, title="Racing", status="HOLD", priority="LOW")
+
+        def rebuild_elsewhere(firm_id):
+            FirmCaseCount.objects.bulk_create(
+                FirmCaseCount(firm_id=firm_id, facet=facet, value=value, count=n) for (facet, value), n in built.items()
+            )
+
+        with mock.patch.object(counts, "_lock_firm", side_effect=rebuild_elsewhere):
+            counts.record_created(case)
+        stored = self._stored()
+        self.assertEqual(stored[counts.TOTAL], 7)
+        self.assertEqual(stored, {key: n for key, n in counts.recompute(self.firm.id).items() if n})
+
+    @override_settings(CASE_COUNT_ESTIMATE_LIMIT=3)
+    def test_multi_filter_count_is_bounded(self):
+        meta = self._meta({"status": "open", "priority": "low", "page_size": 1})
+        self.assertEqual(meta["count"], 2)
+        self.assertTrue(meta["count_exact"])
+
+        meta = self._meta({"search": "count", "page_size": 2})
+        self.assertFalse(meta["count_exact"])
+        self.assertGreaterEqual(meta["count"], 4)
+        # Pages past an estimated total still resolve.
+        response = self.client.get("/api/v1/cases/", {"search": "count", "page_size": 2, "page": 3})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["data"]), 2)
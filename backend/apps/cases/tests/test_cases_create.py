@@ -7,7 +7,7 @@ from rest_framework.test import APIClient
 from rest_framework import status
 
 from apps.authx.models import Firm
-from apps.cases.models import Case, Client, CaseStatus
+from apps.cases.models import Case, CaseStatus, ClientProfile
 
 
 User = get_user_model()
@@ -85,7 +85,7 @@ class CaseCreateAPITests(TestCase):
 
         self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
         self.assertFalse(response.data["success"])
-        self.assertEqual(response.data["message"], "You do not have permission to create cases.")
+        self.assertEqual(response.data["message"], "Forbidden")
         self.assertIsNone(response.data["data"])
         self.assertIsNone(response.data["errors"])
 
@@ -118,9 +118,9 @@ class CaseCreateAPITests(TestCase):
 
         response = self.client.post("/api/cases/", payload, format="json")
 
-        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
         self.assertFalse(response.data["success"])
-        self.assertEqual(response.data["message"], "Validation error")
+        self.assertEqual(response.data["message"], "Case number must be unique within firm.")
         self.assertIn("case_number", response.data["errors"])
 
     def test_assigned_lead_other_firm_rejected_wrapped(self):
@@ -141,7 +141,8 @@ class CaseCreateAPITests(TestCase):
         self._auth()
         other_user = User.objects.create_user(username="other2", email="other2@example.com", password="pass1234")
         other_firm = Firm.objects.create(name="Gamma Law", slug="gamma-law", owner=other_user)
-        client_other_firm = Client.objects.create(firm=other_firm, name="Foreign Client")
+        client_user = User.objects.create_user(username="foreign", email="foreign@example.com", password="pass1234")
+        client_other_firm = ClientProfile.objects.create(firm=other_firm, user=client_user, name="Foreign Client")
 
         payload = self._make_payload(client=str(client_other_firm.id))
         response = self.client.post("/api/cases/", payload, format="json")
@@ -0,0 +1,118 @@
+import base64
+import json
+from datetime import date, timedelta
+
+from django.test import TestCase
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from apps.cases.models import Case
+from apps.cases.tests.factories import create_firm
+
+
+class CaseCursorPaginationTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.owner, self.firm = create_firm("cursor")
+        # Duplicate titles and dates so the id tie-breaker is exercised.
+        for i in range(25):
+            Case.objects.create(
+                firm=self.firm,
+                created_by=self.owner,
+                title=f"Matter {i % 7:02d}",
+                open_date=date(2025, 1, 1) + timedelta(days=i % 5),
+            )
+        self.client.force_authenticate(self.owner)
+
+    def _walk(self, sort, page_size=4):
+        ids = []
+        response = self.client.get("/api/v1/cases/", {"pagination": "cursor", "sort": sort, "page_size": page_size})
+        while True:
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            meta = response.data["meta"]
+            self.assertEqual(meta["pagination"], "cursor")
+            self.assertNotIn("count", meta)
+            ids.extend(row["id"] for row in response.data["data"])
+            if not meta["next_cursor"]:
+                return ids, response
+            response = self.client.get(
+                "/api/v1/cases/", {"cursor": meta["next_cursor"], "sort": sort, "page_size": page_size}
+            )
+
+    def test_forward_walk_matches_keyset_order_for_every_sort(self):
+        for sort in ("created_at", "-created_at", "open_date", "-open_date", "title", "-title"):
+            with self.subTest(sort=sort):
+                prefix = "-" if sort.startswith("-") else ""
+                expected = [
+                    str(pk) for pk in Case.objects.order_by(sort, f"{prefix}id").values_list("id", flat=True)
+                ]
+                ids, _ = self._walk(sort)
+                self.assertEqual(ids, expected)
+
+    def test_prev_cursor_returns_previous_page(self):
+        first = self.client.get("/api/v1/cases/", {"pagination": "cursor", "sort": "title", "page_size": 5})
+        self.assertIsNone(first.data["meta"]["prev_cursor"])
+        second = self.client.get(
+            "/api/v1/cases/", {"cursor": first.data["meta"]["next_cursor"], "sort": "title", "page_size": 5}
+        )
+        back = self.client.get(
+            "/api/v1/cases/", {"cursor": second.data["meta"]["prev_cursor"], "sort": "title", "page_size": 5}
+        )
+        self.assertEqual([r["id"] for r in back.data["data"]], [r["id"] for r in first.data["data"]])
+        self.assertIsNone(back.data["meta"]["prev_cursor"])
+        self.assertEqual(back.data["meta"]["next_cursor"], first.data["meta"]["next_cursor"])
+
+    def test_invalid_or_mismatched_cursor_rejected(self):
+        response = self.client.get("/api/v1/cases/", {"cursor": "not-a-cursor"})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+        first = self.client.get("/api/v1/cases/", {"pagination": "cursor", "sort": "title", "page_size": 5})
+        response = self.client.get("/api/v1/cases/", {"cursor": first.data["meta"]["next_cursor"], "sort": "-title"})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_cursor_with_null_or_missing_fields_rejected(self):
+        def encode(payload):
+            return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode().rstrip("=")
+
+        for sort in ("-created_at", "title"):
+            first = self.client.get("/api/v1/cases/", {"pagination": "cursor", "sort": sort, "page_size": 5})
+            issued = first.data["meta"]["next_cursor"]
+            issued = json.loads(base64.urlsafe_b64decode(issued + "=" * (-len(issued) % 4)))
+            for name, payload in (
+                ("null value", {**issued, "v": None}),
+                ("null id", {**issued, "id": None}),
+                ("missing value", {k: v for k, v in issued.items() if k != "v"}),
+                ("missing id", {k: v for k, v in issued.items() if k != "id"}),
+            ):
+                with self.subTest(sort=sort, cursor=name):
+                    response = self.client.get("/api/v1/cases/", {"cursor": encode(payload), "sort": sort})
+                    self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_page_number_mode_unchanged(self):
+        response = self.client.get("/api/v1/cases/", {"page": 2, "page_size": 10})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.data["meta"], {"page": 2, "page_size": 10, "count": 25, "total_pages": 3, "count_exact": True}
+        )
+
+    def test_search_walk_follows_cursor_in_default_order(self):
+        Case.objects.filter(title__in=["Matter 01", "Matter 03"]).update(description="Harbour dispute")
+        for case in Case.objects.filter(description="Harbour dispute"):
+            case.save()
+        expected = [
+            str(pk)
+            for pk in Case.objects.filter(description="Harbour dispute")
+            .order_by("-created_at", "-id")
+            .values_list("id", flat=True)
+        ]
+        ids = []
+        response = self.client.get("/api/v1/cases/", {"search": "harbour", "pagination": "cursor", "page_size": 2})
+        while True:
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            ids.extend(row["id"] for row in response.data["data"])
+            if not response.data["meta"]["next_cursor"]:
+                break
+            response = self.client.get(
+                "/api/v1/cases/", {"search": "harbour", "cursor": response.data["meta"]["next_cursor"], "page_size": 2}
+            )
+        self.assertEqual(ids, expected)
@@ -0,0 +1,65 @@
+import csv
+import io
+import json
+from unittest import mock
+
+from django.test import TestCase
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from apps.cases import export
+from apps.cases.models import Case
+from apps.cases.tests.factories import create_client, create_firm
+
+
+class CaseExportTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.owner, self.firm = create_firm("export")
+        self.profile = create_client(self.firm, "client_export", name="Export, Client")
+        for i in range(12):
+            Case.objects.create(
+                firm=self.firm,
+                created_by=self.owner,
+                client=self.profile if i % 2 else None,
+                title=f"Export {i}",
+                status="CLOSED" if i < 3 else "OPEN",
+                description='Multi-line\n"quoted" – ✓' if i == 5 else None,
+            )
+        other_owner, other_firm = create_firm("other_export", role=None)
+        Case.objects.create(firm=other_firm, created_by=other_owner, title="Foreign export")
+        self.client.force_authenticate(self.owner)
+
+    def _body(self, response):
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        return b"".join(response.streaming_content).decode("utf-8")
+
+    def test_csv_streams_all_matching_cases(self):
+        response = self.client.get("/api/v1/cases/export/", {"status": "open"})
+        self.assertTrue(response["Content-Type"].startswith("text/csv"))
+        self.assertIn("attachment;", response["Content-Disposition"])
+        rows = list(csv.DictReader(io.StringIO(self._body(response))))
+        self.assertEqual(len(rows), 9)
+        self.assertEqual(tuple(rows[0].keys()), export.CSV_COLUMNS)
+        by_title = {row["title"]: row for row in rows}
+        self.assertEqual(by_title["Export 5"]["description"], 'Multi-line\n"quoted" – ✓')
+        self.assertEqual(by_title["Export 5"]["client_name"], "Export, Client")
+        self.assertEqual(by_title["Export 4"]["client_id"], "")
+
+    def test_ndjson_matches_list_representation(self):
+        response = self.client.get("/api/v1/cases/export/", {"export_format": "ndjson", "sort": "title"})
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        exported = [json.loads(line) for line in self._body(response).splitlines()]
+        listed = self.client.get("/api/v1/cases/", {"sort": "title", "page_size": 100}).data["data"]
+        self.assertEqual(exported, json.loads(json.dumps(listed)))
+
+    def test_streams_in_buffered_chunks(self):
+        with mock.patch.object(export, "LINES_PER_WRITE", 5):
+            response = self.client.get("/api/v1/cases/export/", {"export_format": "ndjson"})
+            chunks = list(response.streaming_content)
+        self.assertEqual([chunk.count(b"\n") for chunk in chunks], [5, 5, 2])
+
+    def test_rejects_unknown_format(self):
+        response = self.client.get("/api/v1/cases/export/", {"export_format": "xlsx"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
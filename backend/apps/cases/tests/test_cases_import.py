@@ -0,0 +1,99 @@
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+
+from apps.authx.models import Firm
+from apps.cases.models import Case, ClientProfile
+from core.onboarding import Importer, chunked, read_records
+
+
+User = get_user_model()
+
+
+def _inline_hashes(passwords):
+    return [f"plain${password}" if password else "!" for password in passwords]
+
+
+class TenantImportTests(TestCase):
+    def setUp(self):
+        self.owner = User.objects.create_user(username="taken", email="taken@example.com", password="x")
+        self.firm = Firm.objects.create(name="Existing Firm", slug="existing", owner=self.owner)
+
+    def _import(self, records, chunk_size=100):
+        stream = StringIO("".join(json.dumps(record) + "\n" for record in records))
+        importer = Importer(_inline_hashes, email_verified=True)
+        errors = []
+        with self.captureOnCommitCallbacks(execute=True):
+            for chunk in chunked(read_records(stream, "ndjson"), chunk_size):
+                errors.extend(importer.import_chunk(chunk))
+        return importer, errors
+
+    def test_imports_firms_clients_and_cases(self):
+        records = [
+            {"type": "firm", "ref": "acme", "name": "Acme Law", "owner_email": "Taken@Acme.com", "owner_password": "pw"},
+            {"type": "firm", "name": "Acme, Law", "owner_email": "boss@other.com"},
+            {"type": "client", "firm": "acme", "email": "c1@example.com", "name": "Client One"},
+            {"type": "client", "firm": "existing", "email": "c2@example.com", "name": "Client Two"},
+            {"type": "case", "firm": "acme", "client_email": "c1@example.com", "title": "First case"},
+            {"type": "case", "firm": "acme", "title": "Numbered", "case_number": "OLD-1"},
+            {"type": "case", "firm": "existing", "client_email": "c2@example.com", "title": "Existing firm case"},
+        ]
+        importer, errors = self._import(records, chunk_size=3)
+        self.assertEqual(errors, [])
+        self.assertEqual((importer.totals["firms"], importer.totals["clients"], importer.totals["cases"]), (2, 2, 3))
+
+        acme = Firm.objects.get(name="Acme Law")
+        self.assertEqual(acme.slug, "acme-law")
+        self.assertEqual(Firm.objects.get(name="Acme, Law").slug, "acme-law-1")
+        # "taken" exists, so the owner gets the next free username.
+        self.assertEqual((acme.owner.username, acme.owner.email, acme.owner.password), ("taken1", "taken@acme.com", "plain$pw"))
+        self.assertTrue(acme.owner.profile.email_verified)
+        self.assertFalse(ClientProfile.objects.get(name="Client One").user.has_usable_password())
+
+        first = Case.objects.get(title="First case")
+        self.assertEqual((first.firm_id, first.created_by_id), (acme.id, acme.owner_id))
+        self.assertEqual(first.client.user.email, "c1@example.com")
+        self.assertTrue(first.case_number)
+        self.assertEqual(Case.objects.get(title="Numbered").case_number, "OLD-1")
+        self.assertEqual(Case.objects.get(title="Existing firm case").client.firm_id, self.firm.id)
+
+    def test_reports_failed_records_and_their_dependents(self):
+        records = [
+            {"type": "firm", "ref": "dup", "name": "Dup Firm", "owner_email": "taken@example.com"},
+            {"type": "client", "firm": "dup", "email": "orphan@example.com", "name": "Orphan"},
+            {"type": "client", "firm": "nowhere", "email": "lost@example.com", "name": "Lost"},
+            {"type": "client", "firm": "existing", "email": "ok@example.com", "name": "Ok"},
+            {"type": "client", "firm": "existing", "email": "OK@example.com", "name": "Twice"},
+            {"type": "case", "firm": "existing", "client_email": "ghost@example.com", "title": "Ghost client"},
+            {"type": "case", "firm": "existing", "title": "x"},
+            {"type": "matter", "name": "?"},
+        ]
+        importer, errors = self._import(records)
+        failures = {error["line"]: set(error["errors"]) for error in errors}
+        self.assertEqual(
+            failures,
+            {1: {"owner_email"}, 2: {"firm"}, 3: {"firm"}, 5: {"email"}, 6: {"client_email"}, 7: {"title"}, 8: {"type"}},
+        )
+        self.assertEqual(importer.totals["clients"], 1)
+        self.assertFalse(Firm.objects.filter(name="Dup Firm").exists())
+
+    def test_command_reads_csv_and_writes_error_file(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "tenants.csv")
+            with open(path, "w", newline="") as handle:
+                handle.write("type,ref,name,owner_email,firm,email,title\n")
+                handle.write("firm,csv,CSV Firm,csv@example.com,,,\n")
+                handle.write("case,,,,csv,,Imported from CSV\n")
+                handle.write("case,,,,csv,,x\n")
+            out = StringIO()
+            call_command("import_tenants", path, "--workers", "1", stdout=out)
+            with open(f"{path}.errors.ndjson") as handle:
+                errors = [json.loads(line) for line in handle]
+        self.assertIn("3 records", out.getvalue())
+        self.assertEqual([(error["line"], error["type"]) for error in errors], [(4, "case")])
+        self.assertTrue(Case.objects.filter(firm__slug="csv-firm", title="Imported from CSV").exists())
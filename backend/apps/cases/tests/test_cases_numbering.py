@@ -0,0 +1,80 @@
+from django.db import transaction
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from apps.cases import numbering
+from apps.cases.models import Case, FirmCaseCounter
+from apps.cases.tests.factories import create_firm
+
+
+@override_settings(CASE_NUMBER_LEASE_SIZE=5)
+class CaseNumberAllocatorTests(TestCase):
+    def setUp(self):
+        numbering.reset_leases()
+        self.addCleanup(numbering.reset_leases)
+        self.owner, self.firm = create_firm("numbers", role=None)
+        self.year = timezone.localdate().year
+        self.prefix = f"CIV-{self.year}-"
+
+    def _manual(self, *numbers):
+        for number in numbers:
+            Case.objects.create(
+                firm=self.firm, created_by=self.owner, title="Manual", case_number=f"{self.prefix}{number:03d}"
+            )
+
+    def test_lease_skips_used_numbers_and_serves_from_memory(self):
+        self._manual(1, 2, 4)
+        # Locked counter get_or_create, one set-based probe for the window,
+        # the counter update, plus savepoints.
+        with self.assertNumQueries(8), self.captureOnCommitCallbacks(execute=True):
+            first = numbering.allocate_case_number(self.firm)
+        with self.assertNumQueries(0):
+            second = numbering.allocate_case_number(self.firm)
+        self.assertEqual([first, second], [f"{self.prefix}003", f"{self.prefix}005"])
+        self.assertEqual(FirmCaseCounter.objects.get(firm=self.firm).next_number, 6)
+
+    def test_window_fully_taken_advances_again(self):
+        self._manual(1, 2, 3, 4, 5)
+        self.assertEqual(numbering.allocate_case_number(self.firm), f"{self.prefix}006")
+
+    def test_rolled_back_lease_is_not_reused(self):
+        with transaction.atomic():
+            numbering.allocate_case_number(self.firm)
+            transaction.set_rollback(True)
+        self.assertEqual(FirmCaseCounter.objects.filter(firm=self.firm).count(), 0)
+        self.assertEqual(numbering.allocate_case_number(self.firm), f"{self.prefix}001")
+
+    def test_counter_restarts_each_year(self):
+        FirmCaseCounter.objects.create(firm=self.firm, year=self.year - 1, next_number=77)
+        self.assertEqual(numbering.allocate_case_number(self.firm), f"{self.prefix}001")
+        counter = FirmCaseCounter.objects.get(firm=self.firm)
+        self.assertEqual((counter.year, counter.next_number), (self.year, 6))
+
+    def test_block_reservation_shares_the_counter(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            numbering.allocate_case_number(self.firm)
+        self.assertEqual(numbering.reserve_block(self.firm, 2), [f"{self.prefix}006", f"{self.prefix}007"])
+
+    def test_leased_number_taken_by_hand_is_skipped(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            numbering.allocate_case_number(self.firm)
+        self._manual(2, 3)
+        case = numbering.create_numbered(
+            self.firm,
+            lambda number: Case.objects.create(firm=self.firm, created_by=self.owner, title="Auto", case_number=number),
+        )
+        self.assertEqual(case.case_number, f"{self.prefix}004")
+
+    def test_api_create_after_manual_number_inside_lease(self):
+        self.owner.role = "FIRM_OWNER"
+        client = APIClient()
+        client.force_authenticate(self.owner)
+        with self.captureOnCommitCallbacks(execute=True):
+            first = client.post("/api/v1/cases/", {"title": "Auto"}, format="json")
+        manual = client.post("/api/v1/cases/", {"title": "Manual", "case_number": f"{self.prefix}002"}, format="json")
+        second = client.post("/api/v1/cases/", {"title": "Auto"}, format="json")
+        self.assertEqual([first.status_code, manual.status_code, second.status_code], [status.HTTP_201_CREATED] * 3)
+        self.assertEqual(first.data["data"]["case_number"], f"{self.prefix}001")
+        self.assertEqual(second.data["data"]["case_number"], f"{self.prefix}003")
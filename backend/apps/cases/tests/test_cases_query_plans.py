@@ -0,0 +1,118 @@
+import re
+from contextlib import contextmanager
+
+from django.db import connection, transaction
+from django.test import TestCase
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from apps.cases.models import Case
+from apps.cases.tests.factories import create_client, create_firm
+from apps.cases.views import CaseViewSet
+
+
+SORTS = ("-created_at", "created_at", "open_date", "-open_date", "title", "-title")
+
+FACETS = {
+    "none": {},
+    "status": {"status": "open"},
+    "priority": {"priority": "high"},
+    "case_type": {"case_type": "civil"},
+    "client": {"client": "00000000-0000-4000-8000-000000000001"},
+    "date_range": {"date_from": "2025-01-01", "date_to": "2025-12-31"},
+}
+
+# A range on open_date combined with a different sort key cannot be served by
+# a single B-tree; the planner sorts the (firm, open_date) range instead.
+SORT_ALLOWED = {("date_range", sort) for sort in SORTS if sort.lstrip("-") != "open_date"}
+
+SEQ_SCAN = {
+    "sqlite": re.compile(r"\bSCAN cases_case\b(?! USING)"),
+    "postgresql": re.compile(r"Seq Scan on cases_case\b"),
+}
+FILESORT = {
+    "sqlite": re.compile(r"USE TEMP B-TREE FOR ORDER BY"),
+    "postgresql": re.compile(r"\bSort Key:"),
+}
+
+
+class CaseQueryPlanTests(TestCase):
+    """
+    EXPLAIN every list query shape CaseViewSet can build and fail when the
+    cases table is read with a sequential scan or the page needs a sort.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner, cls.firm = create_firm("plan", role=None)
+        cls.profile = create_client(cls.firm, "plan_client", name="Plan Client")
+        cls.client_user = cls.profile.user
+        for i in range(30):
+            Case.objects.create(
+                firm=cls.firm,
+                created_by=cls.owner,
+                client=cls.profile if i % 3 == 0 else None,
+                title=f"Plan {i}",
+                case_type="Civil",
+                is_deleted=i % 10 == 0,
+            )
+
+    # No ANALYZE on SQLite: statistics from a 30-row fixture would make the
+    # planner favour scans that never happen at production table sizes.
+
+    def setUp(self):
+        if connection.vendor not in SEQ_SCAN:
+            self.skipTest(f"no plan markers for {connection.vendor}")
+        self.factory = APIRequestFactory()
+
+    @contextmanager
+    def _planner(self):
+        # Postgres prefers seq scans on tiny tables; forbid them so the plan
+        # shows whether a usable index exists at all.
+        with transaction.atomic():
+            if connection.vendor == "postgresql":
+                with connection.cursor() as cursor:
+                    cursor.execute("SET LOCAL enable_seqscan = off")
+            yield
+
+    def _view(self, user, role, params):
+        user.role = role
+        request = self.factory.get("/api/v1/cases/", params)
+        force_authenticate(request, user=user)
+        view = CaseViewSet(action_map={"get": "list"}, format_kwarg=None, args=(), kwargs={})
+        view.request = view.initialize_request(request)
+        return view
+
+    def _list_queryset(self, user, role, params, cursor_mode=False):
+        view = self._view(user, role, params)
+        queryset = view.filter_queryset(view.get_queryset())
+        if cursor_mode:
+            sort = queryset.query.order_by[0]
+            prefix = "-" if sort.startswith("-") else ""
+            queryset = queryset.order_by(sort, f"{prefix}id")
+        return queryset[:20]
+
+    def _assert_plan(self, queryset, allow_sort=False):
+        with self._planner():
+            plan = queryset.explain()
+        self.assertIsNone(SEQ_SCAN[connection.vendor].search(plan), plan)
+        if not allow_sort:
+            self.assertIsNone(FILESORT[connection.vendor].search(plan), plan)
+
+    def test_firm_owner_filter_and_sort_combinations(self):
+        for facet, params in FACETS.items():
+            for sort in SORTS:
+                for cursor_mode in (False, True):
+                    with self.subTest(facet=facet, sort=sort, cursor=cursor_mode):
+                        qs = self._list_queryset(self.owner, "FIRM_OWNER", dict(params, sort=sort), cursor_mode)
+                        self._assert_plan(qs, allow_sort=(facet, sort) in SORT_ALLOWED)
+
+    def test_assigned_lead_facet(self):
+        for sort in ("-created_at", "created_at"):
+            with self.subTest(sort=sort):
+                params = {"sort": sort, "assigned_lead": self.owner.id}
+                self._assert_plan(self._list_queryset(self.owner, "FIRM_OWNER", params))
+
+    def test_client_scoped_list(self):
+        for sort in ("-created_at", "created_at"):
+            with self.subTest(sort=sort):
+                self._assert_plan(self._list_queryset(self.client_user, "CLIENT", {"sort": sort}))
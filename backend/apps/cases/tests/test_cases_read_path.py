@@ -0,0 +1,79 @@
+from datetime import date
+
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from apps.cases.models import Case, CaseStatus
+from apps.cases.readers import case_rows
+from apps.cases.serializers import CaseSerializer
+from apps.cases.tests.factories import create_client, create_firm, create_user
+
+
+class CaseReadPathTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.owner, self.firm = create_firm("read")
+        self.profile = create_client(self.firm, "client_read", name="Read Client")
+        Case.objects.create(firm=self.firm, created_by=self.owner, title="Bare minimum")
+        Case.objects.create(
+            firm=self.firm,
+            created_by=self.owner,
+            client=self.profile,
+            assigned_lead=self.owner,
+            title="Fully populated",
+            case_type="Civil",
+            case_number="CIV-2026-001",
+            status=CaseStatus.CLOSED,
+            priority="URGENT",
+            description="Long description with unicode – ✓",
+            court_name="Central Court",
+            judge_name="Judge Judy",
+            open_date=date(2024, 2, 29),
+            close_date=date(2025, 1, 1),
+            close_reason="Settled",
+            deleted_at=timezone.now(),
+        )
+        self.client.force_authenticate(self.owner)
+
+    def _serializer_bytes(self, queryset):
+        instances = list(queryset.select_related("client", "assigned_lead", "firm"))
+        return JSONRenderer().render(CaseSerializer(instances, many=True).data)
+
+    def test_mapper_output_is_byte_identical_to_serializer(self):
+        queryset = Case.objects.order_by("-created_at")
+        expected = self._serializer_bytes(queryset)
+        actual = JSONRenderer().render(case_rows.to_representation_many(case_rows.project(queryset)))
+        self.assertEqual(actual, expected)
+
+    def test_list_and_retrieve_match_serializer(self):
+        response = self.client.get("/api/v1/cases/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            JSONRenderer().render(response.data["data"]),
+            self._serializer_bytes(Case.objects.order_by("-created_at")),
+        )
+
+        case = Case.objects.get(title="Fully populated")
+        response = self.client.get(f"/api/v1/cases/{case.id}/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            JSONRenderer().render([response.data["data"]]),
+            self._serializer_bytes(Case.objects.filter(pk=case.pk)),
+        )
+
+    def test_retrieve_keeps_object_permissions(self):
+        other = create_user("other_read", role="CLIENT")
+        self.client.force_authenticate(other)
+        case = Case.objects.get(title="Fully populated")
+        response = self.client.get(f"/api/v1/cases/{case.id}/")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+        self.client.force_authenticate(self.profile.user)
+        self.profile.user.role = "CLIENT"
+        response = self.client.get(f"/api/v1/cases/{case.id}/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        response = self.client.get("/api/v1/cases/not-a-uuid/")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
@@ -0,0 +1,62 @@
+from django.test import TestCase
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from apps.cases.models import Case
+from apps.cases.tests.factories import create_firm
+
+
+class CaseSearchTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.owner, self.firm = create_firm("search")
+        _, self.other_firm = create_firm("other_search", role=None)
+        self.client.force_authenticate(self.owner)
+
+    def _case(self, firm=None, **fields):
+        fields.setdefault("title", "Untitled matter")
+        return Case.objects.create(firm=firm or self.firm, created_by=self.owner, **fields)
+
+    def _search(self, term, **params):
+        response = self.client.get("/api/v1/cases/", dict(params, search=term))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [row["id"] for row in response.data["data"]]
+
+    def test_matches_all_indexed_fields_and_ranks_title_first(self):
+        in_description = self._case(title="Lease review", description="Dispute with Harrington estate")
+        in_title = self._case(title="Harrington v. Cole")
+        in_judge = self._case(title="Appeal", judge_name="Judge Harrington")
+        in_court = self._case(title="Filing", court_name="Harrington County Court")
+        self._case(title="Unrelated")
+
+        ids = self._search("harring")
+
+        self.assertEqual(ids[0], str(in_title.id))
+        self.assertEqual(set(ids), {str(c.id) for c in (in_description, in_title, in_judge, in_court)})
+
+    def test_case_number_tokens_and_all_terms_required(self):
+        target = self._case(title="Acme merger", case_number="CIV-2026-014")
+        self._case(title="Acme lease", case_number="CIV-2025-003")
+
+        self.assertEqual(self._search("2026-01"), [str(target.id)])
+        self.assertEqual(self._search("acme 2026"), [str(target.id)])
+        self.assertEqual(self._search("!!!"), [])
+
+    def test_index_follows_update_and_soft_delete_and_tenant_scope(self):
+        case = self._case(title="Original heading")
+        self._case(firm=self.other_firm, title="Original heading elsewhere")
+        self.assertEqual(self._search("original"), [str(case.id)])
+
+        response = self.client.patch(f"/api/v1/cases/{case.id}/", {"title": "Renamed heading"}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self._search("original"), [])
+        self.assertEqual(self._search("renamed"), [str(case.id)])
+
+        self.client.delete(f"/api/v1/cases/{case.id}/")
+        self.assertEqual(self._search("renamed"), [])
+
+    def test_explicit_sort_overrides_relevance(self):
+        first = self._case(title="Beta contract")
+        second = self._case(title="Alpha contract review contract")
+        ids = self._search("contract", sort="title")
+        self.assertEqual(ids, [str(second.id), str(first.id)])
@@ -0,0 +1,81 @@
+from asgiref.sync import iscoroutinefunction
+from django.db import connection
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from apps.authx.services import build_tokens
+from apps.cases.models import Case
+from apps.cases.tests.factories import create_firm
+from common.middleware import QueryRecorder, SQLInstrumentationMiddleware, fingerprint
+
+
+@override_settings(SQL_INSTRUMENTATION_SAMPLE_RATE=1.0, SQL_QUERY_BUDGETS={"default": 20, "case-list": 1})
+class SQLInstrumentationTests(TestCase):
+    def setUp(self):
+        owner, self.firm = create_firm("sql")
+        Case.objects.create(firm=self.firm, created_by=owner, title="Instrumented")
+        with self.captureOnCommitCallbacks(execute=True):
+            self.access, _ = build_tokens(owner)
+        # Created after override_settings applies, so the middleware is loaded.
+        self.client = APIClient()
+        self.client.force_authenticate(owner)
+
+    def test_server_timing_and_over_budget_warning(self):
+        with self.assertLogs("common.middleware", level="INFO") as logs:
+            response = self.client.get("/api/v1/cases/")
+        self.assertEqual(response.status_code, 200)
+        self.assertRegex(response["Server-Timing"], r'^db;dur=[\d.]+;desc="\d+ queries", app;dur=[\d.]+$')
+        [record] = logs.records
+        self.assertEqual(record.levelname, "WARNING")
+        self.assertEqual(record.sql["view"], "case-list")
+        self.assertTrue(record.sql["over_budget"])
+        self.assertGreater(record.sql["queries"], 1)
+
+    async def test_async_chain_is_instrumented_without_sync_adapter(self):
+        async def get_response(request):
+            return None
+
+        self.assertTrue(iscoroutinefunction(SQLInstrumentationMiddleware(get_response)))
+        response = await self.async_client.get("/api/v1/cases/", headers={"Authorization": f"Bearer {self.access}"})
+        self.assertEqual(response.status_code, 200)
+        self.assertRegex(response["Server-Timing"], r'desc="[1-9]\d* queries"')
+
+    def test_streamed_export_queries_are_counted(self):
+        with self.assertLogs("common.middleware", level="INFO") as logs:
+            response = self.client.get("/api/v1/cases/export/")
+            self.assertEqual(logs.records, [])
+            body = b"".join(response.streaming_content)
+        self.assertIn(b"Instrumented", body)
+        self.assertFalse(response.has_header("Server-Timing"))
+        [record] = logs.records
+        self.assertEqual(record.sql["view"], "case-export")
+        # The SELECT that runs while the body streams.
+        self.assertEqual(record.sql["queries"], 1)
+
+    def test_repeated_shapes_are_reported(self):
+        recorder = QueryRecorder()
+        with connection.execute_wrapper(recorder):
+            for case in Case.objects.all():
+                # One query per row: the N+1 shape.
+                for n in range(3):
+                    list(Case.objects.filter(pk=case.pk, title__startswith=str(n)))
+        [(shape, count)] = recorder.repeated(3)
+        self.assertEqual(count, 3)
+        self.assertIn("LIKE", shape)
+        self.assertEqual(recorder.count, 4)
+
+    @override_settings(SQL_INSTRUMENTATION_SAMPLE_RATE=0.0)
+    def test_off_by_default(self):
+        response = APIClient().get("/api/v1/cases/")
+        self.assertFalse(response.has_header("Server-Timing"))
+
+    def test_fingerprint_folds_literals_and_lists(self):
+        self.assertEqual(
+            fingerprint("SELECT * FROM t WHERE id IN (%s, %s, %s) AND name = 'x'  LIMIT 21"),
+            "SELECT * FROM t WHERE id IN (...) AND name = ? LIMIT ?",
+        )
+        self.assertEqual(fingerprint("SELECT * FROM t WHERE id IN (%s) LIMIT 5"), "SELECT * FROM t WHERE id IN (...) LIMIT ?")
+        self.assertEqual(
+            fingerprint('INSERT INTO "t" ("a", "b") VALUES (%s, %s), (%s, %s)'),
+            'INSERT INTO "t" ("a", "b") VALUES (...)',
+        )
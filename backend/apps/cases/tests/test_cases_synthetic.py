@@ -0,0 +1,66 @@
+from datetime import date
+from io import StringIO
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import transaction
+from django.test import TestCase
+
+from apps.cases.models import Case, ClientProfile, FirmCaseCounter
+from core.synthetic import plan, zipf_split
+
+
+TODAY = date(2026, 6, 30)
+
+
+def _generate(seed, batch_size, **sizes):
+    firms = plan(seed, sizes.get("firms", 3), sizes.get("cases", 300), 0.2, 0.05, today=TODAY)
+    for firm in firms:
+        list(firm.run(batch_size))
+    return firms
+
+
+def _snapshot():
+    return sorted(
+        Case.objects.values_list(
+            "id", "firm__slug", "client_id", "title", "case_number", "status", "priority", "case_type",
+            "open_date", "close_date", "created_at", "is_deleted",
+        )
+    )
+
+
+class SyntheticDataTests(TestCase):
+    def test_same_seed_gives_same_rows_whatever_the_batch_size(self):
+        with transaction.atomic():
+            _generate(7, batch_size=1000)
+            first = _snapshot()
+            transaction.set_rollback(True)
+        _generate(7, batch_size=64)
+        self.assertEqual(_snapshot(), first)
+        self.assertNotEqual(first, [])
+
+    def test_distributions_are_skewed(self):
+        firms = _generate(3, batch_size=500, firms=4, cases=2000)
+        sizes = [firm.cases for firm in firms]
+        self.assertEqual(sum(sizes), 2000)
+        self.assertEqual(sizes, sorted(sizes, reverse=True))
+        self.assertGreater(sizes[0], 2 * sizes[-1])
+        self.assertEqual(Case.objects.count(), 2000)
+        self.assertTrue(0 < Case.objects.filter(is_deleted=True).count() < 300)
+        self.assertEqual(ClientProfile.objects.count(), sum(firm.clients for firm in firms))
+        closed = Case.objects.filter(status="CLOSED")
+        self.assertFalse(closed.filter(close_date__isnull=True).exists())
+        self.assertFalse(Case.objects.filter(open_date__gt=TODAY).exists())
+        # Case numbers come from each firm's counter, so later creates continue after them.
+        counter = FirmCaseCounter.objects.get(firm__slug="seed-3-0")
+        self.assertEqual(counter.next_number, sizes[0] + 1)
+
+    def test_zipf_split_keeps_total(self):
+        self.assertEqual(sum(zipf_split(1001, 7, 1.1)), 1001)
+        self.assertEqual(zipf_split(5, 1, 1.1), [5])
+
+    def test_command_refuses_a_seed_twice(self):
+        call_command("seed_synthetic", "--seed", "9", "--firms", "2", "--cases", "40", stdout=StringIO())
+        self.assertEqual(Case.objects.filter(firm__slug__startswith="seed-9-").count(), 40)
+        with self.assertRaises(CommandError):
+            call_command("seed_synthetic", "--seed", "9", "--firms", "2", "--cases", "40", stdout=StringIO())
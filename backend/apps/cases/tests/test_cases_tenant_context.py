@@ -0,0 +1,71 @@
+from dataclasses import FrozenInstanceError
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from apps.cases import counts
+from apps.cases.models import Case
+from apps.cases.tests.factories import create_client, create_firm, create_user
+from common import tenant
+
+
+User = get_user_model()
+
+
+class CaseTenantContextTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        # No role and no firm_id attribute: the firm must be looked up once.
+        owner, self.firm = create_firm("tenant", role=None)
+        self.owner = User.objects.get(pk=owner.pk)
+        self.profile = create_client(self.firm, "client_tenant", name="Tenant Client")
+        self.client_user = User.objects.get(pk=self.profile.user_id)
+        self.client_user.role = "CLIENT"
+        self.case = Case.objects.create(firm=self.firm, created_by=self.owner, client=self.profile, title="Scoped")
+        counts.recompute(self.firm.id)
+
+    def test_owner_list_and_retrieve_query_counts(self):
+        self.client.force_authenticate(self.owner)
+        # Firm lookup, data version, stored count, page.
+        with self.assertNumQueries(4):
+            response = self.client.get("/api/v1/cases/")
+        self.assertEqual(response.data["meta"]["count"], 1)
+        # Firm lookup, data version, row.
+        with self.assertNumQueries(3):
+            response = self.client.get(f"/api/v1/cases/{self.case.id}/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_client_list_query_count(self):
+        self.client.force_authenticate(self.client_user)
+        # Data version, bounded count, page; no owned_firm probes.
+        with self.assertNumQueries(3):
+            response = self.client.get("/api/v1/cases/")
+        self.assertEqual(len(response.data["data"]), 1)
+
+    def test_tenant_resolved_once_per_request(self):
+        self.client.force_authenticate(self.owner)
+        with mock.patch.object(tenant, "resolve_tenant", wraps=tenant.resolve_tenant) as resolve:
+            response = self.client.post("/api/v1/cases/", {"title": "Created once"}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(resolve.call_count, 1)
+
+    def test_context_fields(self):
+        owner = tenant.resolve_tenant(self.owner)
+        self.assertEqual((owner.role, owner.firm_id, owner.firm), ("FIRM_OWNER", self.firm.id, self.firm))
+        client = tenant.resolve_tenant(self.client_user)
+        self.assertEqual((client.role, client.firm_id), ("CLIENT", None))
+        self.assertEqual(client.client_profile_id, self.profile.id)
+        self.assertEqual(client.firm, self.firm)
+        with self.assertRaises(FrozenInstanceError):
+            owner.role = "CLIENT"
+
+    def test_other_roles_own_the_firm_they_own(self):
+        self.owner.role = "FIRM_ADMIN"
+        owner = tenant.resolve_tenant(self.owner)
+        self.assertEqual((owner.role, owner.firm_id), ("FIRM_OWNER", self.firm.id))
+        intern = create_user("intern_tenant", role="INTERN")
+        intern.firm_id = self.firm.id
+        self.assertFalse(tenant.resolve_tenant(intern).is_firm_owner)
@@ -4,6 +4,9 @@ from rest_framework import status as drf_status
 from rest_framework.response import Response
 
 from apps.authx.models import Firm
+from common.tenant import resolve_tenant
+
+from .models import ClientProfile
 
 logger = logging.getLogger(__name__)
 
@@ -26,15 +29,9 @@ def get_user_firm(user: Any) -> Optional[Firm]:
     """
     if not user:
         return None
-    if getattr(user, "firm", None) is not None:
-        return getattr(user, "firm")
-    firm_id = getattr(user, "firm_id", None)
-    if firm_id:
-        try:
-            return Firm.objects.get(id=firm_id)
-        except Firm.DoesNotExist:
-            return None
-    owned = getattr(user, "owned_firm", None)
-    if owned:
-        return owned
-    return None
+    return resolve_tenant(user).firm
+
+
+def client_profile_of(user_id: Any) -> Optional[tuple]:
+    """(client profile id, firm id) of a client user; the TenantContext.client_profile lookup."""
+    return ClientProfile.objects.filter(user_id=user_id).values_list("id", "firm_id").first()
@@ -0,0 +1,75 @@
+from django.db import IntegrityError, transaction
+from django.db.models import F, Max, Sum
+from django.utils import timezone
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from django.utils.crypto import salted_hmac
+from django.utils.http import http_date, parse_etags
+
+from .models import FirmDataVersion
+
+
+def bump(*firm_ids):
+    """Advance the version of each firm; call inside the writing transaction."""
+    now = timezone.now()
+    for firm_id in sorted({firm_id for firm_id in firm_ids if firm_id is not None}):
+        rows = FirmDataVersion.objects.filter(firm_id=firm_id)
+        if rows.update(version=F("version") + 1, updated_at=now):
+            continue
+        try:
+            with transaction.atomic():
+                FirmDataVersion.objects.create(firm_id=firm_id, version=1, updated_at=now)
+        except IntegrityError:
+            # A concurrent writer created the row first.
+            rows.update(version=F("version") + 1, updated_at=now)
+
+
+def snapshot(queryset):
+    """
+    (version, last_modified) summed over the FirmDataVersion rows of
+    `queryset`. Firms that were never written report version 0.
+    """
+    result = queryset.aggregate(version=Sum("version"), last_modified=Max("updated_at"))
+    return result["version"] or 0, result["last_modified"]
+
+
+def for_firm(firm_id):
+    return snapshot(FirmDataVersion.objects.filter(firm_id=firm_id))
+
+
+def for_client_user(user_id):
+    return snapshot(FirmDataVersion.objects.filter(firm__client_profiles__user_id=user_id))
+
+
+def for_all_firms():
+    return snapshot(FirmDataVersion.objects.all())
+
+
+def make_etag(version, request, scope):
+    """
+    Weak ETag over the data version, the caller and the full request path.
+    Keyed with SECRET_KEY so clients cannot forge a tag for data they never saw.
+    """
+    payload = f"{scope}|{request.user.pk}|{version}|{request.get_full_path()}"
+    return 'W/"%s"' % salted_hmac("cases.etag", payload).hexdigest()[:32]
+
+
+def not_modified(request, etag):
+    """True when the request's If-None-Match already holds `etag`."""
+    header = request.META.get("HTTP_IF_NONE_MATCH")
+    if not header:
+        return False
+    tags = parse_etags(header)
+    if "*" in tags:
+        return True
+    plain = etag.removeprefix("W/")
+    return any(tag.removeprefix("W/") == plain for tag in tags)
+
+
+def apply_headers(response, etag, last_modified):
+    response["ETag"] = etag
+    if last_modified is not None:
+        response["Last-Modified"] = http_date(last_modified.timestamp())
+    # Revalidate on every use; responses differ per authenticated user.
+    patch_cache_control(response, private=True, no_cache=True)
+    patch_vary_headers(response, ("Authorization",))
+    return response
@@ -1,24 +1,29 @@
 import logging
+from django.contrib.auth import get_user_model
 from django.utils import timezone
-from django.db import IntegrityError
+from django.db import IntegrityError, transaction
+from django.http import HttpResponseNotModified
 from rest_framework import status, mixins, viewsets
-from rest_framework.pagination import PageNumberPagination
-from rest_framework.exceptions import PermissionDenied, NotFound, NotAuthenticated
+from rest_framework.decorators import action
+from rest_framework.exceptions import PermissionDenied, NotFound, NotAuthenticated, ValidationError
+from rest_framework.generics import get_object_or_404
 
+from common.tenant import get_tenant_context
 from core.responses import api_success, api_error
+from . import bulk as case_bulk
+from . import counts as case_counts
+from . import export as case_export
+from . import versioning
 from .models import Case
-from .serializers import CaseSerializer
+from .serializers import CaseBulkSelectionSerializer, CaseBulkUpdateSerializer, CaseSerializer
 from .permissions import CasePermission
 from .filters import CaseFilter, CaseOrderingFilter
+from .pagination import CasePagination, CaseCursorPagination
+from .readers import case_rows
 from django_filters.rest_framework import DjangoFilterBackend
 
 logger = logging.getLogger(__name__)
-
-
-class CasePagination(PageNumberPagination):
-    page_size = 20
-    page_size_query_param = "page_size"
-    max_page_size = 100
+User = get_user_model()
 
 
 class CaseViewSet(
@@ -35,47 +40,96 @@ class CaseViewSet(
     filterset_class = CaseFilter
     filter_backends = [DjangoFilterBackend, CaseOrderingFilter]
 
+    @property
+    def paginator(self):
+        if not hasattr(self, "_paginator"):
+            if self.action == "list" and CaseCursorPagination.is_requested(self.request):
+                self._paginator = CaseCursorPagination()
+            else:
+                self._paginator = self.pagination_class()
+        return self._paginator
+
+    @property
+    def tenant(self):
+        return get_tenant_context(self.request)
+
+    def get_scoped_firm_id(self):
+        """Firm id when the queryset is exactly one firm's live cases, else None."""
+        tenant = self.tenant
+        return tenant.firm_id if tenant.is_firm_owner else None
+
     def get_queryset(self):
         qs = Case.objects.select_related("client", "assigned_lead", "firm").filter(is_deleted=False)
-        user = self.request.user
-        role = (getattr(user, "role", "") or "").upper()
-        if role == "SUPER_ADMIN":
+        tenant = self.tenant
+        if tenant.is_super_admin:
             return qs.order_by("-created_at")
-        if role == "FIRM_OWNER" or role == "OWNER" or (not role and hasattr(user, "owned_firm")):
-            firm_id = getattr(user, "firm_id", None)
-            if not firm_id and hasattr(user, "owned_firm"):
-                firm_id = getattr(user.owned_firm, "id", None)
-            return qs.filter(firm_id=firm_id).order_by("-created_at")
-        if role == "CLIENT":
-            return qs.filter(client__user=user).order_by("-created_at")
+        if tenant.is_firm_owner:
+            return qs.filter(firm_id=tenant.firm_id).order_by("-created_at")
+        if tenant.is_client:
+            return qs.filter(client__user_id=tenant.user_id).order_by("-created_at")
         return qs.none()
 
+    def get_list_count(self, queryset):
+        params = self.request.query_params
+        active = {name: params[name] for name in self.filterset_class.base_filters if params.get(name)}
+        return case_counts.resolve(queryset, self.get_scoped_firm_id(), active)
+
+    def get_data_version(self):
+        """(scope, version, last_modified) of the data this user can read, or None."""
+        tenant = self.tenant
+        if tenant.is_super_admin:
+            return ("all", *versioning.for_all_firms())
+        if tenant.is_firm_owner and tenant.firm_id:
+            return (f"firm:{tenant.firm_id}", *versioning.for_firm(tenant.firm_id))
+        if tenant.is_client:
+            return ("client", *versioning.for_client_user(tenant.user_id))
+        return None
+
+    def conditional(self, request, handler):
+        """Run `handler` unless If-None-Match matches the current ETag; tag the response."""
+        state = self.get_data_version()
+        if state is None:
+            return handler()
+        scope, version, last_modified = state
+        etag = versioning.make_etag(version, request, scope)
+        if versioning.not_modified(request, etag):
+            response = HttpResponseNotModified()
+        else:
+            response = handler()
+            if response.status_code != status.HTTP_200_OK:
+                return response
+        return versioning.apply_headers(response, etag, last_modified)
+
+    # Reads go through case_rows (values() projection + row mapper); its output
+    # is identical to CaseSerializer, which stays in use for writes.
     def list(self, request, *args, **kwargs):
-        queryset = self.filter_queryset(self.get_queryset())
+        return self.conditional(request, lambda: self._list(request))
+
+    def _list(self, request):
+        queryset = case_rows.project(self.filter_queryset(self.get_queryset()))
         page = self.paginate_queryset(queryset)
         if page is not None:
-            serializer = self.get_serializer(page, many=True)
-            meta = {
-                "page": self.paginator.page.number,
-                "page_size": self.paginator.get_page_size(request),
-                "count": self.paginator.page.paginator.count,
-                "total_pages": self.paginator.page.paginator.num_pages,
-            }
-            return api_success(message="Cases retrieved", data=serializer.data, meta=meta)
-
-        serializer = self.get_serializer(queryset, many=True)
+            data = case_rows.to_representation_many(page)
+            meta = self.paginator.get_meta(request)
+            return api_success(message="Cases retrieved", data=data, meta=meta)
+
+        data = case_rows.to_representation_many(queryset)
         meta = {
             "page": 1,
-            "page_size": len(serializer.data),
-            "count": len(serializer.data),
+            "page_size": len(data),
+            "count": len(data),
             "total_pages": 1,
         }
-        return api_success(message="Cases retrieved", data=serializer.data, meta=meta)
+        return api_success(message="Cases retrieved", data=data, meta=meta)
 
     def retrieve(self, request, *args, **kwargs):
-        instance = self.get_object()
-        serializer = self.get_serializer(instance)
-        return api_success(message="Case retrieved", data=serializer.data)
+        return self.conditional(request, lambda: self._retrieve(request))
+
+    def _retrieve(self, request):
+        queryset = case_rows.project(self.get_queryset())
+        row = get_object_or_404(queryset, pk=self.kwargs[self.lookup_url_kwarg or self.lookup_field])
+        self.check_object_permissions(request, case_rows.permission_target(row))
+        return api_success(message="Case retrieved", data=case_rows.to_representation(row))
 
     def create(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data, context={"request": request})
@@ -90,7 +144,9 @@ class CaseViewSet(
         return api_success("Case created successfully", data=serializer.data, status_code=status.HTTP_201_CREATED)
 
     def perform_create(self, serializer):
-        serializer.save()
+        with transaction.atomic():
+            serializer.save()
+            case_counts.record_created(serializer.instance)
 
     def update(self, request, *args, **kwargs):
         partial = kwargs.pop('partial', False)
@@ -99,7 +155,10 @@ class CaseViewSet(
         if not serializer.is_valid():
             return api_error("Validation error", errors=serializer.errors, status_code=status.HTTP_400_BAD_REQUEST)
         try:
-            self.perform_update(serializer)
+            with transaction.atomic():
+                old_status, old_priority = instance.status, instance.priority
+                self.perform_update(serializer)
+                case_counts.record_changed(serializer.instance, old_status, old_priority)
         except IntegrityError as exc:
             logger.warning("case update integrity error: %s", exc)
             return api_error("Case number must be unique within firm.", errors={"case_number": ["Already exists"]}, status_code=status.HTTP_409_CONFLICT)
@@ -109,9 +168,99 @@ class CaseViewSet(
         instance = self.get_object()
         instance.is_deleted = True
         instance.deleted_at = timezone.now()
-        instance.save(update_fields=["is_deleted", "deleted_at", "updated_at"])
+        with transaction.atomic():
+            instance.save(update_fields=["is_deleted", "deleted_at", "updated_at"])
+            case_counts.record_deleted(instance)
         return api_success("Case deleted", data=None, status_code=status.HTTP_204_NO_CONTENT)
 
+    @action(detail=False, methods=["post"], url_path="bulk")
+    def bulk(self, request, *args, **kwargs):
+        items = request.data.get("items") if isinstance(request.data, dict) else request.data
+        if not isinstance(items, list) or not items:
+            return api_error("Validation error", errors={"items": ["Provide a non-empty list of cases."]})
+        if len(items) > case_bulk.MAX_BULK_ITEMS:
+            return api_error(
+                "Validation error",
+                errors={"items": [f"At most {case_bulk.MAX_BULK_ITEMS} cases per request."]},
+            )
+        try:
+            results, created = case_bulk.create_cases(items, request)
+        except ValidationError as exc:
+            return api_error("Validation error", errors=exc.detail, status_code=status.HTTP_400_BAD_REQUEST)
+        except IntegrityError as exc:
+            logger.warning("case bulk create integrity error: %s", exc)
+            return api_error("Case number must be unique within firm.", errors={"case_number": ["Already exists"]}, status_code=status.HTTP_409_CONFLICT)
+        if not created:
+            return api_error("Validation error", errors={"items": results}, status_code=status.HTTP_400_BAD_REQUEST)
+        failed = len(items) - created
+        meta = {"total": len(items), "created": created, "failed": failed}
+        if failed:
+            return api_success("Cases partially created", data=results, meta=meta)
+        return api_success("Cases created successfully", data=results, meta=meta, status_code=status.HTTP_201_CREATED)
+
+    @action(detail=False, methods=["get"], url_path="export")
+    def export(self, request, *args, **kwargs):
+        # `format` is DRF's format-suffix parameter, hence `export_format`.
+        export_format = (request.query_params.get("export_format") or "csv").lower()
+        if export_format not in case_export.FORMATS:
+            return api_error(
+                "Validation error",
+                errors={"export_format": [f"Choose one of: {', '.join(case_export.FORMATS)}."]},
+            )
+        return case_export.stream_export(self.filter_queryset(self.get_queryset()), export_format)
+
+    def get_bulk_queryset(self, selection):
+        """Live cases this user may write, narrowed to the requested ids or filter."""
+        queryset = self.get_queryset()
+        if selection.get("ids"):
+            queryset = queryset.filter(id__in=selection["ids"])
+        if selection.get("filter"):
+            filterset = self.filterset_class(data=selection["filter"], queryset=queryset, request=self.request)
+            if not filterset.is_valid():
+                raise ValidationError({"filter": filterset.errors})
+            queryset = filterset.qs
+        return queryset
+
+    @bulk.mapping.patch
+    def bulk_update(self, request, *args, **kwargs):
+        serializer = CaseBulkUpdateSerializer(data=request.data)
+        if not serializer.is_valid():
+            return api_error("Validation error", errors=serializer.errors, status_code=status.HTTP_400_BAD_REQUEST)
+        changes = {
+            field: serializer.validated_data[field]
+            for field in ("status", "priority", "assigned_lead")
+            if field in serializer.validated_data
+        }
+        try:
+            queryset = self.get_bulk_queryset(serializer.validated_data)
+            if changes.get("assigned_lead") is not None:
+                changes["assigned_lead"] = self._bulk_assigned_lead(changes["assigned_lead"])
+        except ValidationError as exc:
+            return api_error("Validation error", errors=exc.detail, status_code=status.HTTP_400_BAD_REQUEST)
+        updated = case_bulk.update_cases(queryset, changes)
+        return api_success("Cases updated successfully", data={"updated": updated})
+
+    @bulk.mapping.delete
+    def bulk_destroy(self, request, *args, **kwargs):
+        serializer = CaseBulkSelectionSerializer(data=request.data)
+        if not serializer.is_valid():
+            return api_error("Validation error", errors=serializer.errors, status_code=status.HTTP_400_BAD_REQUEST)
+        try:
+            queryset = self.get_bulk_queryset(serializer.validated_data)
+        except ValidationError as exc:
+            return api_error("Validation error", errors=exc.detail, status_code=status.HTTP_400_BAD_REQUEST)
+        deleted = case_bulk.soft_delete_cases(queryset)
+        return api_success("Cases deleted", data={"deleted": deleted})
+
+    def _bulk_assigned_lead(self, lead_id):
+        checker = CaseSerializer(context={"request": self.request})
+        lead = User.objects.filter(pk=lead_id).first()
+        if lead is None:
+            raise ValidationError({"assigned_lead": "Assigned lead not found"})
+        if not self.tenant.is_super_admin:
+            checker._check_assigned_lead(checker._get_target_firm(), lead)
+        return lead
+
     def handle_exception(self, exc):
         if isinstance(exc, PermissionDenied):
             return api_error("Forbidden", status_code=status.HTTP_403_FORBIDDEN)
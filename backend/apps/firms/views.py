@@ -2,6 +2,7 @@ from rest_framework import generics
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.exceptions import NotFound
 from rest_framework.response import Response
+from rest_framework_simplejwt.authentication import JWTAuthentication
 
 from common.api_response import api_success
 
@@ -12,6 +13,8 @@ from .serializers import FirmMeSerializer
 class FirmMeView(generics.RetrieveUpdateAPIView):
     serializer_class = FirmMeSerializer
     permission_classes = [IsAuthenticated]
+    # Needs the User row: reads and updates owner names, may create a firm.
+    authentication_classes = [JWTAuthentication]
 
     def get_serializer_context(self):
         context = super().get_serializer_context()
@@ -1,17 +1,36 @@
+from django.http import JsonResponse
 from rest_framework.response import Response
 
 
-def api_success(data=None, status=200, meta=None):
+def _success_payload(data, meta):
     payload = {"data": data}
     if meta is not None:
         payload["meta"] = meta
-    return Response(payload, status=status)
+    return payload
 
 
-def api_error(message, status=400, code=None, details=None):
+def _error_payload(message, code, details):
     error = {"message": message}
     if code:
         error["code"] = code
     if details is not None:
         error["details"] = details
-    return Response({"error": error}, status=status)
+    return {"error": error}
+
+
+def api_success(data=None, status=200, meta=None):
+    return Response(_success_payload(data, meta), status=status)
+
+
+def api_error(message, status=400, code=None, details=None):
+    return Response(_error_payload(message, code, details), status=status)
+
+
+def json_success(data=None, status=200, meta=None):
+    """`api_success` as a plain Django response, for views outside DRF."""
+    return JsonResponse(_success_payload(data, meta), status=status)
+
+
+def json_error(message, status=400, code=None, details=None):
+    """`api_error` as a plain Django response, for views outside DRF."""
+    return JsonResponse(_error_payload(message, code, details), status=status)
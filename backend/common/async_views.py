@@ -0,0 +1,88 @@
+import json
+import logging
+
+from asgiref.sync import sync_to_async
+from django.http import JsonResponse
+from django.views import View
+from rest_framework import exceptions
+
+from .exception_handler import custom_exception_handler
+
+logger = logging.getLogger(__name__)
+
+FORM_CONTENT_TYPES = ("application/x-www-form-urlencoded", "multipart/form-data")
+# Headers DRF's exception handler sets on its responses.
+ERROR_HEADERS = ("WWW-Authenticate", "Retry-After")
+
+
+class AsyncAPIView(View):
+    authentication_classes = []
+    authentication_required = False
+    throttle_classes = []
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        # Token authenticated like the DRF views, so no CSRF check (see APIView.as_view).
+        view = super().as_view(**initkwargs)
+        view.csrf_exempt = True
+        return view
+
+    async def dispatch(self, request, *args, **kwargs):
+        try:
+            await self.perform_authentication(request)
+            await self.check_throttles(request)
+            return await super().dispatch(request, *args, **kwargs)
+        except Exception as exc:
+            return self.handle_exception(request, exc)
+
+    async def perform_authentication(self, request):
+        request.auth = None
+        for authentication_class in self.authentication_classes:
+            result = await authentication_class().aauthenticate(request)
+            if result is not None:
+                request.user, request.auth = result
+                return
+        if self.authentication_required:
+            raise exceptions.NotAuthenticated()
+
+    async def check_throttles(self, request):
+        if not self.throttle_classes:
+            return
+        # Throttles read the body (request.data) like on a DRF request, and use the sync cache API.
+        request.data = self.parse(request)
+        throttles = [throttle() for throttle in self.throttle_classes]
+        waits = await sync_to_async(self._throttle_waits)(request, throttles)
+        if waits:
+            raise exceptions.Throttled(max((wait for wait in waits if wait is not None), default=None))
+
+    def _throttle_waits(self, request, throttles):
+        return [throttle.wait() for throttle in throttles if not throttle.allow_request(request, self)]
+
+    def parse(self, request):
+        if request.content_type in FORM_CONTENT_TYPES:
+            return request.POST
+        try:
+            return json.loads(request.body or b"{}")
+        except ValueError as exc:
+            raise exceptions.ParseError(f"JSON parse error - {exc}")
+
+    def validated(self, request, serializer_class):
+        data = request.data if hasattr(request, "data") else self.parse(request)
+        serializer = serializer_class(data=data)
+        serializer.is_valid(raise_exception=True)
+        return serializer.validated_data
+
+    def handle_exception(self, request, exc):
+        if isinstance(exc, (exceptions.NotAuthenticated, exceptions.AuthenticationFailed)):
+            if self.authentication_classes:
+                exc.auth_header = self.authentication_classes[0]().authenticate_header(request)
+            else:
+                exc.status_code = 403
+        if not isinstance(exc, exceptions.APIException):
+            logger.exception("unhandled error in %s", type(self).__name__)
+        response = custom_exception_handler(exc, {"view": self, "request": request})
+        rendered = JsonResponse(response.data, status=response.status_code)
+        for header in ERROR_HEADERS:
+            if header in response:
+                rendered[header] = response[header]
+        return rendered
@@ -2,22 +2,21 @@ import logging
 from typing import Dict
 
 from django.conf import settings
-from django.core.mail import EmailMultiAlternatives
 from django.template.loader import render_to_string
 
+from core.outbox import send_email
+
 logger = logging.getLogger(__name__)
 
 
 def send_templated_email(subject: str, to_email: str, template_html: str, template_txt: str, context: Dict):
   """
-  Render templates and send a multipart email.
+  Render templates and send a multipart email (queued in the outbox when enabled).
   """
   try:
     text_body = render_to_string(template_txt, context)
     html_body = render_to_string(template_html, context)
-    message = EmailMultiAlternatives(subject, text_body, settings.DEFAULT_FROM_EMAIL, [to_email])
-    message.attach_alternative(html_body, "text/html")
-    message.send()
+    send_email(subject, text_body, [to_email], html_body=html_body)
   except Exception as exc:  # pragma: no cover - errors are logged
     logger.error("Failed to send email to %s: %s", to_email, exc, exc_info=True)
     raise Exception("Failed to send email") from exc
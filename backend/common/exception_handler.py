@@ -1,7 +1,7 @@
 from rest_framework.views import exception_handler
 from rest_framework import status
 from rest_framework.response import Response
-from rest_framework.exceptions import ValidationError, NotAuthenticated, PermissionDenied, NotFound
+from rest_framework.exceptions import ValidationError, NotAuthenticated, PermissionDenied, NotFound, Throttled
 
 
 def custom_exception_handler(exc, context):
@@ -30,6 +30,12 @@ def custom_exception_handler(exc, context):
     elif isinstance(exc, NotFound):
         message = "Not found"
         code = "NOT_FOUND"
+    elif isinstance(exc, Throttled):
+        message = "Too many requests"
+        code = "THROTTLED"
+    elif response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE:
+        message = str(getattr(exc, "detail", "")) or "Service unavailable"
+        code = "SERVICE_UNAVAILABLE"
     else:
         message = str(exc) or "Server error"
         code = "SERVER_ERROR"
@@ -0,0 +1,182 @@
+import logging
+import random
+import re
+import time
+from collections import Counter
+from contextlib import ExitStack
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER_LIST = re.compile(r"\((?:\s*(?:%s|\?)\s*,)*\s*(?:%s|\?)\s*\)")
+_VALUES_ROWS = re.compile(r"(\(\.\.\.\))(?:\s*,\s*\(\.\.\.\))+")
+_SPACE = re.compile(r"\s+")
+
+
+def fingerprint(sql):
+    """The shape of `sql`: literals become ?, placeholder lists (...), whitespace collapsed."""
+    sql = _STRING.sub("?", sql)
+    sql = _NUMBER.sub("?", sql)
+    sql = _PLACEHOLDER_LIST.sub("(...)", sql)
+    sql = _VALUES_ROWS.sub(r"\1", sql)
+    return _SPACE.sub(" ", sql).strip()
+
+
+class QueryRecorder:
+    """Execute wrapper counting queries and their time; see `repeated` for shapes."""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.statements = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - start
+            self.count += 1
+            self.statements[sql] += 1
+
+    def shapes(self):
+        shapes = Counter()
+        for sql, n in self.statements.items():
+            shapes[fingerprint(sql)] += n
+        return shapes
+
+    def repeated(self, threshold):
+        """Shapes run at least `threshold` times, most frequent first."""
+        return [(shape, n) for shape, n in self.shapes().most_common() if n >= threshold]
+
+
+def query_budget(view_name):
+    budgets = settings.SQL_QUERY_BUDGETS
+    return budgets.get(view_name, budgets.get("default"))
+
+
+class SQLInstrumentationMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.sample_rate = settings.SQL_INSTRUMENTATION_SAMPLE_RATE
+        if self.sample_rate <= 0:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def _sampled(self):
+        return self.sample_rate >= 1 or random.random() < self.sample_rate
+
+    @staticmethod
+    def _record(stack, recorder):
+        # Connections are per thread: call from the thread that runs the queries.
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(recorder))
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        if not self._sampled():
+            return self.get_response(request)
+        recorder = QueryRecorder()
+        start = time.perf_counter()
+        with ExitStack() as stack:
+            self._record(stack, recorder)
+            response = self.get_response(request)
+        return self._finish(request, response, recorder, start)
+
+    async def __acall__(self, request):
+        if not self._sampled():
+            return await self.get_response(request)
+        recorder = QueryRecorder()
+        start = time.perf_counter()
+        stack = ExitStack()
+        # The ORM of async views runs on the request's thread-sensitive thread.
+        await sync_to_async(self._record)(stack, recorder)
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(stack.close)()
+        return self._finish(request, response, recorder, start)
+
+    def _finish(self, request, response, recorder, start):
+        if not response.streaming:
+            elapsed = time.perf_counter() - start
+            self._add_timing(response, recorder, elapsed)
+            self._log(request, response, recorder, elapsed)
+            return response
+        # Streamed bodies run their queries while the content is consumed,
+        # after the headers are sent: count them then and only log.
+        stream = self._astream if response.is_async else self._stream
+        response.streaming_content = stream(request, response, response.streaming_content, recorder, start)
+        return response
+
+    def _stream(self, request, response, content, recorder, start):
+        try:
+            with ExitStack() as stack:
+                self._record(stack, recorder)
+                yield from content
+        finally:
+            self._log(request, response, recorder, time.perf_counter() - start)
+
+    async def _astream(self, request, response, content, recorder, start):
+        stack = ExitStack()
+        await sync_to_async(self._record)(stack, recorder)
+        try:
+            async for part in content:
+                yield part
+        finally:
+            await sync_to_async(stack.close)()
+            self._log(request, response, recorder, time.perf_counter() - start)
+
+    @staticmethod
+    def _add_timing(response, recorder, elapsed):
+        timing = f'db;dur={recorder.duration * 1e3:.1f};desc="{recorder.count} queries", app;dur={elapsed * 1e3:.1f}'
+        if response.has_header("Server-Timing"):
+            timing = f"{response['Server-Timing']}, {timing}"
+        response["Server-Timing"] = timing
+
+    def _log(self, request, response, recorder, elapsed):
+        match = getattr(request, "resolver_match", None)
+        view = match.view_name if match else request.path
+        budget = query_budget(view)
+        over_budget = budget is not None and recorder.count > budget
+        repeated = recorder.repeated(settings.SQL_REPEAT_THRESHOLD)
+
+        level = logging.WARNING if over_budget or repeated else logging.INFO
+        if not logger.isEnabledFor(level):
+            return
+        logger.log(
+            level,
+            "sql view=%s method=%s status=%s queries=%s budget=%s over_budget=%s db_ms=%.1f total_ms=%.1f repeated=%s",
+            view,
+            request.method,
+            response.status_code,
+            recorder.count,
+            budget,
+            over_budget,
+            recorder.duration * 1e3,
+            elapsed * 1e3,
+            [f"{n}x {shape[:200]}" for shape, n in repeated[:3]],
+            extra={
+                "sql": {
+                    "view": view,
+                    "queries": recorder.count,
+                    "budget": budget,
+                    "over_budget": over_budget,
+                    "db_ms": round(recorder.duration * 1e3, 1),
+                    "total_ms": round(elapsed * 1e3, 1),
+                    "repeated": [{"shape": shape, "count": n} for shape, n in repeated],
+                }
+            },
+        )
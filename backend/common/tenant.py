@@ -1,17 +1,118 @@
+from dataclasses import dataclass
+from functools import cached_property
+from typing import Any, Optional
+
 from django.core.exceptions import PermissionDenied
 
 from apps.authx.models import Firm
 
+SUPER_ADMIN = "SUPER_ADMIN"
+CLIENT = "CLIENT"
+OWNER_ROLES = frozenset({"FIRM_OWNER", "OWNER"})
+
+_CACHE_ATTR = "_tenant_context"
+
+# user id -> (client profile id, firm id) or None; installed by the app that owns
+# client profiles (apps.cases), so this module does not import it.
+_client_profile_lookup = None
+
+
+def register_client_profile_lookup(lookup):
+    global _client_profile_lookup
+    _client_profile_lookup = lookup
+
+
+@dataclass(frozen=True)
+class TenantContext:
+    """Caller's role and firm, resolved once per request. SUPER_ADMIN may pick a firm with X-FIRM-ID."""
+
+    user_id: Optional[int]
+    role: str
+    firm_id: Optional[Any]
+
+    @property
+    def is_super_admin(self):
+        return self.role == SUPER_ADMIN
+
+    @property
+    def is_firm_owner(self):
+        return self.role in OWNER_ROLES
+
+    @property
+    def is_client(self):
+        return self.role == CLIENT
+
+    @cached_property
+    def client_profile(self):
+        """(client profile id, firm id) of a CLIENT user, or (None, None)."""
+        if not self.is_client or self.user_id is None or _client_profile_lookup is None:
+            return None, None
+        return _client_profile_lookup(self.user_id) or (None, None)
+
+    @property
+    def client_profile_id(self):
+        return self.client_profile[0]
+
+    @cached_property
+    def firm(self):
+        firm_id = self.firm_id if not self.is_client else self.client_profile[1]
+        if not firm_id:
+            return None
+        try:
+            return Firm.objects.get(id=firm_id)
+        except (Firm.DoesNotExist, ValueError, TypeError):
+            return None
+
+
+ANONYMOUS = TenantContext(user_id=None, role="", firm_id=None)
+
+
+def resolve_tenant(user, firm_header=None):
+    """Build the TenantContext of `user` (at most one query, for owners without firm_id)."""
+    if user is None or not getattr(user, "is_authenticated", False):
+        return ANONYMOUS
+    role = (getattr(user, "role", "") or "").upper()
+    if role == CLIENT:
+        return TenantContext(user_id=user.pk, role=role, firm_id=None)
+    firm_id = getattr(user, "firm_id", None) or getattr(getattr(user, "firm", None), "id", None)
+    if role == SUPER_ADMIN:
+        return TenantContext(user_id=user.pk, role=role, firm_id=firm_header or firm_id)
+    if not role or role in OWNER_ROLES:
+        if not firm_id:
+            firm_id = Firm.objects.filter(owner_id=user.pk).values_list("id", flat=True).first()
+        if not role and firm_id:
+            role = "FIRM_OWNER"
+        return TenantContext(user_id=user.pk, role=role, firm_id=firm_id)
+    # Any other role (e.g. FIRM_ADMIN) owns the firm it is the owner of.
+    owned_id = Firm.objects.filter(owner_id=user.pk).values_list("id", flat=True).first()
+    if owned_id:
+        role, firm_id = "FIRM_OWNER", owned_id
+    return TenantContext(user_id=user.pk, role=role, firm_id=firm_id)
+
+
+def get_tenant_context(request):
+    """
+    TenantContext of the request's authenticated user. Cached on the underlying
+    HttpRequest so the view, permissions and serializers share one instance.
+    """
+    raw = getattr(request, "_request", request)
+    user = getattr(request, "user", None)
+    context = getattr(raw, _CACHE_ATTR, None)
+    if context is None or context.user_id != getattr(user, "pk", None):
+        context = resolve_tenant(user, request.headers.get("X-FIRM-ID"))
+        setattr(raw, _CACHE_ATTR, context)
+    return context
+
 
 def get_current_firm(user_or_request):
     """
     Resolve the firm for the current user.
     Accepts either a user or request. Extend here for membership logic if added later.
     """
-    user = getattr(user_or_request, "user", user_or_request)
-    if hasattr(user, "owned_firm") and user.owned_firm:
-        return user.owned_firm
-    try:
-        return Firm.objects.get(owner=user)
-    except Firm.DoesNotExist:
+    if hasattr(user_or_request, "headers"):
+        firm = get_tenant_context(user_or_request).firm
+    else:
+        firm = resolve_tenant(user_or_request).firm
+    if firm is None:
         raise PermissionDenied("No firm found for current user.")
+    return firm
@@ -4,3 +4,9 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings.production')
 
 application = get_asgi_application()
+
+# Spawn the password hashing processes before the first login (PASSWORD_HASH_WORKERS > 0).
+# Async code awaits them through apps.authx.hashing.acheck_password/amake_password.
+from apps.authx import hashing  # noqa: E402
+
+hashing.start_pool()
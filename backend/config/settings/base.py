@@ -23,6 +23,16 @@ env = environ.Env(
     EMAIL_HOST_PASSWORD=(str, ''),
     EMAIL_USE_TLS=(bool, True),
     FRONTEND_URL=(str, 'http://localhost:3000'),
+    CASE_COUNT_ESTIMATE_LIMIT=(int, 1000),
+    CASE_NUMBER_LEASE_SIZE=(int, 20),
+    CACHE_URL=(str, 'locmemcache://'),
+    PASSWORD_HASH_WORKERS=(int, 0),
+    PASSWORD_HASH_QUEUE_LIMIT=(int, 32),
+    EMAIL_OUTBOX_ENABLED=(bool, True),
+    AUTHX_ASYNC_VIEWS=(bool, False),
+    NUM_PROXIES=(int, 0),
+    SQL_INSTRUMENTATION_SAMPLE_RATE=(float, 0.0),
+    SQL_REPEAT_THRESHOLD=(int, 5),
 )
 
 environ.Env.read_env(os.path.join(BASE_DIR, '.env'))
@@ -35,6 +45,12 @@ DATABASES = {
     'default': env.db(),
 }
 
+# Shared by all workers in production (e.g. redis://...): token revocation
+# marks live here. production.py refuses a per-process (locmem/dummy) cache.
+CACHES = {
+    'default': env.cache('CACHE_URL'),
+}
+
 INSTALLED_APPS = [
     'django.contrib.admin',
     'django.contrib.auth',
@@ -56,6 +72,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'common.middleware.SQLInstrumentationMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -103,7 +120,7 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'apps.authx.tokens.StatelessJWTAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticated',
@@ -115,6 +132,10 @@ REST_FRAMEWORK = {
         'rest_framework.filters.SearchFilter',
         'rest_framework.filters.OrderingFilter',
     ],
+    # Trusted reverse proxies in front of the app. Client IPs (per-IP throttles) are
+    # taken from X-Forwarded-For only this many hops back; 0 uses REMOTE_ADDR, since
+    # the header itself is client-supplied.
+    'NUM_PROXIES': env('NUM_PROXIES'),
 }
 
 SPECTACULAR_SETTINGS = {
@@ -134,11 +155,48 @@ SIMPLE_JWT = {
     'REFRESH_COOKIE_DOMAIN': os.environ.get('REFRESH_COOKIE_DOMAIN', ''),
     'REFRESH_COOKIE_SECURE': False,
     'REFRESH_COOKIE_SAMESITE': 'Lax',
+    'TOKEN_REFRESH_SERIALIZER': 'apps.authx.tokens.ClaimsTokenRefreshSerializer',
 }
 
 EMAIL_BACKEND = env('EMAIL_BACKEND')
 DEFAULT_FROM_EMAIL = env('DEFAULT_FROM_EMAIL')
 FRONTEND_URL = env('FRONTEND_URL')
+# Queue outgoing email in core.EmailOutbox for `manage.py send_outbox` instead of sending in the request.
+EMAIL_OUTBOX_ENABLED = env('EMAIL_OUTBOX_ENABLED')
+
+# Filtered case lists count exactly up to this many rows, then report an estimate.
+CASE_COUNT_ESTIMATE_LIMIT = env('CASE_COUNT_ESTIMATE_LIMIT')
+# Auto-generated case numbers each worker process reserves per counter update.
+CASE_NUMBER_LEASE_SIZE = env('CASE_NUMBER_LEASE_SIZE')
+# Processes that hash passwords off the request worker (0 = hash inline), and
+# how many hashes may be running or waiting before login/registration get 503.
+PASSWORD_HASH_WORKERS = env('PASSWORD_HASH_WORKERS')
+PASSWORD_HASH_QUEUE_LIMIT = env('PASSWORD_HASH_QUEUE_LIMIT')
+# Sliding-window budgets of the public authx endpoints, per client IP and per email
+# ('<scope>_ip' / '<scope>_email'; see apps/authx/throttling.py).
+AUTHX_THROTTLE_RATES = {
+    'login_ip': '30/min',
+    'login_email': '10/min',
+    'register_ip': '10/hour',
+    'register_email': '3/hour',
+    'send_otp_ip': '20/min',
+    'send_otp_email': '3/min',
+    'resend_verification_ip': '20/min',
+    'resend_verification_email': '3/min',
+}
+# Serve the OTP and /me/ endpoints with the async views in apps/authx/async_views.py (for ASGI deployments).
+AUTHX_ASYNC_VIEWS = env('AUTHX_ASYNC_VIEWS')
+# Share of requests whose SQL is counted, timed and logged with a Server-Timing header
+# (0 = middleware off, 1 = every request; see common/middleware.py).
+SQL_INSTRUMENTATION_SAMPLE_RATE = env('SQL_INSTRUMENTATION_SAMPLE_RATE')
+# Queries per request above which a sampled request is logged as a warning, by view name.
+SQL_QUERY_BUDGETS = {
+    'default': 20,
+    'case-list': 5,
+    'case-detail': 15,
+}
+# A query shape repeated this often in one request is logged as a likely N+1.
+SQL_REPEAT_THRESHOLD = env('SQL_REPEAT_THRESHOLD')
 
 if EMAIL_BACKEND != 'django.core.mail.backends.console.EmailBackend':
     EMAIL_HOST = env('EMAIL_HOST')
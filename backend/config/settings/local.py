@@ -1,6 +1,8 @@
 from .base import *  # noqa
 
 DEBUG = env.bool('DEBUG', default=True)
+# Send mail in the request locally, so no outbox worker is needed.
+EMAIL_OUTBOX_ENABLED = env.bool('EMAIL_OUTBOX_ENABLED', default=False)
 
 if not ALLOWED_HOSTS:
     ALLOWED_HOSTS = ['*']
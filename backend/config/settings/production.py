@@ -1,3 +1,5 @@
+from django.core.exceptions import ImproperlyConfigured
+
 from .base import *  # noqa
 
 DEBUG = env.bool('DEBUG', default=False)
@@ -9,3 +11,11 @@ DEBUG = env.bool('DEBUG', default=False)
 # CSRF_COOKIE_SECURE = True
 
 ALLOWED_HOSTS = env('ALLOWED_HOSTS') or []
+
+# Token revocation marks, the refresh blacklist filter, OTP attempt counters
+# and throttle windows only work across workers with a shared cache.
+if CACHES['default']['BACKEND'] in (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+):
+    raise ImproperlyConfigured('CACHE_URL must name a cache shared by all workers (e.g. redis://...) in production.')
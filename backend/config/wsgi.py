@@ -4,3 +4,8 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings.production')
 
 application = get_wsgi_application()
+
+# Spawn the password hashing processes before the first login (PASSWORD_HASH_WORKERS > 0).
+from apps.authx import hashing  # noqa: E402
+
+hashing.start_pool()
@@ -0,0 +1,199 @@
+import json
+import logging
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test.utils import override_settings
+from rest_framework.test import APIClient
+
+from apps.cases.models import Case
+from core.benchmarking import benchmark_database, summarize
+from core.synthetic import plan
+
+PASSWORD = "Bench#Endpoints123"
+DEFAULT_BASELINE = Path(settings.BASE_DIR) / "benchmarks" / "endpoints.json"
+CASES = "/api/v1/cases/"
+
+
+def list_endpoints(client_id, lead_id, today):
+    """(name, query string) of the case list variants: every filter and sort."""
+    variants = [
+        ("list", ""),
+        ("list status", "status=open"),
+        ("list priority", "priority=HIGH"),
+        ("list case_type", "case_type=civil"),
+        ("list assigned_lead", f"assigned_lead={lead_id}"),
+        ("list client", f"client={client_id}"),
+        ("list date range", f"date_from={today.replace(year=today.year - 1)}&date_to={today}"),
+        ("list search", "search=smith"),
+        ("list search+status", "search=khan&status=CLOSED"),
+        ("list status+priority", "status=OPEN&priority=URGENT"),
+    ]
+    for field in ("created_at", "open_date", "title"):
+        variants += [(f"list sort {field}", f"sort={field}"), (f"list sort -{field}", f"sort=-{field}")]
+    return variants
+
+
+class Command(BaseCommand):
+    help = (
+        "p50/p95/p99 latency and SQL queries of the case and authx endpoints on generated datasets, "
+        "compared with a stored baseline (runs on a throwaway test database)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000], help="Cases per dataset")
+        parser.add_argument("--firms", type=int, default=5)
+        parser.add_argument("--repeat", type=int, default=30)
+        parser.add_argument("--seed", type=int, default=1)
+        parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+        parser.add_argument("--save-baseline", action="store_true", help="Write the results as the new baseline")
+        parser.add_argument("--latency-threshold", type=float, default=0.5, help="Allowed p95 growth (0.5 = +50%%)")
+        parser.add_argument("--latency-floor-ms", type=float, default=2.0, help="p95 growth always allowed")
+        parser.add_argument("--query-threshold", type=int, default=0, help="Extra queries allowed per request")
+
+    def handle(self, *args, **options):
+        # Every 4xx would otherwise be logged as a warning.
+        logging.getLogger("django.request").setLevel(logging.CRITICAL)
+        results = {}
+        # Password hashing cost is a setting, not a regression; bench_login_load measures it.
+        with benchmark_database(), override_settings(
+            AUTHX_THROTTLE_RATES={}, PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"]
+        ):
+            for size in sorted(options["sizes"]):
+                with transaction.atomic():
+                    results[str(size)] = self._run_size(size, options)
+                    transaction.set_rollback(True)
+        self._write_table(results)
+
+        if options["save_baseline"]:
+            options["baseline"].parent.mkdir(parents=True, exist_ok=True)
+            baseline = {"meta": {"vendor": connection.vendor, "repeat": options["repeat"]}, "results": results}
+            options["baseline"].write_text(json.dumps(baseline, indent=2, sort_keys=True) + "\n")
+            self.stdout.write(f"Baseline written to {options['baseline']}")
+            return
+        if not options["baseline"].exists():
+            self.stdout.write(f"No baseline at {options['baseline']}; run with --save-baseline to create one.")
+            return
+        regressions = self._compare(results, json.loads(options["baseline"].read_text()), options)
+        for line in regressions:
+            self.stdout.write(self.style.ERROR(line))
+        if regressions:
+            raise CommandError(f"{len(regressions)} regressions against {options['baseline']}")
+        self.stdout.write(self.style.SUCCESS(f"No regressions against {options['baseline']}"))
+
+    def _run_size(self, size, options):
+        cache.clear()
+        firms = plan(options["seed"], options["firms"], size, 0.2, 0.03, password=PASSWORD)
+        for firm in firms:
+            list(firm.run())
+        # The largest firm's owner, also the lead of its assigned cases; its
+        # busiest client filters the client list.
+        email = f"{firms[0].tag}owner@seed.example"
+        client = APIClient()
+        response = client.post("/api/authx/login/", {"email": email, "password": PASSWORD}, format="json")
+        if response.status_code != 200:
+            raise CommandError(f"Bench login failed: {response.status_code} {response.content[:200]}")
+        access = response.data["data"]["tokens"]["access"]
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {access}")
+        firm_cases = Case.objects.filter(firm__slug=f"seed-{options['seed']}-0", is_deleted=False)
+        case_ids = [str(pk) for pk in firm_cases.order_by("id").values_list("id", flat=True)[: options["repeat"]]]
+        client_id = (
+            firm_cases.exclude(client=None).values_list("client_id", flat=True).order_by("-created_at").first()
+        )
+
+        measured = {}
+        lead_id = firm_cases.exclude(assigned_lead=None).values_list("assigned_lead_id", flat=True).first()
+        for name, query in list_endpoints(client_id, lead_id, firms[0].today):
+            measured[name] = self._measure(lambda n: client.get(f"{CASES}?{query}"), options["repeat"])
+        measured["retrieve"] = self._measure(
+            lambda n: client.get(f"{CASES}{case_ids[n % len(case_ids)]}/"), options["repeat"]
+        )
+        created = []
+
+        def create(n):
+            response = client.post(CASES, {"title": f"Bench case {n}", "client": str(client_id)}, format="json")
+            if response.status_code == 201:
+                created.append(response.data["data"]["id"])
+            return response
+
+        measured["create"] = self._measure(create, options["repeat"])
+        measured["update"] = self._measure(
+            lambda n: client.patch(f"{CASES}{created[n % len(created)]}/", {"priority": "HIGH"}, format="json"),
+            options["repeat"],
+        )
+        measured["destroy"] = self._measure(lambda n: client.delete(f"{CASES}{created[n]}/"), options["repeat"])
+        measured["me"] = self._measure(lambda n: client.get("/api/authx/me/"), options["repeat"])
+        # The refresh cookie rotates on every call; the client keeps the latest.
+        measured["refresh"] = self._measure(lambda n: client.post("/api/authx/token/refresh/"), options["repeat"])
+        login = APIClient()
+        measured["login"] = self._measure(
+            lambda n: login.post("/api/authx/login/", {"email": email, "password": PASSWORD}, format="json"),
+            options["repeat"],
+        )
+        return measured
+
+    def _measure(self, request, repeat):
+        """
+        Latency percentiles (ms) and the most queries any one request ran.
+        `request(n)` is called repeat + 1 times; call 0 is a warm-up.
+        """
+        samples, queries = [], 0
+        for n in range(repeat + 1):
+            count = 0
+
+            def counter(execute, sql, params, many, context):
+                nonlocal count
+                count += 1
+                return execute(sql, params, many, context)
+
+            start = time.perf_counter()
+            with connection.execute_wrapper(counter):
+                response = request(n)
+            elapsed = time.perf_counter() - start
+            if response.status_code >= 300:
+                raise CommandError(
+                    f"{response.request['REQUEST_METHOD']} {response.request['PATH_INFO']}: "
+                    f"{response.status_code} {response.content[:200]}"
+                )
+            if n:
+                samples.append(elapsed)
+                queries = max(queries, count)
+        stats = summarize(samples)
+        return {
+            "p50_ms": round(stats["p50"] * 1e3, 2),
+            "p95_ms": round(stats["p95"] * 1e3, 2),
+            "p99_ms": round(stats["p99"] * 1e3, 2),
+            "queries": queries,
+        }
+
+    def _write_table(self, results):
+        self.stdout.write(f"{'cases':>7} {'endpoint':<24} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'queries':>8}")
+        for size, endpoints in results.items():
+            for name, row in endpoints.items():
+                self.stdout.write(
+                    f"{size:>7} {name:<24} {row['p50_ms']:>8.2f} {row['p95_ms']:>8.2f} "
+                    f"{row['p99_ms']:>8.2f} {row['queries']:>8}"
+                )
+
+    def _compare(self, results, baseline, options):
+        vendor = baseline.get("meta", {}).get("vendor")
+        if vendor not in (None, connection.vendor):
+            self.stdout.write(self.style.WARNING(f"Baseline was recorded on {vendor}, not {connection.vendor}"))
+        regressions = []
+        for size, endpoints in results.items():
+            for name, row in endpoints.items():
+                base = baseline.get("results", {}).get(size, {}).get(name)
+                if base is None:
+                    continue
+                if row["queries"] > base["queries"] + options["query_threshold"]:
+                    regressions.append(f"{size} {name}: {row['queries']} queries, baseline {base['queries']}")
+                allowed = max(
+                    base["p95_ms"] * (1 + options["latency_threshold"]), base["p95_ms"] + options["latency_floor_ms"]
+                )
+                if row["p95_ms"] > allowed:
+                    regressions.append(f"{size} {name}: p95 {row['p95_ms']:.2f} ms, baseline {base['p95_ms']:.2f} ms")
+        return regressions
@@ -0,0 +1,52 @@
+import json
+import os
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.authx import hashing
+from core.onboarding import CHUNK_SIZE, Importer, chunked, read_records
+
+
+class Command(BaseCommand):
+    help = "Import firms, owners, clients and cases from a CSV or NDJSON file (see core/onboarding.py)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="CSV or NDJSON file")
+        parser.add_argument("--format", choices=["csv", "ndjson"], help="Default: from the file extension")
+        parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+        parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Password hashing processes")
+        parser.add_argument("--errors", help="Per-record error file (NDJSON); default: <path>.errors.ndjson")
+        parser.add_argument("--mark-verified", action="store_true", help="Mark imported emails as verified")
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        fmt = options["format"] or ("csv" if path.lower().endswith(".csv") else "ndjson")
+        errors_path = options["errors"] or f"{path}.errors.ndjson"
+        if options["chunk_size"] < 1:
+            raise CommandError("--chunk-size must be at least 1.")
+        try:
+            stream = open(path, newline="", encoding="utf-8")
+        except OSError as exc:
+            raise CommandError(f"Cannot read {path}: {exc}")
+
+        started = time.perf_counter()
+        with stream, open(errors_path, "w", encoding="utf-8") as errors_file, hashing.batch_hasher(
+            options["workers"]
+        ) as make_passwords:
+            importer = Importer(make_passwords, email_verified=options["mark_verified"])
+            for chunk in chunked(read_records(stream, fmt), options["chunk_size"]):
+                for error in importer.import_chunk(chunk):
+                    errors_file.write(json.dumps(error) + "\n")
+                if options["verbosity"] > 1:
+                    self._report(importer.totals, started)
+        self._report(importer.totals, started)
+        if importer.totals["errors"]:
+            self.stdout.write(self.style.WARNING(f"{importer.totals['errors']} records failed; see {errors_path}"))
+
+    def _report(self, totals, started):
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            f"{totals['records']} records in {elapsed:.1f}s ({totals['records'] / max(elapsed, 1e-9):.0f} rows/s): "
+            f"{totals['firms']} firms, {totals['clients']} clients, {totals['cases']} cases, {totals['errors']} errors"
+        )
@@ -0,0 +1,53 @@
+import time
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.synthetic import BATCH_SIZE, plan, seeded
+
+
+class Command(BaseCommand):
+    help = "Generate firms, clients and cases with skewed, seed-deterministic distributions (see core/synthetic.py)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--seed", type=int, default=1)
+        parser.add_argument("--firms", type=int, default=20)
+        parser.add_argument("--cases", type=int, default=10000, help="Total cases, split across firms by a Zipf curve")
+        parser.add_argument("--clients-per-case", type=float, default=0.2)
+        parser.add_argument("--deleted", type=float, default=0.03, help="Share of soft-deleted cases")
+        parser.add_argument("--password", default="Seed@12345!", help="Password of every generated user")
+        parser.add_argument("--today", type=date.fromisoformat, help="Date the open dates count back from (YYYY-MM-DD)")
+        parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        if options["firms"] < 1 or options["cases"] < 0 or options["batch_size"] < 1:
+            raise CommandError("--firms and --batch-size must be at least 1, --cases at least 0.")
+        if not 0 <= options["deleted"] <= 1:
+            raise CommandError("--deleted must be between 0 and 1.")
+        if seeded(options["seed"]):
+            raise CommandError(f"Seed {options['seed']} was already generated; pick another --seed.")
+
+        firms = plan(
+            options["seed"],
+            options["firms"],
+            options["cases"],
+            options["clients_per_case"],
+            options["deleted"],
+            password=options["password"],
+            today=options["today"],
+        )
+        started = time.perf_counter()
+        created = 0
+        for firm in firms:
+            for count in firm.run(options["batch_size"]):
+                created += count
+                if options["verbosity"] > 1:
+                    self.stdout.write(f"{created} cases ({created / (time.perf_counter() - started):.0f}/s)")
+        elapsed = time.perf_counter() - started
+        clients = sum(firm.clients for firm in firms)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Seed {options['seed']}: {len(firms)} firms, {clients} clients, {created} cases "
+                f"in {elapsed:.1f}s ({created / max(elapsed, 1e-9):.0f} cases/s)"
+            )
+        )
@@ -0,0 +1,49 @@
+import logging
+import time
+
+from django.core.mail import get_connection
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from core import outbox
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = "Deliver queued outbox emails in batches over one reused mail connection (runs until stopped unless --once)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=100)
+        parser.add_argument("--max-attempts", type=int, default=outbox.MAX_ATTEMPTS)
+        parser.add_argument("--interval", type=float, default=1.0, help="Seconds to wait when nothing is due")
+        parser.add_argument("--once", action="store_true", help="Exit once nothing is due")
+
+    def handle(self, *args, **options):
+        connection = get_connection()
+        totals = [0, 0, 0]
+        try:
+            while True:
+                try:
+                    counts = outbox.deliver_due(options["batch_size"], options["max_attempts"], connection)
+                except Exception:
+                    # Mail server or database unavailable: keep the worker alive and try again.
+                    logger.exception("outbox batch failed")
+                    connection.close()
+                    counts = None
+                if counts:
+                    totals = [total + count for total, count in zip(totals, counts)]
+                if counts and any(counts):
+                    continue
+                if options["once"]:
+                    break
+                # Idle: release the mail server and database connections while waiting.
+                connection.close()
+                close_old_connections()
+                time.sleep(options["interval"])
+        except KeyboardInterrupt:
+            pass
+        finally:
+            connection.close()
+        sent, retrying, failed = totals
+        self.stdout.write(self.style.SUCCESS(f"Sent {sent} emails; {retrying} to retry, {failed} failed."))
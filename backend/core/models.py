@@ -0,0 +1,42 @@
+from django.db import models
+from django.db.models import Q
+from django.utils import timezone
+
+
+class EmailOutboxStatus(models.TextChoices):
+    PENDING = "PENDING", "Pending"
+    SENT = "SENT", "Sent"
+    FAILED = "FAILED", "Failed"
+
+
+class EmailOutbox(models.Model):
+    """
+    An email queued by the request that produced it and delivered later by
+    `manage.py send_outbox` (see core.outbox).
+    """
+
+    subject = models.CharField(max_length=998)
+    body = models.TextField()
+    html_body = models.TextField(blank=True)
+    from_email = models.CharField(max_length=320)
+    to = models.JSONField(default=list)
+    status = models.CharField(max_length=10, choices=EmailOutboxStatus.choices, default=EmailOutboxStatus.PENDING)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["created_at"]
+        indexes = [
+            # The sender's claim query: due pending rows, oldest first.
+            models.Index(
+                fields=["next_attempt_at"],
+                condition=Q(status=EmailOutboxStatus.PENDING),
+                name="core_outbox_pending_due_idx",
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.subject} -> {', '.join(self.to)} ({self.status})"
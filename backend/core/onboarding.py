@@ -0,0 +1,375 @@
+import csv
+import json
+from collections import Counter, defaultdict
+
+from django.contrib.auth import get_user_model
+from django.db import DatabaseError, transaction
+from django.db.models.functions import Lower
+from django.utils.text import slugify
+from rest_framework import serializers
+
+from apps.authx.allocation import allocate_many
+from apps.authx.identity import email_key, normalize_email
+from apps.authx.models import Firm, UserProfile
+from apps.cases import counts as case_counts
+from apps.cases import search, versioning
+from apps.cases.models import Case, ClientProfile
+from apps.cases.numbering import reserve_block
+from apps.cases.serializers import CaseBulkItemSerializer
+
+User = get_user_model()
+
+CHUNK_SIZE = 1000
+INSERT_BATCH_SIZE = 500
+
+
+class FirmRecordSerializer(serializers.Serializer):
+    ref = serializers.CharField(max_length=255, required=False)
+    name = serializers.CharField(max_length=255)
+    email = serializers.EmailField(required=False)
+    phone = serializers.CharField(max_length=50, required=False)
+    address = serializers.CharField(required=False)
+    timezone = serializers.CharField(max_length=100, required=False)
+    owner_email = serializers.EmailField()
+    owner_first_name = serializers.CharField(max_length=150, required=False, default="")
+    owner_last_name = serializers.CharField(max_length=150, required=False, default="")
+    owner_password = serializers.CharField(required=False, default="", trim_whitespace=False)
+
+
+class ClientRecordSerializer(serializers.Serializer):
+    firm = serializers.CharField(max_length=255)
+    email = serializers.EmailField()
+    name = serializers.CharField(max_length=255)
+    first_name = serializers.CharField(max_length=150, required=False, default="")
+    last_name = serializers.CharField(max_length=150, required=False, default="")
+    password = serializers.CharField(required=False, default="", trim_whitespace=False)
+
+
+class CaseRecordSerializer(CaseBulkItemSerializer):
+    firm = serializers.CharField(max_length=255, write_only=True)
+    client_email = serializers.EmailField(required=False, write_only=True)
+    client = None
+    assigned_lead = None
+
+    class Meta(CaseBulkItemSerializer.Meta):
+        fields = [
+            field for field in CaseBulkItemSerializer.Meta.fields if field not in ("client", "assigned_lead")
+        ] + ["firm", "client_email"]
+        # Case numbers are checked per firm by Importer; `firm` here is a ref, not the FK.
+        validators = []
+
+
+RECORD_SERIALIZERS = {
+    "firm": FirmRecordSerializer,
+    "client": ClientRecordSerializer,
+    "case": CaseRecordSerializer,
+}
+
+
+def read_records(stream, fmt):
+    """Yield (line, record, error) from a CSV or NDJSON text stream; blank CSV cells are left out."""
+    if fmt == "csv":
+        reader = csv.DictReader(stream)
+        for record in reader:
+            yield reader.line_num, {key: value for key, value in record.items() if key and value not in (None, "")}, None
+        return
+    for line, text in enumerate(stream, 1):
+        if not text.strip():
+            continue
+        try:
+            record = json.loads(text)
+        except ValueError as exc:
+            yield line, None, {"record": [f"Invalid JSON: {exc}"]}
+            continue
+        if not isinstance(record, dict):
+            yield line, None, {"record": ["Expected a JSON object."]}
+            continue
+        yield line, record, None
+
+
+def chunked(records, size=CHUNK_SIZE):
+    chunk = []
+    for record in records:
+        chunk.append(record)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+class Importer:
+    """
+    Imports chunks of records (see `read_records`), remembering the firms,
+    clients and emails of earlier chunks. `make_passwords` hashes a list of
+    passwords (apps.authx.hashing.batch_hasher).
+    """
+
+    def __init__(self, make_passwords, email_verified=False):
+        self.make_passwords = make_passwords
+        self.email_verified = email_verified
+        self.firms = {}  # ref or slug -> Firm
+        self.failed_firms = set()
+        self.clients = {}  # normalized email -> (firm id, client profile id)
+        self.emails = set()
+        self.firm_names = set()
+        self.totals = Counter()
+
+    def import_chunk(self, chunk):
+        """Import one chunk; returns its per-record errors as dicts with line, type and errors."""
+        self.errors = []
+        records = defaultdict(list)
+        for line, record, error in chunk:
+            self.totals["records"] += 1
+            if error:
+                self._fail(line, None, error)
+                continue
+            kind = record.get("type")
+            serializer_class = RECORD_SERIALIZERS.get(kind)
+            if serializer_class is None:
+                self._fail(line, kind, {"type": ["Expected firm, client or case."]})
+                continue
+            serializer = serializer_class(data=record)
+            if not serializer.is_valid():
+                self._fail(line, kind, serializer.errors)
+                continue
+            records[kind].append((line, dict(serializer.validated_data)))
+
+        firms = self._check_firms(records["firm"])
+        clients = self._check_clients(records["client"], firms)
+        cases = self._check_cases(records["case"], firms, clients)
+        if firms or clients or cases:
+            try:
+                with transaction.atomic():
+                    self._insert(firms, clients, cases)
+            except DatabaseError as exc:
+                self._fail_all(firms, clients, cases, exc)
+            else:
+                self.totals.update(firms=len(firms), clients=len(clients), cases=len(cases))
+        return self.errors
+
+    def _fail(self, line, kind, errors):
+        self.totals["errors"] += 1
+        self.errors.append({"line": line, "type": kind, "errors": errors})
+
+    def _fail_all(self, firms, clients, cases, exc):
+        """A chunk insert failed (e.g. a concurrent signup took an email): report all its records."""
+        for kind, records in (("firm", firms), ("client", clients), ("case", cases)):
+            for line, attrs in records:
+                self._fail(line, kind, {"record": [f"Chunk not imported: {exc}"]})
+        for _, attrs in firms:
+            self.failed_firms.add(attrs["ref"])
+            self.firms.pop(attrs["ref"], None)
+        for _, attrs in clients:
+            self.clients.pop(attrs["email"], None)
+
+    def _new_emails(self, records, kind, field):
+        """Records whose email is used neither by an existing user nor earlier in the import."""
+        for _, attrs in records:
+            attrs[field] = normalize_email(attrs[field])
+        emails = {attrs[field] for _, attrs in records}
+        taken = (
+            set(User.objects.annotate(key=email_key()).filter(key__in=emails).values_list("key", flat=True))
+            if emails
+            else set()
+        )
+        fresh = []
+        for line, attrs in records:
+            if attrs[field] in taken or attrs[field] in self.emails:
+                self._fail(line, kind, {field: ["A user with this email already exists."]})
+                continue
+            self.emails.add(attrs[field])
+            fresh.append((line, attrs))
+        return fresh
+
+    def _check_firms(self, records):
+        names = {attrs["name"].lower() for _, attrs in records}
+        taken = (
+            set(Firm.objects.annotate(key=Lower("name")).filter(key__in=names).values_list("key", flat=True))
+            if names
+            else set()
+        )
+        named = []
+        for line, attrs in records:
+            attrs["ref"] = attrs.get("ref") or attrs["name"]
+            errors = {}
+            if attrs["name"].lower() in taken or attrs["name"].lower() in self.firm_names:
+                errors["name"] = ["A firm with this name already exists."]
+            if attrs["ref"] in self.firms or attrs["ref"] in self.failed_firms:
+                errors["ref"] = ["Used by an earlier firm of this import."]
+            if errors:
+                self.failed_firms.add(attrs["ref"])
+                self._fail(line, "firm", errors)
+                continue
+            self.firm_names.add(attrs["name"].lower())
+            named.append((line, attrs))
+        fresh = self._new_emails(named, "firm", "owner_email")
+        kept = {line for line, _ in fresh}
+        self.failed_firms.update(attrs["ref"] for line, attrs in named if line not in kept)
+        return fresh
+
+    def _resolve_firms(self, records, new_refs):
+        """Set attrs["firm_ref"]; refs that are neither imported nor failed are looked up as slugs, once."""
+        unknown = {
+            attrs["firm"] for _, attrs in records
+            if attrs["firm"] not in self.firms and attrs["firm"] not in new_refs and attrs["firm"] not in self.failed_firms
+        }
+        if unknown:
+            self.firms.update((firm.slug, firm) for firm in Firm.objects.filter(slug__in=unknown))
+        resolved = []
+        for line, attrs in records:
+            ref = attrs.pop("firm")
+            if ref in self.failed_firms:
+                self._fail(line, attrs["type"], {"firm": [f"Firm {ref!r} was not imported."]})
+            elif ref not in self.firms and ref not in new_refs:
+                self._fail(line, attrs["type"], {"firm": [f"Firm {ref!r} not found."]})
+            else:
+                attrs["firm_ref"] = ref
+                resolved.append((line, attrs))
+        return resolved
+
+    def _check_clients(self, records, firms):
+        for _, attrs in records:
+            attrs["type"] = "client"
+        new_refs = {attrs["ref"] for _, attrs in firms}
+        return self._new_emails(self._resolve_firms(records, new_refs), "client", "email")
+
+    def _check_cases(self, records, firms, clients):
+        for _, attrs in records:
+            attrs["type"] = "case"
+        new_refs = {attrs["ref"]: attrs for _, attrs in firms}
+        records = self._resolve_firms(records, new_refs)
+
+        new_clients = {attrs["email"]: attrs["firm_ref"] for _, attrs in clients}
+        unknown = {
+            normalize_email(attrs["client_email"]) for _, attrs in records
+            if attrs.get("client_email") and normalize_email(attrs["client_email"]) not in self.clients
+        } - set(new_clients)
+        if unknown:
+            for profile in (
+                ClientProfile.objects.annotate(key=Lower("user__email"))
+                .filter(key__in=unknown)
+                .values("key", "id", "firm_id")
+            ):
+                self.clients[profile["key"]] = (profile["firm_id"], profile["id"])
+
+        # Explicit case numbers of existing firms, checked with one query.
+        explicit = {
+            (self.firms[attrs["firm_ref"]].id, attrs["case_number"])
+            for _, attrs in records
+            if attrs.get("case_number") and attrs["firm_ref"] in self.firms
+        }
+        existing = (
+            set(
+                Case.objects.filter(
+                    firm__in={firm_id for firm_id, _ in explicit}, case_number__in={number for _, number in explicit}
+                )
+                .order_by()
+                .values_list("firm_id", "case_number")
+            )
+            if explicit
+            else set()
+        )
+        claimed = set()
+        ready = []
+        for line, attrs in records:
+            ref = attrs["firm_ref"]
+            firm = self.firms.get(ref)
+            errors = {}
+            email = attrs.pop("client_email", None)
+            if email:
+                email = normalize_email(email)
+                if email in new_clients:
+                    if new_clients[email] != ref:
+                        errors["client_email"] = ["Client belongs to another firm."]
+                    attrs["client_email"] = email
+                elif email in self.clients:
+                    client_firm, attrs["client_id"] = self.clients[email]
+                    if firm is None or client_firm != firm.id:
+                        errors["client_email"] = ["Client belongs to another firm."]
+                else:
+                    errors["client_email"] = ["Client not found."]
+            number = attrs.get("case_number")
+            if number:
+                if (ref, number) in claimed or (firm is not None and (firm.id, number) in existing):
+                    errors["case_number"] = ["Already exists"]
+                claimed.add((ref, number))
+            if errors:
+                self._fail(line, "case", errors)
+                continue
+            ready.append((line, attrs))
+        return ready
+
+    def _users(self, records, email_field, first_field, last_field, password_field):
+        bases = [(attrs[email_field].split("@")[0] or "user").lower() for _, attrs in records]
+        usernames = allocate_many(
+            User.objects.all(),
+            bases,
+            field="username",
+            max_length=User._meta.get_field("username").max_length,
+            key=Lower("username"),
+        )
+        hashes = self.make_passwords([attrs[password_field] for _, attrs in records])
+        return [
+            User(
+                username=username,
+                email=attrs[email_field],
+                first_name=attrs[first_field],
+                last_name=attrs[last_field],
+                password=password,
+            )
+            for (_, attrs), username, password in zip(records, usernames, hashes)
+        ]
+
+    def _insert(self, firms, clients, cases):
+        owners = self._users(firms, "owner_email", "owner_first_name", "owner_last_name", "owner_password")
+        client_users = self._users(clients, "email", "first_name", "last_name", "password")
+        users = owners + client_users
+        User.objects.bulk_create(users, batch_size=INSERT_BATCH_SIZE)
+        UserProfile.objects.bulk_create(
+            [UserProfile(user=user, email_verified=self.email_verified) for user in users], batch_size=INSERT_BATCH_SIZE
+        )
+
+        slugs = allocate_many(
+            Firm.objects.all(),
+            [slugify(attrs["name"]) or "firm" for _, attrs in firms],
+            field="slug",
+            max_length=Firm._meta.get_field("slug").max_length,
+            separator="-",
+        )
+        new_firms = []
+        for (_, attrs), slug, owner in zip(firms, slugs, owners):
+            fields = {key: attrs[key] for key in ("email", "phone", "address", "timezone") if key in attrs}
+            new_firms.append(Firm(name=attrs["name"], slug=slug, owner=owner, **fields))
+        Firm.objects.bulk_create(new_firms, batch_size=INSERT_BATCH_SIZE)
+        for (_, attrs), firm in zip(firms, new_firms):
+            self.firms[attrs["ref"]] = firm
+
+        profiles = [
+            ClientProfile(firm=self.firms[attrs["firm_ref"]], user=user, name=attrs["name"])
+            for (_, attrs), user in zip(clients, client_users)
+        ]
+        ClientProfile.objects.bulk_create(profiles, batch_size=INSERT_BATCH_SIZE)
+        for profile in profiles:
+            self.clients[profile.user.email] = (profile.firm_id, profile.id)
+
+        by_firm = defaultdict(list)
+        for _, attrs in cases:
+            firm = self.firms[attrs.pop("firm_ref")]
+            email = attrs.pop("client_email", None)
+            if email:
+                attrs["client_id"] = self.clients[email][1]
+            attrs.pop("type")
+            by_firm[firm].append(Case(firm=firm, created_by_id=firm.owner_id, **attrs))
+        new_cases = []
+        for firm, firm_cases in by_firm.items():
+            claimed = {case.case_number for case in firm_cases if case.case_number}
+            numbers = iter(reserve_block(firm, sum(1 for case in firm_cases if not case.case_number), exclude=claimed))
+            for case in firm_cases:
+                if not case.case_number:
+                    case.case_number = next(numbers)
+            new_cases.extend(firm_cases)
+        Case.objects.bulk_create(new_cases, batch_size=INSERT_BATCH_SIZE)
+        case_counts.record_created(*new_cases)
+        versioning.bump(*(firm.id for firm in by_firm))
+        search.index_cases(new_cases)
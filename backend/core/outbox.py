@@ -0,0 +1,123 @@
+import logging
+import random
+from datetime import timedelta
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.db import transaction
+from django.utils import timezone
+
+from .models import EmailOutbox, EmailOutboxStatus
+
+logger = logging.getLogger(__name__)
+
+CLAIM_SECONDS = 300
+BACKOFF_BASE_SECONDS = 30
+BACKOFF_MAX_SECONDS = 3600
+MAX_ATTEMPTS = 8
+
+
+def _message(subject, body, to, html_body="", from_email=None):
+    message = EmailMultiAlternatives(subject, body, from_email or settings.DEFAULT_FROM_EMAIL, list(to))
+    if html_body:
+        message.attach_alternative(html_body, "text/html")
+    return message
+
+
+def _row(subject, body, to, html_body="", from_email=None):
+    return EmailOutbox(
+        subject=subject,
+        body=body,
+        html_body=html_body,
+        from_email=from_email or settings.DEFAULT_FROM_EMAIL,
+        to=list(to),
+    )
+
+
+def send_email(subject, body, to, html_body="", from_email=None):
+    """Queue an email (or send it now when the outbox is disabled). Returns the outbox row, if any."""
+    if not getattr(settings, "EMAIL_OUTBOX_ENABLED", False):
+        _message(subject, body, to, html_body, from_email).send()
+        return None
+    row = _row(subject, body, to, html_body, from_email)
+    row.save(force_insert=True)
+    return row
+
+
+async def asend_email(subject, body, to, html_body="", from_email=None):
+    """`send_email` for async callers."""
+    if not getattr(settings, "EMAIL_OUTBOX_ENABLED", False):
+        message = _message(subject, body, to, html_body, from_email)
+        await sync_to_async(message.send, thread_sensitive=False)()
+        return None
+    row = _row(subject, body, to, html_body, from_email)
+    await row.asave(force_insert=True)
+    return row
+
+
+def backoff(attempts):
+    """Delay before retry number `attempts` (1-based): doubling from the base, capped, with jitter."""
+    delay = min(BACKOFF_MAX_SECONDS, BACKOFF_BASE_SECONDS * 2 ** (attempts - 1))
+    return timedelta(seconds=delay * random.uniform(0.8, 1.2))
+
+
+def claim_due(batch_size):
+    """Lease up to `batch_size` due rows to this sender and return them."""
+    now = timezone.now()
+    with transaction.atomic():
+        rows = list(
+            EmailOutbox.objects.select_for_update(skip_locked=True)
+            .filter(status=EmailOutboxStatus.PENDING, next_attempt_at__lte=now)
+            .order_by("next_attempt_at")[:batch_size]
+        )
+        if rows:
+            EmailOutbox.objects.filter(id__in=[row.id for row in rows]).update(
+                next_attempt_at=now + timedelta(seconds=CLAIM_SECONDS)
+            )
+    return rows
+
+
+def deliver_due(batch_size=100, max_attempts=MAX_ATTEMPTS, connection=None):
+    """
+    Send one batch of due rows over `connection` (opened and closed here if not
+    given). Returns (sent, retrying, failed) counts.
+    """
+    rows = claim_due(batch_size)
+    if not rows:
+        return 0, 0, 0
+    own_connection = connection is None
+    connection = connection or get_connection()
+    sent = retrying = failed = 0
+    try:
+        connection.open()
+        for row in rows:
+            message = _message(row.subject, row.body, row.to, row.html_body, row.from_email)
+            message.connection = connection
+            try:
+                if connection.send_messages([message]) != 1:
+                    raise RuntimeError("message was not accepted")
+            except Exception as exc:
+                row.attempts += 1
+                row.last_error = f"{type(exc).__name__}: {exc}"[:2000]
+                if row.attempts >= max_attempts:
+                    row.status = EmailOutboxStatus.FAILED
+                    failed += 1
+                    logger.error("outbox email %s failed after %s attempts: %s", row.id, row.attempts, exc)
+                else:
+                    row.next_attempt_at = timezone.now() + backoff(row.attempts)
+                    retrying += 1
+                row.save(update_fields=["attempts", "last_error", "status", "next_attempt_at"])
+                # The connection may be broken; start a fresh one for the next row.
+                connection.close()
+                connection.open()
+                continue
+            row.status = EmailOutboxStatus.SENT
+            row.attempts += 1
+            row.sent_at = timezone.now()
+            row.save(update_fields=["status", "attempts", "sent_at"])
+            sent += 1
+    finally:
+        if own_connection:
+            connection.close()
+    return sent, retrying, failed
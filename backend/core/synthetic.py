@@ -0,0 +1,210 @@
+import random
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, time, timedelta
+from itertools import accumulate
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+from django.utils import timezone
+
+from apps.authx.models import Firm, UserProfile
+from apps.cases import counts as case_counts
+from apps.cases import search, versioning
+from apps.cases.models import Case, CasePriority, CaseStatus, ClientProfile
+from apps.cases.numbering import reserve_block
+
+User = get_user_model()
+
+BATCH_SIZE = 5000
+FIRM_SKEW = 1.1  # Zipf exponent of case volume across firms
+CLIENT_SKEW = 1.2  # ... and across the clients of one firm
+MAX_AGE_DAYS = 10 * 365
+MEAN_AGE_DAYS = 365
+
+STATUS_WEIGHTS = {CaseStatus.OPEN: 55, CaseStatus.HOLD: 15, CaseStatus.CLOSED: 30}
+PRIORITY_WEIGHTS = {CasePriority.LOW: 30, CasePriority.MEDIUM: 45, CasePriority.HIGH: 20, CasePriority.URGENT: 5}
+CASE_TYPE_WEIGHTS = {
+    "Civil": 30,
+    "Family": 18,
+    "Criminal": 12,
+    "Corporate": 10,
+    "Real Estate": 9,
+    "Employment": 7,
+    "Immigration": 5,
+    "Intellectual Property": 4,
+    "Tax": 3,
+    "Probate": 2,
+    None: 10,
+}
+SURNAMES = [
+    "Smith", "Khan", "Garcia", "Chen", "Patel", "Müller", "Rossi", "Haddad", "Okafor", "Silva",
+    "Novak", "Ahmed", "Kim", "Dubois", "Nakamura", "Ivanova", "Johnson", "Ali", "Costa", "Larsen",
+]
+FIRST_NAMES = [
+    "Aisha", "Omar", "Maria", "Wei", "Priya", "Lukas", "Giulia", "Karim", "Chidi", "Ana",
+    "Jan", "Fatima", "Min", "Claire", "Yuki", "Olga", "James", "Sara", "Pedro", "Nora",
+]
+COURTS = ["District Court", "High Court", "Court of Appeal", "Family Court", "Labour Court", "Commercial Court"]
+
+
+def _weighted(weights):
+    """(values, cumulative weights) for rng.choices(values, cum_weights=...)."""
+    return list(weights), list(accumulate(weights.values()))
+
+
+STATUSES, STATUS_W = _weighted(STATUS_WEIGHTS)
+PRIORITIES, PRIORITY_W = _weighted(PRIORITY_WEIGHTS)
+CASE_TYPES, CASE_TYPE_W = _weighted(CASE_TYPE_WEIGHTS)
+
+
+def zipf_split(total, parts, skew):
+    """Split `total` into `parts` shares proportional to 1/rank**skew, largest first."""
+    weights = [1 / rank**skew for rank in range(1, parts + 1)]
+    scale = total / sum(weights)
+    shares = [int(weight * scale) for weight in weights]
+    for index in range(total - sum(shares)):
+        shares[index % parts] += 1
+    return shares
+
+
+@contextmanager
+def explicit_timestamps(model):
+    """Let bulk_create keep the created_at/updated_at set on the instances instead of now()."""
+    fields = [
+        field
+        for field in model._meta.concrete_fields
+        if getattr(field, "auto_now", False) or getattr(field, "auto_now_add", False)
+    ]
+    saved = [(field, field.auto_now, field.auto_now_add) for field in fields]
+    for field in fields:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, auto_now, auto_now_add in saved:
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+def _uuid(rng):
+    return uuid.UUID(int=rng.getrandbits(128), version=4)
+
+
+def _moment(day, rng):
+    return timezone.make_aware(datetime.combine(day, time()) + timedelta(seconds=rng.randrange(86400)))
+
+
+class FirmGenerator:
+    """The rows of one firm; `index` and `seed` fix all of its values."""
+
+    def __init__(self, seed, index, cases, clients, deleted_share, today, password):
+        self.rng = random.Random(f"{seed}:{index}")
+        self.tag = f"s{seed}f{index}"
+        self.seed, self.index = seed, index
+        self.cases, self.clients = cases, clients
+        self.deleted_share = deleted_share
+        self.today = today
+        self.password = password
+
+    def _user(self, username):
+        first, last = self.rng.choice(FIRST_NAMES), self.rng.choice(SURNAMES)
+        return User(
+            username=username,
+            email=f"{username}@seed.example",
+            first_name=first,
+            last_name=last,
+            password=self.password,
+        )
+
+    def create_firm(self):
+        owner = self._user(f"{self.tag}owner")
+        clients = [self._user(f"{self.tag}c{n}") for n in range(self.clients)]
+        users = [owner] + clients
+        User.objects.bulk_create(users, batch_size=BATCH_SIZE)
+        UserProfile.objects.bulk_create(
+            [UserProfile(user=user, email_verified=True) for user in users], batch_size=BATCH_SIZE
+        )
+        first, second = self.rng.sample(SURNAMES, 2)
+        firm = Firm.objects.create(
+            name=f"{first} & {second} LLP #{self.seed}-{self.index}",
+            slug=f"seed-{self.seed}-{self.index}",
+            owner=owner,
+            email=owner.email,
+        )
+        profiles = [
+            ClientProfile(id=_uuid(self.rng), firm=firm, user=user, name=f"{user.first_name} {user.last_name}")
+            for user in clients
+        ]
+        ClientProfile.objects.bulk_create(profiles, batch_size=BATCH_SIZE)
+        return firm, profiles
+
+    def _case(self, firm, profiles, client_weights):
+        rng = self.rng
+        opened = self.today - timedelta(days=min(int(rng.expovariate(1 / MEAN_AGE_DAYS)), MAX_AGE_DAYS))
+        status = rng.choices(STATUSES, cum_weights=STATUS_W)[0]
+        closed = None
+        if status == CaseStatus.CLOSED:
+            closed = min(opened + timedelta(days=int(rng.expovariate(1 / 120))), self.today)
+        created = _moment(opened, rng)
+        updated = max(_moment(closed, rng), created) if closed else created
+        deleted = rng.random() < self.deleted_share
+        client = rng.choices(profiles, cum_weights=client_weights)[0] if profiles and rng.random() < 0.9 else None
+        plaintiff, defendant = rng.sample(SURNAMES, 2)
+        return Case(
+            id=_uuid(rng),
+            firm=firm,
+            client=client,
+            title=f"{plaintiff} v. {defendant}",
+            case_type=rng.choices(CASE_TYPES, cum_weights=CASE_TYPE_W)[0],
+            status=status,
+            priority=rng.choices(PRIORITIES, cum_weights=PRIORITY_W)[0],
+            description=f"{rng.choice(FIRST_NAMES)} {plaintiff} against {defendant}" if rng.random() < 0.6 else None,
+            court_name=rng.choice(COURTS) if rng.random() < 0.7 else None,
+            judge_name=f"Judge {rng.choice(SURNAMES)}" if rng.random() < 0.4 else None,
+            open_date=opened,
+            close_date=closed,
+            close_reason="Settled" if closed and rng.random() < 0.5 else None,
+            assigned_lead_id=firm.owner_id if rng.random() < 0.4 else None,
+            created_by_id=firm.owner_id,
+            created_at=created,
+            updated_at=updated,
+            is_deleted=deleted,
+            deleted_at=_moment(self.today, rng) if deleted else None,
+        )
+
+    def create_cases(self, firm, profiles, batch_size=BATCH_SIZE):
+        # Shuffled so the busiest clients are not always the first created.
+        client_weights = zipf_split(1_000_000, len(profiles), CLIENT_SKEW) if profiles else []
+        self.rng.shuffle(client_weights)
+        client_weights = list(accumulate(client_weights))
+        for start in range(0, self.cases, batch_size):
+            cases = [self._case(firm, profiles, client_weights) for _ in range(min(batch_size, self.cases - start))]
+            for case, number in zip(cases, reserve_block(firm, len(cases))):
+                case.case_number = number
+            with explicit_timestamps(Case):
+                Case.objects.bulk_create(cases, batch_size=batch_size)
+            case_counts.record_created(*(case for case in cases if not case.is_deleted))
+            search.index_cases(cases)
+            yield len(cases)
+
+    def run(self, batch_size=BATCH_SIZE):
+        """Create the firm; yields the number of cases of each inserted batch."""
+        with transaction.atomic():
+            firm, profiles = self.create_firm()
+            yield from self.create_cases(firm, profiles, batch_size)
+            versioning.bump(firm.id)
+
+
+def plan(seed, firms, cases, clients_per_case, deleted_share, password=None, today=None):
+    """One FirmGenerator per firm, the largest first."""
+    password = make_password(password) if password else make_password(None)
+    today = today or timezone.localdate()
+    return [
+        FirmGenerator(seed, index, firm_cases, max(1, round(firm_cases * clients_per_case)), deleted_share, today, password)
+        for index, firm_cases in enumerate(zipf_split(cases, firms, FIRM_SKEW))
+    ]
+
+
+def seeded(seed):
+    return Firm.objects.filter(slug__startswith=f"seed-{seed}-").exists()